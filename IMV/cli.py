@@ -0,0 +1,278 @@
+"""
+Kommandolinje til batchkørsel af beregnerne uden GUI: python -m IMV <beregner>
+
+Læser én opgave pr. linje som JSON Lines eller CSV fra stdin og skriver ét JSON-resultat pr.
+linje til stdout i samme rækkefølge. Store input fordeles på flere processer. Kun IMV.core
+bruges, så Qt indlæses aldrig.
+"""
+import argparse
+import collections
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+
+from IMV.resources import resource_path
+
+# Antal opgaver der sendes til en arbejdsproces ad gangen
+BATCH_SIZE = 256
+# Antal bidder pr. arbejdsproces, der højst er undervejs, før der ventes på det ældste resultat
+IN_FLIGHT_PER_WORKER = 2
+
+# Databasen indlæses én gang pr. proces af _init_worker
+_context = {}
+
+
+def _coordinate(record, number):
+    """Koordinat nummer 1-3 fra enten "p1": [x, y, z] (JSON) eller x1, y1, z1 (CSV)."""
+    import numpy as np
+    if f"p{number}" in record:
+        values = record[f"p{number}"]
+    else:
+        values = [record.get(f"{axis}{number}") for axis in "xyz"]
+        if all(v in (None, "") for v in values):
+            return None
+    return np.array([float(v) for v in values])
+
+
+def _number(value):
+    """Tal fra JSON eller CSV; tomme felter tæller som ukendt (0)."""
+    return float(value) if value not in (None, "") else 0.0
+
+
+def run_vector(record):
+    from IMV.core.vector_calculations import VectorOperations
+    op = record.get("op") or _context.get("op")
+    types = [record.get(f"t{i}") or "Vektor" for i in (1, 2, 3)]
+    coord1, coord2, coord3 = (_coordinate(record, i) for i in (1, 2, 3))
+    if op == "add":
+        return VectorOperations.add(coord1, coord2, types[0], types[1]).tolist()
+    if op == "subtract":
+        return VectorOperations.subtract(coord1, coord2, types[0], types[1]).tolist()
+    if op == "dot":
+        return float(VectorOperations.dot_product(coord1, coord2, types[0], types[1]))
+    if op == "cross":
+        return VectorOperations.cross_product(coord1, coord2, types[0], types[1]).tolist()
+    if op == "angle":
+        degrees, radians = VectorOperations.angle(coord1, coord2, coord3, *types)
+        return {"degrees": float(degrees), "radians": float(radians)}
+    if op == "plane":
+        a, b, c, d = VectorOperations.plane_equation(coord1, coord2, coord3, *types)
+        return {"a": float(a), "b": float(b), "c": float(c), "d": float(d)}
+    raise ValueError(f"Ukendt handling: {op} (brug add, subtract, dot, cross, angle eller plane)")
+
+
+def run_triangle(record):
+    from IMV.core.triangle_calculations import TriangleCalculations
+    sides = [_number(record.get(name)) for name in "abc"]
+    angles = [_number(record.get(name)) for name in "ABC"]
+    return TriangleCalculations.solve(sides, angles)
+
+
+def run_triangle_batch(records):
+    """
+    Løser en hel batch med solve_batch i én vektoriseret omgang. Rækker, der er ugyldige eller
+    flertydige (SSA), løses igen enkeltvis, så fejlbeskeder og den anden løsning er de samme som i GUI'en.
+    """
+    import numpy as np
+    from IMV.core.triangle_calculations import TriangleCalculations, CASES
+    values = np.array([[_number(record.get(name)) for name in "abcABC"] for record in records]).reshape(-1, 6)
+    solved = TriangleCalculations.solve_batch(*values.T)
+    results = []
+    for record, row in zip(records, solved):
+        if not row["valid"] or row["ambiguous"]:
+            results.append(_call(run_triangle, record))
+            continue
+        results.append({"result": {
+            "perimeter": float(row["perimeter"]),
+            "area": float(row["area"]),
+            "angles": {name: float(row[name]) for name in "ABC"},
+            "sides": {name: float(row[name]) for name in "abc"},
+            "case": CASES[row["case"]],
+            "alternative": None,
+        }})
+    return results
+
+
+def run_recurrence(record):
+    from IMV.core.reccurence_calculations import RecurrenceSolver, format_polynomial
+    initial = record.get("initial") or ""
+    if isinstance(initial, list):
+        initial = "\n".join(initial)
+    initial = initial.replace(";", "\n").strip()
+    solver = RecurrenceSolver(record["equation"], initial)
+    if initial:
+        coeffs, roots, general, full = solver.solve()
+    else:
+        coeffs, roots, general = solver.solve_general_only()
+        full = None
+    return {
+        "characteristic": format_polynomial(coeffs),
+        "roots": [[float(r.real), float(r.imag)] for r in roots],
+        "general": general,
+        "full": full,
+    }
+
+
+def run_enthalpy(record):
+    from IMV.core.enthalpy_calculations import calculate_enthalpy
+    return {"delta_h": calculate_enthalpy(record["reaction"], _context["index"])}
+
+
+def run_graphwar(record):
+    from IMV.core.graph_war_calculations import Enemy, graph_points, hit_enemies
+    width = int(_number(record.get("width")) or 1200)
+    height = int(_number(record.get("height")) or 600)
+    scale = _number(record.get("scale")) or 0.01
+    # Samme seed giver samme fjender, så en simulering kan gentages
+    random.seed(record.get("seed"))
+    enemies = [Enemy(width, height) for _ in range(int(_number(record.get("count")) or 5))]
+    xs, ys = graph_points(record["function"], scale, width, height)
+    hit_enemies(xs, ys, enemies, width)
+    hits = sum(not enemy.state for enemy in enemies)
+    return {
+        "hits": hits,
+        "all_hit": hits == len(enemies),
+        "enemies": [[enemy.x, enemy.y, enemy.state] for enemy in enemies],
+    }
+
+
+# Beregnere med en vektoriseret udgave, der tager en hel liste af opgaver
+BATCH_COMMANDS = {
+    "triangle": run_triangle_batch,
+}
+
+COMMANDS = {
+    "vector": run_vector,
+    "triangle": run_triangle,
+    "recurrence": run_recurrence,
+    "enthalpy": run_enthalpy,
+    "graphwar-sim": run_graphwar,
+}
+
+
+def _init_worker(command, options):
+    _context.clear()
+    _context["command"] = command
+    _context["op"] = options.get("op")
+    if command == "enthalpy":
+        from IMV.core.enthalpy_calculations import load_compounds, build_index
+        _context["index"] = build_index(load_compounds(options["data"]))
+
+
+def _call(handler, record):
+    try:
+        if "__error__" in record:
+            raise ValueError(record["__error__"])
+        return {"result": handler(record)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _run_batch(batch):
+    """Kører en liste af (linjenummer, opgave) og returnerer færdige JSON-linjer."""
+    command = _context["command"]
+    records = [record for _, record in batch]
+    if command in BATCH_COMMANDS and not any("__error__" in record for record in records):
+        try:
+            outputs = BATCH_COMMANDS[command](records)
+        except Exception:
+            # Fx et ugyldigt tal i en enkelt række: fald tilbage til én opgave ad gangen
+            outputs = [_call(COMMANDS[command], record) for record in records]
+    else:
+        outputs = [_call(COMMANDS[command], record) for record in records]
+    return [json.dumps({"line": line_number, **output}, ensure_ascii=False)
+            for (line_number, _), output in zip(batch, outputs)]
+
+
+def read_records(stream, input_format):
+    """Giver (linjenummer, opgave) fra JSON Lines eller CSV. 'auto' kigger på første tegn."""
+    if input_format == "auto":
+        first = stream.readline()
+        input_format = "jsonl" if first.lstrip().startswith("{") else "csv"
+        stream = itertools.chain([first], stream)
+    if input_format == "csv":
+        for line_number, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_number, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if line.strip():
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                # Sendes videre som en fejl på linjen i stedet for at stoppe kørslen
+                yield line_number, {"__error__": f"Ugyldig JSON: {e}"}
+
+
+def _batches(records):
+    while True:
+        batch = list(itertools.islice(records, BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+def default_data_path():
+    return resource_path("IMV/screens/enthalpy_data.json")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m IMV", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="antal processer (1 = kør i denne proces; standard: én pr. kerne, "
+                             "hvis inputtet fylder mere end én bid)")
+    parser.add_argument("-f", "--format", choices=["auto", "jsonl", "csv"], default="auto",
+                        help="inputformat på stdin")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    vector = subparsers.add_parser("vector", help="vektorregning: felterne op, p1-p3 (eller x1..z3) og t1-t3")
+    vector.add_argument("--op", choices=["add", "subtract", "dot", "cross", "angle", "plane"],
+                        help="handling for linjer uden et op-felt")
+    subparsers.add_parser("triangle", help="trekantsløser: felterne a, b, c, A, B, C")
+    subparsers.add_parser("recurrence", help="rekursionsligninger: felterne equation og initial")
+    enthalpy = subparsers.add_parser("enthalpy", help="ΔH° for reaktioner: feltet reaction")
+    enthalpy.add_argument("--data", help="JSON-fil med molekyledata (standard: den indbyggede)")
+    subparsers.add_parser("graphwar-sim", help="Grafkrig-skud: felterne function, scale, width, height, seed, count")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = {"op": getattr(args, "op", None)}
+    if args.command == "enthalpy":
+        options["data"] = args.data or default_data_path()
+
+    batches = _batches(read_records(sys.stdin, args.format))
+    out = sys.stdout
+    try:
+        workers = args.workers
+        if workers is None:
+            # At starte processerne koster mere end en enkelt bid; kig på starten af inputtet først
+            head = list(itertools.islice(batches, 2))
+            batches = itertools.chain(head, batches)
+            workers = (os.cpu_count() or 1) if len(head) > 1 else 1
+        if workers <= 1:
+            _init_worker(args.command, options)
+            for lines in map(_run_batch, batches):
+                out.write("\n".join(lines) + "\n")
+            return 0
+
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(args.command, options)) as pool:
+            # Højst IN_FLIGHT_PER_WORKER bidder pr. proces er sendt af sted ad gangen, så stdin læses
+            # i takt med, at resultaterne skrives (Pool.imap ville læse hele inputtet ind på forhånd).
+            # Resultaterne skrives i inputtets rækkefølge.
+            pending = collections.deque()
+            for batch in batches:
+                pending.append(pool.apply_async(_run_batch, (batch,)))
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    out.write("\n".join(pending.popleft().get()) + "\n")
+            while pending:
+                out.write("\n".join(pending.popleft().get()) + "\n")
+        return 0
+    except BrokenPipeError:
+        # Læseren (fx head) har lukket stdout; stop stille
+        sys.stdout = None
+        return 0
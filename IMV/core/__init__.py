@@ -0,0 +1,44 @@
+"""
+Beregningskernen i IMV uden Qt.
+
+Modulerne her importerer kun standardbiblioteket og NumPy, så de kan bruges i batchjobs og på
+servere uden grafisk miljø. Navnene nedenfor indlæses først, når de bruges, så
+`import IMV.core` i sig selv ikke importerer NumPy.
+"""
+import importlib
+
+_EXPORTS = {
+    "VectorOperations": "vector_calculations",
+    "load_points": "vector_calculations",
+    "VectorSet": "vector_set",
+    "TriangleCalculations": "triangle_calculations",
+    "load_mesh": "triangle_mesh",
+    "analyze_mesh": "triangle_mesh",
+    "RecurrenceSolver": "reccurence_calculations",
+    "format_polynomial": "reccurence_calculations",
+    "parse_reaction": "enthalpy_calculations",
+    "build_index": "enthalpy_calculations",
+    "calculate_enthalpy": "enthalpy_calculations",
+    "Enemy": "graph_war_calculations",
+    "graph_points": "graph_war_calculations",
+    "hit_enemies": "graph_war_calculations",
+    "PDFIndex": "pdf_index",
+    "LargeTextFile": "text_buffer",
+    "EditJournal": "edit_journal",
+    "read_journal": "edit_journal",
+    "read_text": "text_io",
+    "write_text": "text_io",
+    "BufferCache": "buffer_cache",
+    "StateStore": "state_store",
+    "PDFMetadataCache": "pdf_metadata",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,99 @@
+"""
+LRU-cache over inaktive tekstbuffere med et hukommelsesloft.
+
+En buffer er enten levende (et vilkårligt objekt, fx et dokument i editoren, med en anslået størrelse),
+komprimeret i hukommelsen eller skrevet komprimeret til disk. Overskrides loftet, komprimeres de mindst
+brugte levende buffere først, og derefter flyttes de mindst brugte komprimerede buffere til disk.
+Så længe der er plads, ligger de senest brugte buffere urørte og kan vises med det samme.
+"""
+import os
+import uuid
+import zlib
+from collections import OrderedDict
+
+# zlib-niveau: hurtig komprimering er vigtigere end den sidste procent
+COMPRESSION_LEVEL = 1
+
+
+class BufferCache:
+    """
+    Buffere gemmes under en nøgle. to_text(værdi) laver en levende buffer om til tekst og frigiver den;
+    den kaldes kun, når en buffer skal komprimeres.
+    """
+    def __init__(self, directory, memory_limit, to_text):
+        self.directory = directory
+        self.memory_limit = memory_limit
+        self.to_text = to_text
+        self.entries = OrderedDict()  # nøgle -> [tilstand, værdi, størrelse]; sidst er senest brugt
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def state(self, key):
+        """"live", "compressed" eller "disk"."""
+        return self.entries[key][0]
+
+    def memory_usage(self):
+        return sum(size for state, _, size in self.entries.values() if state != "disk")
+
+    def put(self, key, value, size):
+        """Lægger en levende buffer i cachen som den senest brugte."""
+        self.discard(key)
+        self.entries[key] = ["live", value, size]
+        self.trim()
+
+    def peek(self, key):
+        """Som take, men bufferen bliver i cachen."""
+        state, value, _ = self.entries[key]
+        if state == "live":
+            return True, value
+        return False, self._decompress(state, value)
+
+    def take(self, key):
+        """Fjerner bufferen og returnerer (True, levende værdi) eller (False, tekst)."""
+        state, value, _ = self.entries.pop(key)
+        if state == "live":
+            return True, value
+        text = self._decompress(state, value)
+        if state == "disk":
+            os.remove(value)
+        return False, text
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None and entry[0] == "disk" and os.path.exists(entry[1]):
+            os.remove(entry[1])
+
+    def clear(self):
+        for key in list(self.entries):
+            self.discard(key)
+
+    def _decompress(self, state, value):
+        if state == "disk":
+            with open(value, "rb") as f:
+                value = f.read()
+        return zlib.decompress(value).decode("utf-8")
+
+    def trim(self):
+        """Komprimerer og flytter de mindst brugte buffere, til forbruget er under loftet."""
+        usage = self.memory_usage()
+        for tier in ("live", "compressed"):
+            for entry in self.entries.values():  # Ældste først
+                if usage <= self.memory_limit:
+                    return
+                if entry[0] != tier:
+                    continue
+                usage -= entry[2]
+                if tier == "live":
+                    data = zlib.compress(self.to_text(entry[1]).encode("utf-8"), COMPRESSION_LEVEL)
+                    entry[:] = ["compressed", data, len(data)]
+                    usage += len(data)
+                else:
+                    os.makedirs(self.directory, exist_ok=True)
+                    path = os.path.join(self.directory, f"{uuid.uuid4().hex}.buf")
+                    with open(path, "wb") as f:
+                        f.write(entry[1])
+                    entry[:] = ["disk", path, 0]
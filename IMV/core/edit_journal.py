@@ -0,0 +1,167 @@
+"""
+Journal til automatisk gemning og gendannelse efter nedbrud.
+
+Journalen er en fil med én JSON-post pr. linje. Første linje er et øjebliksbillede af dokumentet
+{"snapshot": tekst, "file": sti, "saved": bool}, og hver følgende linje er en rettelse
+[position, antal fjernede tegn, indsat tekst]. Positioner tæller UTF-16-enheder ligesom Qt's
+QTextDocument. Rettelser skrives af en baggrundstråd, så det koster det samme at gemme en rettelse
+uanset dokumentets størrelse; med jævne mellemrum pakkes journalen sammen til et nyt øjebliksbillede.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+# Journalen pakkes sammen, når rettelserne fylder så meget eller er så mange
+COMPACT_BYTES = 256 * 1024
+COMPACT_OPERATIONS = 2000
+# Højst så ofte (sekunder) tvinges journalen helt ned på disken
+FSYNC_INTERVAL = 1.0
+
+
+def utf16_length(text):
+    return len(text.encode("utf-16-le")) // 2
+
+
+def apply_operations(text, operations):
+    """Anvender rettelser [position, fjernet, tekst] på text. Regner i UTF-16 ligesom Qt."""
+    if not operations:
+        return text
+    data = bytearray(text.encode("utf-16-le"))
+    for position, removed, added in operations:
+        start = 2 * position
+        data[start:start + 2 * removed] = added.encode("utf-16-le")
+    return data.decode("utf-16-le", errors="replace")
+
+
+def read_journal(path):
+    """
+    Læser en journal. Returnerer (tekst, fil, gemt, antal rettelser) eller None, hvis der ingen er.
+    En halvt skrevet sidste linje (nedbrud midt i en skrivning) ignoreres.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+    except OSError:
+        return None
+    try:
+        header = json.loads(lines[0])
+        text = header["snapshot"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    operations = []
+    for line in lines[1:]:
+        try:
+            position, removed, added = json.loads(line)
+        except ValueError:
+            break
+        operations.append((position, removed, added))
+    return apply_operations(text, operations), header.get("file"), header.get("saved", False), len(operations)
+
+
+class EditJournal:
+    """
+    Skriver rettelser til journalen i path fra en baggrundstråd. Metoderne kaldes fra GUI-tråden
+    og lægger kun en besked i en kø.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self, text, file_name=None, saved=True):
+        """Starter skrivetråden med text som udgangspunkt."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(text, file_name, saved),
+                                            name="EditJournal", daemon=True)
+            self._thread.start()
+        else:
+            self.reset(text, file_name, saved)
+
+    def record(self, position, removed, added):
+        self._queue.put(("op", (position, removed, added)))
+
+    def reset(self, text, file_name=None, saved=True):
+        """Nyt udgangspunkt, fx når en fil indlæses; tidligere rettelser glemmes."""
+        self._queue.put(("reset", (text, file_name, saved)))
+
+    def mark_saved(self, file_name, saved=True):
+        """
+        Dokumentet er gemt som file_name: journalen pakkes sammen og husker filen. saved=False bruges,
+        når der er rettet, mens der blev gemt, så rettelserne stadig gendannes. Er journalen lukket
+        (dokumentet ligger i cachen), skrives det nye øjebliksbillede med det samme.
+        """
+        if self._thread is None:
+            journal = read_journal(self.path)
+            if journal is not None:
+                self._write_snapshot(journal[0], file_name, saved).close()
+            return
+        self._queue.put(("saved", (file_name, saved)))
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(("stop", None))
+            self._thread.join()
+            self._thread = None
+
+    # ---- Skrivetråden ----
+
+    def _write_snapshot(self, text, file_name, saved):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"snapshot": text, "file": file_name, "saved": saved}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _run(self, text, file_name, saved):
+        base, operations, pending_bytes = text, [], 0
+        out = self._write_snapshot(base, file_name, saved)
+        last_sync = time.monotonic()
+        try:
+            while True:
+                kind, payload = self._queue.get()
+                messages = [(kind, payload)]
+                # Tag alt, der står i kø, så mange tastetryk skrives i én omgang
+                while True:
+                    try:
+                        messages.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = False
+                for kind, payload in messages:
+                    if kind == "op":
+                        line = json.dumps(payload, ensure_ascii=False) + "\n"
+                        out.write(line)
+                        operations.append(payload)
+                        pending_bytes += len(line)
+                        saved = False
+                    elif kind == "reset":
+                        out.close()
+                        base, file_name, saved = payload
+                        operations, pending_bytes = [], 0
+                        out = self._write_snapshot(base, file_name, saved)
+                    elif kind == "saved":
+                        out.close()
+                        base = apply_operations(base, operations)
+                        file_name, saved = payload
+                        operations, pending_bytes = [], 0
+                        out = self._write_snapshot(base, file_name, saved)
+                    elif kind == "stop":
+                        stop = True
+                if pending_bytes > COMPACT_BYTES or len(operations) > COMPACT_OPERATIONS:
+                    out.close()
+                    base = apply_operations(base, operations)
+                    operations, pending_bytes = [], 0
+                    out = self._write_snapshot(base, file_name, saved)
+                out.flush()
+                if stop:
+                    break
+                if time.monotonic() - last_sync > FSYNC_INTERVAL:
+                    os.fsync(out.fileno())
+                    last_sync = time.monotonic()
+        finally:
+            out.close()
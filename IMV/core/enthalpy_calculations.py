@@ -0,0 +1,73 @@
+import json
+import re
+
+
+def load_compounds(json_file):
+    """Læser molekyledata fra en JSON-fil. Returnerer en liste af {"compound", "delta_h_f"}."""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_compounds(json_file, data):
+    """Gemmer molekyledata til en JSON-fil."""
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+
+def build_index(data):
+    """Opslagstabel fra molekylenavn (små bogstaver) til ΔHf°, så opslag ikke gennemløber hele listen."""
+    index = {}
+    for item in data:
+        # Første forekomst vinder, ligesom ved den lineære søgning
+        index.setdefault(item["compound"].lower(), item["delta_h_f"])
+    return index
+
+
+def parse_reaction(reaction):
+    """Parser en reaktionsstreng til lister med reaktanter og produkter."""
+    try:
+        sides = reaction.replace(' ', '').split('->')
+        if len(sides) != 2:
+            raise ValueError("Brug '->' i reaktionen")
+
+        def parse_side(side):
+            result = []
+            for term in side.split('+'):
+                if not term:
+                    continue
+                match = re.match(r'^(\d*)([A-Za-z][A-Za-z0-9]*)', term)
+                if not match:
+                    raise ValueError(f"Ugyldigt input: {term}")
+                coeff_str, compound = match.groups()
+                coeff = int(coeff_str) if coeff_str else 1
+                result.append({"compound": compound, "coefficient": coeff})
+            return result
+
+        reactants = parse_side(sides[0])
+        products = parse_side(sides[1])
+        return reactants, products
+    except Exception as e:
+        raise ValueError(f"Fejl i parsing: {str(e)}")
+
+
+def sum_formation_enthalpy(terms, index):
+    """Summerer koefficient * ΔHf° for en side af reaktionen."""
+    total = 0.0
+    for item in terms:
+        try:
+            total += item["coefficient"] * index[item["compound"].lower()]
+        except KeyError:
+            raise ValueError(f"'{item['compound']}' ikke fundet i databasen")
+    return total
+
+
+def calculate_enthalpy(reaction, index):
+    """
+    Beregner ΔH° = ΣΔHf°(produkter) - ΣΔHf°(reaktanter) for en reaktionsstreng.
+    index er en opslagstabel fra build_index.
+    """
+    reaction = reaction.strip()
+    if not reaction:
+        raise ValueError("Indtast en reaktion")
+    reactants, products = parse_reaction(reaction)
+    return sum_formation_enthalpy(products, index) - sum_formation_enthalpy(reactants, index)
@@ -0,0 +1,108 @@
+import math
+import random
+import numpy as np
+
+# Afstand mellem x-værdierne, grafen evalueres i
+X_STEP = 0.5
+
+
+class Enemy:
+    def __init__(self, width, height):
+
+        self._state = True  # Levende
+        self._size = 10  # Diameter
+        self._x = random.randint(width - 85, width - 55) #Start x-pos
+        self._y = random.randint(50, height - 150) #Start y-pos
+
+        # Gem relativ position mellem skærm (Anvendes til ændring af størrelse af vinduet)
+        self._x_ratio = self._x / width
+        self._y_ratio = self._y / height
+
+    # ---- Properties ----
+    #Getter for state
+    @property
+    def state(self):
+        return self._state
+    #setter for state
+    @state.setter
+    def state(self, value):
+        if not isinstance(value, bool):
+            raise ValueError("state skal være True eller False")
+        self._state = value
+    #Getter for size
+    @property
+    def size(self):
+        return self._size
+    #Getter for x-pos
+    @property
+    def x(self):
+        return self._x
+    #Getter for y-pos
+    @property
+    def y(self):
+        return self._y
+    #Opdatering af position, når vinduets størrelse ændres
+    def update_position(self, new_width, new_height):
+        self._x = int(self._x_ratio * new_width)
+        self._y = int(self._y_ratio * new_height)
+
+
+def evaluate_function(function_str, x_values):
+    """
+    Evaluerer en funktion af x for alle x-værdier.
+    Udtrykket evalueres først én gang med hele NumPy-arrayet; virker det ikke (fx math.sin
+    eller betingelser, der kræver tal), evalueres det punkt for punkt som før.
+    Punkter uden for funktionens definitionsmængde (fx x**0.5 for x < 0) giver NaN uden advarsler.
+    """
+    code = compile(function_str, "<funktion>", "eval")
+    safe_dict = {"math": math, "x": x_values}
+    try:
+        #safe_dict anvendes så kode ikke kan angives og ødelægge programmet
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            y = eval(code, {"__builtins__": {}}, safe_dict)
+        y = np.asarray(y, dtype=np.float64)
+        if y.shape == x_values.shape:
+            return y
+        if y.ndim == 0:
+            return np.full(x_values.shape, float(y))  # Konstant funktion
+    except (TypeError, ValueError):
+        pass
+    y = np.empty(len(x_values))
+    for i, x in enumerate(x_values.tolist()):
+        safe_dict["x"] = x
+        y[i] = eval(code, {"__builtins__": {}}, safe_dict)
+    return y
+
+
+def graph_points(function_str, scale, width, height):
+    """Skærmkoordinater (x, y) for grafen i et område på width x height."""
+    x_start = 50
+    x_end = width - 50
+    x_values = np.arange(x_start, x_end, X_STEP)
+    adjusted_x = x_values - width // 6 #Den justerede x-akse er til venstre på skærmen (Giver større skydeplade)
+    y = evaluate_function(function_str, adjusted_x)
+    if np.isnan(y).any():
+        raise ValueError("Funktionen er ikke defineret for alle x i skydeområdet")
+    with np.errstate(over="ignore", invalid="ignore"):
+        screen_y = height // 2 - (y * scale)
+    screen_y = np.clip(screen_y, -10, height)  # Hold grafen inde i området
+    return x_values.astype(int), screen_y.astype(int)
+
+
+def hit_enemies(xs, ys, enemies, width):
+    """
+    Markerer ramte fjender som døde og returnerer True, hvis mindst én blev ramt.
+    Kun punkter fra start_index og frem tjekkes, da fjenderne altid står yderst til højre.
+    """
+    enemy_min_x = width - 90
+    start_index = max(int((enemy_min_x - 100) / X_STEP), 0)
+    xs = np.asarray(xs[start_index:], dtype=np.float64)
+    ys = np.asarray(ys[start_index:], dtype=np.float64)
+    hit_any = False
+    for enemy in enemies:
+        if enemy.state and len(xs):
+            distance = np.hypot(xs - enemy.x, ys - enemy.y) #Beregner hypotynusen hermed afstanden
+            if np.any(distance < enemy.size + 5):
+                enemy.state = False
+                hit_any = True
+    return hit_any
@@ -0,0 +1,185 @@
+"""
+Fuldtekstindeks over PDF-biblioteket.
+
+Teksten gemmes side for side i en SQLite FTS5-tabel (et inverteret indeks på disken), og
+søgninger rangeres med bm25. Indekset opdateres trinvist: kun filer, hvis ændringstid eller
+størrelse er ændret, læses igen. Selve udtrækningen af tekst sendes ind som en funktion, så
+modulet ikke afhænger af Qt.
+"""
+import os
+import re
+import sqlite3
+import unicodedata
+
+SCHEMA_VERSION = 1
+
+# Sidens rowid er dokumentets id forskudt PAGE_BITS bit plus sidenummeret, så alle sider i et
+# dokument kan slettes som et interval uden at gennemløbe tabellen
+PAGE_BITS = 20
+
+# Tegn som PDF-udtræk indsætter midt i ord (bløde bindestreger)
+_SOFT_HYPHENS = str.maketrans("", "", "\u00ad\ufffe")
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_text(text):
+    """Fjerner bløde bindestreger, samler å skrevet som ˚a (fra LaTeX) og opløser ligaturer som ﬁ (NFKC)."""
+    text = text.translate(_SOFT_HYPHENS).replace("˚a", "å").replace("˚A", "Å")
+    return unicodedata.normalize("NFKC", text)
+
+
+def build_query(text):
+    """
+    FTS5-udtryk fra brugerens søgetekst: alle ord skal forekomme, og det sidste ord må være
+    begyndelsen af et ord, så der kan søges mens man skriver. Returnerer None for tom søgning.
+    """
+    words = _WORD.findall(text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def iter_pdf_files(roots):
+    """Alle PDF-filer under mapperne i roots (skjulte mapper springes over)."""
+    seen = set()
+    for root in roots:
+        for directory, subdirectories, files in os.walk(root):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+            for name in files:
+                if name.lower().endswith(".pdf") and not name.startswith("."):
+                    path = os.path.abspath(os.path.join(directory, name))
+                    if path not in seen:
+                        seen.add(path)
+                        yield path
+
+
+class PDFIndex:
+    """
+    Indekset i filen path. Hver tråd skal have sin egen PDFIndex, da SQLite-forbindelser ikke deles
+    mellem tråde; WAL gør, at GUI'en kan søge, mens en indeksering skriver.
+    """
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.connection.executescript("""
+                DROP TABLE IF EXISTS documents;
+                DROP TABLE IF EXISTS pages;
+            """)
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                page_count INTEGER NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+                text, tokenize = 'unicode61 remove_diacritics 0'
+            );
+            PRAGMA user_version = {SCHEMA_VERSION};
+        """)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def documents(self):
+        """{sti: (mtime_ns, størrelse)} for alle indekserede filer."""
+        rows = self.connection.execute("SELECT path, mtime_ns, size FROM documents")
+        return {path: (mtime_ns, size) for path, mtime_ns, size in rows}
+
+    def _delete_pages(self, path):
+        row = self.connection.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            self.connection.execute("DELETE FROM pages WHERE rowid BETWEEN ? AND ?",
+                                    (row[0] << PAGE_BITS, ((row[0] + 1) << PAGE_BITS) - 1))
+        return row
+
+    def add_document(self, path, mtime_ns, size, pages):
+        """Erstatter filens sider i indekset. pages er en liste af tekster, én pr. side."""
+        pages = pages[:1 << PAGE_BITS]
+        with self.connection:
+            row = self._delete_pages(path)
+            if row is None:
+                document_id = self.connection.execute(
+                    "INSERT INTO documents (path, mtime_ns, size, page_count) VALUES (?, ?, ?, ?)",
+                    (path, mtime_ns, size, len(pages))).lastrowid
+            else:
+                document_id = row[0]
+                self.connection.execute(
+                    "UPDATE documents SET mtime_ns = ?, size = ?, page_count = ? WHERE id = ?",
+                    (mtime_ns, size, len(pages), document_id))
+            self.connection.executemany(
+                "INSERT INTO pages (rowid, text) VALUES (?, ?)",
+                (((document_id << PAGE_BITS) + number, normalize_text(text))
+                 for number, text in enumerate(pages)))
+
+    def remove_document(self, path):
+        with self.connection:
+            self._delete_pages(path)
+            self.connection.execute("DELETE FROM documents WHERE path = ?", (path,))
+
+    def update(self, roots, extract_pages, report=None):
+        """
+        Bringer indekset i trit med PDF-filerne under roots. extract_pages(sti) skal returnere en liste
+        med sidernes tekst. Filer der ikke kan læses, gemmes uden sider, så de ikke prøves igen før de ændres.
+        report(procent) kaldes efter hver fil. Returnerer antal (opdaterede, fjernede) filer.
+        """
+        indexed = self.documents()
+        files = list(iter_pdf_files(roots))
+        changed = []
+        for path in files:
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            if indexed.get(path) != (info.st_mtime_ns, info.st_size):
+                changed.append((path, info.st_mtime_ns, info.st_size))
+
+        # Filer under roots der ikke findes længere
+        prefixes = tuple(os.path.join(os.path.abspath(root), "") for root in roots)
+        existing = set(files)
+        removed = [path for path in indexed if path.startswith(prefixes) and path not in existing]
+        for path in removed:
+            self.remove_document(path)
+
+        for number, (path, mtime_ns, size) in enumerate(changed, start=1):
+            try:
+                pages = extract_pages(path)
+            except Exception:
+                pages = []
+            self.add_document(path, mtime_ns, size, pages)
+            if report is not None:
+                report(number * 100 / len(changed))
+        return len(changed), len(removed)
+
+    def search(self, text, limit=50):
+        """
+        Søger i alle indekserede sider. Returnerer de bedste hits som en liste af
+        (sti, sidenummer fra 0, uddrag) med det bedste først. Ugyldig søgetekst giver ingen hits.
+        """
+        query = build_query(text)
+        if query is None:
+            return []
+        try:
+            rows = self.connection.execute(f"""
+                SELECT documents.path, pages.rowid & {(1 << PAGE_BITS) - 1},
+                       snippet(pages, 0, '[', ']', '…', 12)
+                FROM pages JOIN documents ON documents.id = pages.rowid >> {PAGE_BITS}
+                WHERE pages MATCH ?
+                ORDER BY bm25(pages) LIMIT ?
+            """, (query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            return []
+        return [(path, int(page), " ".join(snippet.split())) for path, page, snippet in rows]
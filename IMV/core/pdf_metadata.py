@@ -0,0 +1,106 @@
+"""
+Metadata om PDF-filer, så en fil kan genåbnes med det samme.
+
+For hver fil huskes det, der er dyrt at finde (antal sider, titel og indholdsfortegnelse), sammen med
+filens ændringstid og størrelse; det udtrukne gælder kun, så længe de to passer. Desuden huskes den
+side og zoom, brugeren sidst så, og hvornår filen sidst blev åbnet (listen over seneste filer).
+Visningen huskes også, når filen ændres. Det hele ligger i en StateStore med én nøgle pr. fil.
+"""
+import os
+import time
+from IMV.core.state_store import StateStore
+
+# Antal filer der huskes; de længst ikke åbnede glemmes først
+MAX_DOCUMENTS = 500
+MAX_RECENT = 10
+
+# Felter der kun gælder for den version af filen, de er udtrukket fra
+_EXTRACTED = ("pages", "title", "outline")
+
+
+def file_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def file_info(path):
+    """[ændringstid i ns, størrelse] eller None, hvis filen ikke findes."""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return [info.st_mtime_ns, info.st_size]
+
+
+class PDFMetadataCache:
+    """
+    Metadata for PDF-filer i filen path. Opslag er rene opslag i hukommelsen og må også laves fra
+    en baggrundstråd; ændringer laves fra GUI-tråden og skrives i baggrunden af StateStore.
+
+    En post er en dict med mtime_ns, size, pages, title, outline ([niveau, titel, side] pr. punkt),
+    page, zoom (None for sidebredde) og opened (tidspunkt).
+    """
+    def __init__(self, path, limit=MAX_DOCUMENTS):
+        self.store = StateStore(path).load()
+        self.limit = limit
+
+    def close(self):
+        self.store.close()
+
+    def entry(self, path):
+        """Alt hvad der huskes om filen (en tom dict for en ukendt fil)."""
+        entry = self.store.get(file_key(path))
+        return dict(entry) if isinstance(entry, dict) else {}
+
+    def metadata(self, path, info=None):
+        """
+        Posten, hvis antal sider, titel og indhold er udtrukket fra filen, som den er nu, ellers None.
+        info ([mtime_ns, størrelse]) kan gives, hvis kalderen allerede har kaldt stat.
+        """
+        entry = self.store.get(file_key(path))
+        if not isinstance(entry, dict) or "pages" not in entry:
+            return None
+        info = file_info(path) if info is None else list(info)
+        if info != [entry.get("mtime_ns"), entry.get("size")]:
+            return None
+        return dict(entry)
+
+    def page_count(self, path, info=None):
+        entry = self.metadata(path, info)
+        return entry["pages"] if entry is not None else None
+
+    def _update(self, file_path, **values):
+        entry = self.entry(file_path)
+        entry.update(values, path=os.path.abspath(file_path))
+        self.store.set(file_key(file_path), entry)
+
+    def set_metadata(self, path, info, pages, title, outline):
+        """Gemmer det udtrukne for den version af filen, info ([mtime_ns, størrelse]) beskriver."""
+        entry = {key: value for key, value in self.entry(path).items() if key not in _EXTRACTED}
+        entry.update(path=os.path.abspath(path), mtime_ns=info[0], size=info[1],
+                     pages=pages, title=title, outline=outline)
+        self.store.set(file_key(path), entry)
+
+    def set_view(self, path, page, zoom):
+        self._update(path, page=page, zoom=zoom)
+
+    def mark_opened(self, path):
+        self._update(path, opened=time.time())
+        if len(self.store.data) > self.limit:
+            self.forget_oldest()
+
+    def forget_oldest(self):
+        entries = sorted(self.store.data.items(), key=lambda item: item[1].get("opened", 0))
+        for key, _ in entries[:len(entries) - self.limit]:
+            self.store.remove(key)
+
+    def recent(self, limit=MAX_RECENT):
+        """De senest åbnede filer, der stadig findes, med den senest åbnede først."""
+        entries = sorted((entry for entry in self.store.data.values() if "opened" in entry),
+                         key=lambda entry: entry["opened"], reverse=True)
+        paths = []
+        for entry in entries:
+            if len(paths) == limit:
+                break
+            if os.path.isfile(entry["path"]):
+                paths.append(entry["path"])
+        return paths
@@ -1,4 +1,4 @@
-# screens/rekus_calculations.py
+# core/reccurence_calculations.py
 
 import re  # Importerer regulære udtryk til parsing af brugerinput
 import numpy as np  # Importerer NumPy til matrixberegninger og komplekse tal
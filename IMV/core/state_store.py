@@ -0,0 +1,131 @@
+"""
+Programmets samlede tilstand (layout, sidste skærm, indtastninger) i ét binært øjebliksbillede.
+
+Filen består af et hoved (MAGIC, formatversion, CRC32) efterfulgt af zlib-komprimeret JSON. Ændres
+formatet, hæves STATE_VERSION, og en funktion i MIGRATIONS løfter gamle filer én version op.
+Ændringer samles og skrives af en baggrundstråd, så en ændring aldrig venter på disken.
+"""
+import json
+import os
+import struct
+import threading
+import zlib
+
+MAGIC = b"IMVS"
+STATE_VERSION = 1
+# version -> funktion der gør data fra den version til data for version + 1
+MIGRATIONS = {}
+# Sekunder der ventes efter en ændring, så en stribe ændringer skrives samlet
+WRITE_DELAY = 0.5
+
+_HEADER = struct.Struct(">4sHI")
+
+
+def encode_state(data):
+    payload = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return _HEADER.pack(MAGIC, STATE_VERSION, zlib.crc32(payload)) + payload
+
+
+def decode_state(blob):
+    """Læser et øjebliksbillede og løfter det til STATE_VERSION. Giver ValueError ved en ødelagt fil."""
+    if len(blob) < _HEADER.size:
+        raise ValueError("Tilstandsfilen er for kort")
+    magic, version, checksum = _HEADER.unpack_from(blob)
+    payload = blob[_HEADER.size:]
+    if magic != MAGIC or zlib.crc32(payload) != checksum:
+        raise ValueError("Tilstandsfilen er ødelagt")
+    if version > STATE_VERSION:
+        raise ValueError(f"Tilstandsfilen er fra en nyere version ({version})")
+    try:
+        data = json.loads(zlib.decompress(payload).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Tilstandsfilen er ødelagt: {e}")
+    while version < STATE_VERSION:
+        if version not in MIGRATIONS:
+            raise ValueError(f"Tilstandsfilen er fra en ukendt version ({version})")
+        data = MIGRATIONS[version](data)
+        version += 1
+    return data
+
+
+class StateStore:
+    """Nøgle/værdi-lager med JSON-værdier. get og set kaldes fra GUI-tråden; skrivningen sker i baggrunden."""
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+        self._condition = threading.Condition()
+        self._dirty = False
+        self._closed = False
+        self._thread = None
+
+    def load(self):
+        """Indlæser filen. En manglende eller ødelagt fil giver en tom tilstand."""
+        try:
+            with open(self.path, "rb") as f:
+                self.data = decode_state(f.read())
+        except (OSError, ValueError):
+            self.data = {}
+        return self
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        if self.data.get(key) == value:
+            return
+        with self._condition:
+            self.data[key] = value
+            self._changed()
+
+    def remove(self, key):
+        if key not in self.data:
+            return
+        with self._condition:
+            del self.data[key]
+            self._changed()
+
+    def _changed(self):
+        """Kaldes med låsen holdt: vækker skrivetråden (og starter den første gang)."""
+        self._dirty = True
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="StateStore", daemon=True)
+            self._thread.start()
+        self._condition.notify()
+
+    def close(self):
+        """Stopper skrivetråden og skriver eventuelle ændringer, der endnu ikke er gemt."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._write_if_dirty()
+
+    def _write_if_dirty(self):
+        with self._condition:
+            if not self._dirty:
+                return
+            self._dirty = False
+            blob = encode_state(self.data)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(blob)
+        os.replace(temporary, self.path)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._dirty and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Vent lidt, så ændringer der kommer tæt efter hinanden skrives samlet
+                self._condition.wait(WRITE_DELAY)
+                if self._closed:
+                    return
+            try:
+                self._write_if_dirty()
+            except OSError:
+                pass  # Prøves igen ved næste ændring eller ved lukning
@@ -0,0 +1,291 @@
+"""
+Redigering af store tekstfiler uden at læse hele filen ind.
+
+Filen memory-mappes, og et indeks over hvor hver linje starter bygges med NumPy. Rettelser gemmes
+i en stykketabel (piece table) over linjer: uændrede linjer peger stadig ind i filen, og kun de
+rettede linjer ligger i hukommelsen. Ved gemning skrives den nye fil ved siden af originalen og
+erstatter den atomisk; alternativt kan kun det ændrede skrives på plads i filen (se LargeTextFile.save).
+"""
+import contextlib
+import mmap
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Antal bytes der behandles ad gangen ved indeksering og kopiering
+CHUNK_SIZE = 16 * 1024 * 1024
+
+
+class LargeTextFile:
+    """
+    En tekstfil åbnet linjevis. Linje i er bytes starts[i]:starts[i+1] inklusive linjeskift; den sidste
+    linje har intet linjeskift (er filen afsluttet med et linjeskift, er den sidste linje tom).
+    """
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.newline = "\n"
+        self.starts = None
+        self.pieces = []
+        self._file = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # En tom fil kan ikke memory-mappes
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._map = b""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _view(self, start, end):
+        return np.frombuffer(self._map, dtype=np.uint8, count=end - start, offset=start)
+
+    def build_index(self, report=None):
+        """Finder alle linjestarter. report(procent) kaldes efter hver blok, så det kan køre i en TaskWorker."""
+        dtype = np.uint32 if self.size < 2**32 else np.int64  # Halvt så stort indeks for filer under 4 GB
+        parts = [np.zeros(1, dtype=dtype)]
+        for offset in range(0, self.size, CHUNK_SIZE):
+            end = min(offset + CHUNK_SIZE, self.size)
+            parts.append((np.flatnonzero(self._view(offset, end) == 10) + (offset + 1)).astype(dtype))
+            if report is not None:
+                report(end * 100 / self.size)
+        self.starts = np.concatenate(parts)
+        first_end = self._line_end(0)
+        if first_end > 0 and self._map[first_end - 1:first_end] == b"\n" and self._map[first_end - 2:first_end] == b"\r\n":
+            self.newline = "\r\n"
+        self.pieces = [("orig", 0, len(self.starts))]
+
+    # ---- Linjer ----
+
+    def _line_end(self, line):
+        return int(self.starts[line + 1]) if line + 1 < len(self.starts) else self.size
+
+    @staticmethod
+    def _piece_length(piece):
+        return piece[2] - piece[1] if piece[0] == "orig" else len(piece[1])
+
+    def line_count(self):
+        return sum(self._piece_length(piece) for piece in self.pieces)
+
+    def is_modified(self):
+        return self.pieces != [("orig", 0, len(self.starts))]
+
+    def _decode_lines(self, first, last):
+        data = bytes(self._map[int(self.starts[first]):self._line_end(last - 1)])
+        lines = data.decode(self.encoding, errors="replace").split("\n")[:last - first]
+        return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+    def lines(self, start, count):
+        """Op til count linjer fra linje start (uden linjeskift)."""
+        result = []
+        position = 0
+        for piece in self.pieces:
+            length = self._piece_length(piece)
+            if position + length > start and len(result) < count:
+                first = max(start - position, 0)
+                last = min(length, first + count - len(result))
+                if piece[0] == "orig":
+                    result += self._decode_lines(piece[1] + first, piece[1] + last)
+                else:
+                    result += piece[1][first:last]
+            position += length
+            if len(result) >= count:
+                break
+        return result
+
+    def _split(self, line):
+        """Deler stykket der indeholder line, så et stykke begynder netop dér. Returnerer dets indeks."""
+        position = 0
+        for index, piece in enumerate(self.pieces):
+            length = self._piece_length(piece)
+            if position == line:
+                return index
+            if line < position + length:
+                offset = line - position
+                if piece[0] == "orig":
+                    parts = [("orig", piece[1], piece[1] + offset), ("orig", piece[1] + offset, piece[2])]
+                else:
+                    parts = [("new", piece[1][:offset]), ("new", piece[1][offset:])]
+                self.pieces[index:index + 1] = parts
+                return index + 1
+            position += length
+        return len(self.pieces)
+
+    def replace_lines(self, start, count, new_lines):
+        """Erstatter count linjer fra linje start med new_lines (en liste af tekster uden linjeskift)."""
+        first = self._split(start)
+        last = self._split(start + count)
+        replacement = [("new", list(new_lines))] if new_lines else []
+        self.pieces[first:last] = replacement
+        if not self.pieces:
+            self.pieces = [("new", [""])]  # Et tomt dokument har én tom linje, ligesom en tom fil
+
+    # ---- Gemning ----
+
+    def _segments(self):
+        """Den nye fil som (position, original position eller None, bytes eller længde)."""
+        position = 0
+        newline = self.newline.encode(self.encoding)
+        line_total = len(self.starts)
+        for index, piece in enumerate(self.pieces):
+            is_last = index == len(self.pieces) - 1
+            if piece[0] == "orig":
+                start, end = int(self.starts[piece[1]]), self._piece_end(piece, is_last)
+                yield position, start, end - start
+                position += end - start
+                if piece[2] == line_total and not is_last:
+                    # Filens sidste linje havde intet linjeskift, men står nu ikke sidst
+                    yield position, None, newline
+                    position += len(newline)
+            else:
+                data = (self.newline.join(piece[1]) + ("" if is_last else self.newline)).encode(self.encoding)
+                yield position, None, data
+                position += len(data)
+
+    def _piece_end(self, piece, is_last):
+        """Byte efter stykket. Står stykket sidst uden filens sidste linje, tages linjeskiftet ikke med."""
+        end = self._line_end(piece[2] - 1)
+        if is_last and piece[2] < len(self.starts):
+            end -= 2 if self._map[end - 2:end] == b"\r\n" else 1
+        return end
+
+    def _copy(self, out, start, length):
+        for offset in range(start, start + length, CHUNK_SIZE):
+            out.write(self._map[offset:min(offset + CHUNK_SIZE, start + length)])
+
+    def save(self, report=None, in_place=False):
+        """
+        Skriver rettelserne til filen og returnerer antal skrevne bytes.
+
+        Som standard skrives hele den nye fil til en midlertidig fil i samme mappe, som synkroniseres
+        til disken og derefter erstatter originalen; går noget galt undervejs, er originalen urørt.
+        Med in_place=True skrives kun det ændrede i selve filen: rettelser der ikke ændrer længden
+        skrives på plads, ellers samles den nye hale i en midlertidig fil og skrives tilbage fra første
+        ændring. Det er langt hurtigere for en lille rettelse i en stor fil, men fejler skrivningen
+        tilbage i filen undervejs, er originalen overskrevet fra første ændring.
+        Kan filen ikke skrives, er bufferen uændret, og gemningen kan prøves igen.
+        """
+        segments = [segment for segment in self._segments()
+                    if not (segment[1] is not None and segment[2] == 0)]
+        new_size = sum(len(payload) if source is None else payload for _, source, payload in segments)
+        changed = [segment for segment in segments if segment[1] is None or segment[1] != segment[0]]
+        if not changed and new_size == self.size:
+            return 0
+
+        starts = self._new_starts()  # Beregnes mens stykkerne stadig kan læse den gamle fil
+        if in_place:
+            written = self._write_in_place(segments, changed, new_size, report)
+        else:
+            written = self._write_replacement(segments, new_size, report)
+        self.starts = starts
+        self.pieces = [("orig", 0, len(self.starts))]
+        return written
+
+    def _write_segments(self, out, segments, first, report, share):
+        """Skriver stykkerne fra byte first; report får andelen share (procent) af gemningen."""
+        total = max(segments[-1][0] - first if segments else 0, 1)
+        for position, source, payload in segments:
+            if position < first:
+                continue
+            if source is None:
+                out.write(payload)
+            else:
+                self._copy(out, source, payload)
+            if report is not None:
+                report((position - first) * share / total)
+
+    def _write_replacement(self, segments, new_size, report):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                self._write_segments(f, segments, 0, report, 100)
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(self.path, temporary)  # Den nye fil skal have den gamles rettigheder
+            # Filen skal lukkes, før den kan erstattes (Windows tillader ikke at erstatte en mappet fil)
+            self.close()
+            try:
+                os.replace(temporary, self.path)
+            finally:
+                self._open()
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return new_size
+
+    def _write_in_place(self, segments, changed, new_size, report):
+        written = 0
+        if new_size == self.size and all(source is None for _, source, _ in changed):
+            # Samme længde og intet flyttet: skriv kun de rettede stykker på plads
+            patches = [(position, data) for position, _, data in changed]
+            with self._reopened_for_writing() as f:
+                for position, data in patches:
+                    f.seek(position)
+                    f.write(data)
+                    written += len(data)
+            return written
+
+        first_change = changed[0][0] if changed else new_size
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.TemporaryFile(dir=directory) as tail:
+            self._write_segments(tail, segments, first_change, report, 50)
+            tail.seek(0)
+            with self._reopened_for_writing() as f:
+                f.seek(first_change)
+                while True:
+                    block = tail.read(CHUNK_SIZE)
+                    if not block:
+                        break
+                    f.write(block)
+                    written += len(block)
+                    if report is not None:
+                        report(50 + written * 50 / max(new_size - first_change, 1))
+                f.truncate(new_size)
+        return written
+
+    @contextlib.contextmanager
+    def _reopened_for_writing(self):
+        """
+        Åbner filen til skrivning, før den mappede udgave slippes, så en fil der ikke kan skrives,
+        efterlader bufferen urørt. Bagefter (også ved en fejl) åbnes filen igen.
+        """
+        f = open(self.path, "r+b")
+        self.close()
+        try:
+            with f:
+                yield f
+        finally:
+            self._open()
+
+    def _new_starts(self):
+        """Linjestarterne i den gemte fil, beregnet ud fra stykkerne i stedet for at læse filen igen."""
+        dtype = self.starts.dtype if self.size < 2**32 else np.int64
+        parts = []
+        position = 0
+        newline = len(self.newline.encode(self.encoding))
+        line_total = len(self.starts)
+        for index, piece in enumerate(self.pieces):
+            is_last = index == len(self.pieces) - 1
+            if piece[0] == "orig":
+                start = int(self.starts[piece[1]])
+                parts.append(self.starts[piece[1]:piece[2]].astype(np.int64) - start + position)
+                position += self._piece_end(piece, is_last) - start
+                if piece[2] == line_total and not is_last:
+                    position += newline
+            else:
+                lengths = [len(line.encode(self.encoding)) + newline for line in piece[1]]
+                parts.append(position + np.concatenate([[0], np.cumsum(lengths[:-1], dtype=np.int64)]))
+                position += sum(lengths) - (0 if not is_last else newline)
+        starts = np.concatenate(parts) if parts else np.zeros(1, dtype=np.int64)
+        return starts.astype(np.int64 if position >= 2**32 else dtype)
@@ -0,0 +1,62 @@
+"""
+Indlæsning og gemning af tekstfiler i blokke.
+
+Funktionerne modtager en report(procent) callback ligesom opgaverne i en TaskWorker, så de kan køre
+i en baggrundstråd og vise fremskridt. Gemning skrives til en midlertidig fil i samme mappe, som
+derefter omdøbes over den gamle, så filen aldrig står halvt skrevet, hvis noget går galt undervejs.
+"""
+import codecs
+import os
+import shutil
+import tempfile
+
+# Antal tegn der afkodes eller kodes ad gangen
+CHUNK_CHARS = 1024 * 1024
+
+
+def read_text(path, report=None, encoding="utf-8"):
+    """Læser hele filen som tekst (linjeskift oversættes til \\n ligesom open())."""
+    size = max(os.path.getsize(path), 1)
+    parts = []
+    with open(path, "r", encoding=encoding) as f:
+        while True:
+            part = f.read(CHUNK_CHARS)
+            if not part:
+                break
+            parts.append(part)
+            if report is not None:
+                report(min(f.buffer.tell() * 100 / size, 100))
+    return "".join(parts)
+
+
+def write_text(path, text, report=None, encoding="utf-8"):
+    """Skriver text til path atomisk: først til en midlertidig fil, derefter omdøbning. Returnerer antal bytes."""
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    encoder = codecs.getincrementalencoder(encoding)()
+    written = 0
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            for start in range(0, len(text), CHUNK_CHARS):
+                written += f.write(encoder.encode(text[start:start + CHUNK_CHARS]))
+                if report is not None:
+                    report(min(start + CHUNK_CHARS, len(text)) * 100 / len(text))
+            written += f.write(encoder.encode("", final=True))
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temporary)  # Den nye fil skal have den gamles rettigheder
+        else:
+            os.chmod(temporary, 0o666 & ~_umask())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return written
+
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
@@ -0,0 +1,430 @@
+import math
+from fractions import Fraction
+import numpy as np
+
+# Rækker hvor den mindste Kahan-faktor er under denne andel af omkredsen regnes som næsten udartede
+ILL_CONDITIONED = 1e-8
+
+# Resultat af batchberegninger: én række pr. trekant, valid er False for ugyldige trekanter
+TRIANGLE_DTYPE = np.dtype([
+    ("a", np.float64), ("b", np.float64), ("c", np.float64),
+    ("A", np.float64), ("B", np.float64), ("C", np.float64),
+    ("perimeter", np.float64), ("area", np.float64),
+    ("valid", np.bool_),
+])
+
+# Resultat af solve_batch: som TRIANGLE_DTYPE plus løsningstype (indeks i CASES) og flertydighed (SSA)
+SOLVE_DTYPE = np.dtype(TRIANGLE_DTYPE.descr + [("case", np.int8), ("ambiguous", np.bool_)])
+
+FIELDS = ("a", "b", "c", "A", "B", "C")
+CASES = ("SSS", "SAS", "ASA", "AAS", "SSA")
+CASE_DESCRIPTIONS = {
+    "SSS": "tre sider",
+    "SAS": "to sider og den mellemliggende vinkel",
+    "ASA": "to vinkler og den mellemliggende side",
+    "AAS": "to vinkler og en modstående side",
+    "SSA": "to sider og en modstående vinkel",
+}
+
+
+def _build_dispatch_table():
+    """
+    Opslagstabel fra bitmaske over kendte størrelser (a=1, b=2, c=4, A=8, B=16, C=32)
+    til (løsningstype, permutation). Permutationen placerer de kendte størrelser i kernens
+    kanoniske rækkefølge, så én kerne dækker alle navngivninger af samme tilfælde.
+    """
+    table = [None] * 64
+    for mask in range(64):
+        sides = [i for i in range(3) if mask & (1 << i)]
+        angles = [i for i in range(3) if mask & (1 << (i + 3))]
+        if len(sides) == 3:
+            table[mask] = ("SSS", (0, 1, 2))
+        elif len(angles) >= 2 and sides:
+            side = sides[0]
+            others = tuple(i for i in range(3) if i != side)
+            # ASA hvis begge vinkler ved siden er kendt, ellers ligger siden over for en kendt vinkel
+            case = "ASA" if all(i in angles for i in others) else "AAS"
+            table[mask] = (case, (side,) + others)
+        elif len(sides) == 2 and angles:
+            missing = next(i for i in range(3) if i not in sides)
+            if missing in angles:
+                table[mask] = ("SAS", (sides[0], sides[1], missing))
+            else:
+                opposite = angles[0]
+                adjacent = next(i for i in sides if i != opposite)
+                table[mask] = ("SSA", (opposite, adjacent, missing))
+    return table
+
+
+SOLVER_DISPATCH = _build_dispatch_table()
+
+class TriangleCalculations:
+    """Klasse til beregning af trekants egenskaber baseret på sider og/eller vinkler."""
+
+    @staticmethod
+    def validate_triangle_sides(a, b, c):
+        """Validerer, om tre sider kan danne en trekant."""
+        if a <= 0 or b <= 0 or c <= 0:
+            raise ValueError("Sider skal være positive tal.")
+        if (a + b <= c) or (b + c <= a) or (a + c <= b):
+            raise ValueError("Summen af to sider skal være større end den tredje.")
+        return True
+
+    @staticmethod
+    def validate_triangle_angles(A, B, C):
+        """Validerer, om tre vinkler kan danne en trekant."""
+        if A <= 0 or B <= 0 or C <= 0:
+            raise ValueError("Vinkler skal være positive.")
+        if abs(A + B + C - 180) > 1e-10:  # Tillad lille numerisk fejl
+            raise ValueError("Summen af vinkler skal være 180 grader.")
+        return True
+
+    @staticmethod
+    def _stable_kernel(a, b, c):
+        """
+        Numerisk stabil areal- og vinkelberegning for arrays af sider (Kahans formel).
+
+        Siderne sorteres så x >= y >= z, og faktorerne i Herons formel skrives med parenteser,
+        der undgår at trække næsten lige store tal fra hinanden. Vinklerne bestemmes med
+        halvvinkelformlen tan(X/2) = r / (s - x) via atan2, som er præcis for både meget
+        spidse og næsten flade vinkler, modsat acos af cosinusrelationen.
+        Returnerer areal, vinkler i radianer (N,3) i rækkefølgen A, B, C, og de fire faktorer.
+        """
+        sides = np.stack((a, b, c), axis=1)
+        order = np.argsort(-sides, axis=1, kind="stable")
+        x, y, z = np.take_along_axis(sides, order, axis=1).T
+
+        f1 = x + (y + z)
+        f2 = z - (x - y)
+        f3 = z + (x - y)
+        f4 = x + (y - z)
+        root = np.sqrt(f1 * f2 * f3 * f4)
+        area = root / 4
+        sorted_angles = 2 * np.arctan2(root[:, None], f1[:, None] * np.stack((f2, f3, f4), axis=1))
+
+        angles = np.empty_like(sorted_angles)
+        np.put_along_axis(angles, order, sorted_angles, axis=1)
+        return area, angles, (f1, f2)
+
+    @staticmethod
+    def _exact_kernel(a, b, c):
+        """
+        Samme formler som _stable_kernel for én trekant, men med eksakte brøker (Fraction).
+        Kun afrundingen til sidst giver fejl, så resultatet er præcist til sidste ciffer.
+        """
+        x, y, z = sorted((Fraction(a), Fraction(b), Fraction(c)), reverse=True)
+        f1 = x + (y + z)
+        factors = {"x": z - (x - y), "y": z + (x - y), "z": x + (y - z)}
+        root = math.sqrt(f1 * factors["x"] * factors["y"] * factors["z"])
+        sorted_angles = {key: 2 * math.atan2(root, f1 * value) for key, value in factors.items()}
+
+        # Fordel vinklerne tilbage på a, b, c (samme rækkefølge som den stabile sortering)
+        labels = sorted(range(3), key=lambda i: -(a, b, c)[i])
+        angles = [0.0, 0.0, 0.0]
+        for key, index in zip("xyz", labels):
+            angles[index] = sorted_angles[key]
+        return root / 4, angles
+
+    @staticmethod
+    def _solve_sides(a, b, c, exact_fallback=True):
+        """
+        Areal og vinkler (grader) for arrays af sider med den stabile kerne.
+        Næsten udartede rækker regnes om med eksakte brøker, hvis exact_fallback er sat.
+        """
+        area, angles, (f1, f2) = TriangleCalculations._stable_kernel(a, b, c)
+        if exact_fallback:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                ill = np.flatnonzero((f2 > 0) & (f2 < ILL_CONDITIONED * f1))
+            for i in ill:
+                area[i], angles[i] = TriangleCalculations._exact_kernel(float(a[i]), float(b[i]), float(c[i]))
+        return area, np.degrees(angles)
+
+    @staticmethod
+    def calculate_from_sides(a, b, c, angles=None):
+        """Beregn areal, omkreds og vinkler baseret på tre sider, valider mod vinkler hvis angivet."""
+        TriangleCalculations.validate_triangle_sides(a, b, c)
+        
+        # Omkreds
+        perimeter = a + b + c
+        
+        # Areal og vinkler ved Kahans stabile udgave af Herons formel og halvvinkelformlen
+        area, computed = TriangleCalculations._solve_sides(
+            np.array([a], dtype=np.float64), np.array([b], dtype=np.float64), np.array([c], dtype=np.float64))
+        area = float(area[0])
+        A, B, C = (float(v) for v in computed[0])
+        
+        # Hvis vinkler er angivet, valider konsistens
+        if angles is not None:
+            input_A, input_B, input_C = angles
+            TriangleCalculations.validate_triangle_angles(input_A, input_B, input_C)
+            # Tjek om beregnede vinkler matcher inputvinkler inden for en tolerance
+            if (abs(A - input_A) > 1 or abs(B - input_B) > 1 or abs(C - input_C) > 1):
+                raise ValueError("Angivne vinkler stemmer ikke overens med siderne.")
+        
+        return {
+            "perimeter": perimeter,
+            "area": area,
+            "angles": {"A": A, "B": B, "C": C},
+            "sides": {"a": a, "b": b, "c": c}
+        }
+
+    @staticmethod
+    def calculate_from_side_angles(known_side, known_side_label, A, B, C):
+        """Beregn resterende sider, areal og omkreds baseret på én kendt side og tre vinkler."""
+        import math
+        TriangleCalculations.validate_triangle_angles(A, B, C)
+
+        # Brug sinusrelation: a/sin(A) = b/sin(B) = c/sin(C)
+        angles = {'A': A, 'B': B, 'C': C}
+        sides = {}
+
+        # Udregn skalar: known_side / sin(known_angle)
+        angle_opposite_known = {'a': 'A', 'b': 'B', 'c': 'C'}[known_side_label]
+        scale = known_side / math.sin(math.radians(angles[angle_opposite_known]))
+
+        # Beregn alle sider med skalaen
+        for side, angle in zip(['a', 'b', 'c'], ['A', 'B', 'C']):
+            sides[side] = scale * math.sin(math.radians(angles[angle]))
+
+        # Areal ved formel: (1/2)*ab*sin(C), her bruger vi a, b og vinkel C
+        area = (sides['a'] * sides['b'] * math.sin(math.radians(angles['C']))) / 2
+        perimeter = sides['a'] + sides['b'] + sides['c']
+
+        return {
+            "perimeter": perimeter,
+            "area": area,
+            "angles": angles,
+            "sides": sides
+        }
+
+    # ---- Batch-varianter: hele kolonner på én gang, ugyldige trekanter markeres i stedet for at kaste fejl ----
+
+    @staticmethod
+    def _batch_result(a, b, c, A, B, C, perimeter, area, valid):
+        """Samler kolonnerne i et struktureret array og sætter NaN i ugyldige rækker."""
+        result = np.empty(valid.shape, dtype=TRIANGLE_DTYPE)
+        for name, column in zip(("a", "b", "c", "A", "B", "C", "perimeter", "area"),
+                                (a, b, c, A, B, C, perimeter, area)):
+            result[name] = np.where(valid, column, np.nan)
+        result["valid"] = valid
+        return result
+
+    @staticmethod
+    def calculate_from_sides_batch(a, b, c, exact_fallback=True):
+        """
+        Beregn areal, omkreds og vinkler for arrays af tre sider. Returnerer et array med TRIANGLE_DTYPE.
+        Tynde og næsten udartede trekanter beregnes stabilt; se _solve_sides.
+        """
+        a, b, c = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64).ravel() for x in (a, b, c)))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            valid = ((a > 0) & (b > 0) & (c > 0) &
+                     (a + b > c) & (b + c > a) & (a + c > b))
+            perimeter = a + b + c
+            area, angles = TriangleCalculations._solve_sides(a, b, c, exact_fallback)
+        A, B, C = angles.T
+        return TriangleCalculations._batch_result(a, b, c, A, B, C, perimeter, area, valid)
+
+    @staticmethod
+    def calculate_from_side_angles_batch(known_side, known_side_label, A, B, C):
+        """
+        Beregn sider, areal og omkreds for arrays af én kendt side og tre vinkler.
+        known_side_label kan være 'a', 'b', 'c' eller et array af dem (eller 0, 1, 2).
+        """
+        labels = np.asarray(known_side_label)
+        if labels.dtype.kind in "US":
+            lookup = {"a": 0, "b": 1, "c": 2}
+            if not set(np.unique(labels).tolist()) <= set(lookup):
+                raise ValueError("Sidens navn skal være a, b eller c")
+            labels = np.vectorize(lookup.get, otypes=[np.int64])(labels)
+        side, A, B, C, labels = np.broadcast_arrays(
+            *(np.asarray(x, dtype=np.float64).ravel() for x in (known_side, A, B, C)), labels.ravel())
+        labels = labels.astype(np.int64)
+
+        angles = np.radians(np.stack((A, B, C), axis=1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            valid = ((side > 0) & (A > 0) & (B > 0) & (C > 0) &
+                     (np.abs(A + B + C - 180) <= 1e-10) & (labels >= 0) & (labels <= 2))
+
+            # Sinusrelation: a/sin(A) = b/sin(B) = c/sin(C)
+            sines = np.sin(angles)
+            opposite = np.take_along_axis(sines, np.clip(labels, 0, 2)[:, None], axis=1)[:, 0]
+            sides = (side / opposite)[:, None] * sines
+            area = sides[:, 0] * sides[:, 1] * sines[:, 2] / 2
+            perimeter = sides.sum(axis=1)
+        return TriangleCalculations._batch_result(sides[:, 0], sides[:, 1], sides[:, 2], A, B, C,
+                                                  perimeter, area, valid)
+
+    # ---- Fuld løser: SSS, SAS, ASA, AAS og SSA via SOLVER_DISPATCH ----
+    # Kernerne arbejder i kanonisk rækkefølge og returnerer (sider, vinkler i grader, areal, gyldig, alternativ).
+
+    @staticmethod
+    def _kernel_sss(sides, angles):
+        x, y, z = sides.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            valid = (x > 0) & (y > 0) & (z > 0) & (x + y > z) & (y + z > x) & (x + z > y)
+            area, computed = TriangleCalculations._solve_sides(x, y, z)
+        return sides, computed, area, valid, None
+
+    @staticmethod
+    def _kernel_sas(sides, angles):
+        # Kendt: siderne x, y og vinklen Z mellem dem
+        x, y = sides[:, 0], sides[:, 1]
+        Z = np.radians(angles[:, 2])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            valid = (x > 0) & (y > 0) & (Z > 0) & (Z < np.pi)
+            # Cosinusrelationen skrevet som (x-y)^2 + 4xy sin^2(Z/2) undgår udslukning ved små vinkler
+            z = np.sqrt((x - y) ** 2 + 4 * x * y * np.sin(Z / 2) ** 2)
+            area, computed = TriangleCalculations._solve_sides(x, y, z)
+        computed[:, 2] = angles[:, 2]
+        return np.column_stack((x, y, z)), computed, area, valid, None
+
+    @staticmethod
+    def _kernel_angles(sides, angles):
+        # Kendt: siden x og mindst to vinkler (ASA/AAS); den manglende vinkel er 180 minus de andre
+        known = ~np.isnan(angles)
+        total = np.nansum(angles, axis=1)
+        angles = np.where(known, angles, (180 - total)[:, None])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            valid = ((sides[:, 0] > 0) & np.all(angles > 0, axis=1) &
+                     (np.abs(angles.sum(axis=1) - 180) <= 1e-9 * 180))
+            sines = np.sin(np.radians(angles))
+            result = (sides[:, 0] / sines[:, 0])[:, None] * sines
+            area = result[:, 0] * result[:, 1] * sines[:, 2] / 2
+        return result, angles, area, valid, None
+
+    @staticmethod
+    def _kernel_ssa(sides, angles):
+        # Kendt: siden x med modstående vinkel X og siden y; op til to trekanter passer
+        x, y = sides[:, 0], sides[:, 1]
+        X = angles[:, 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sin_y = y * np.sin(np.radians(X)) / x
+            sin_y = np.where(np.abs(sin_y - 1) <= 1e-12, 1.0, sin_y)
+            valid = (x > 0) & (y > 0) & (X > 0) & (X < 180) & (sin_y <= 1)
+
+            def complete(Y):
+                Z = 180 - X - Y
+                ok = valid & (Z > 0)
+                z = x * np.sin(np.radians(Z)) / np.sin(np.radians(X))
+                area = x * y * np.sin(np.radians(Z)) / 2
+                return np.column_stack((x, y, z)), np.column_stack((X, Y, Z)), area, ok
+
+            Y1 = np.degrees(np.arcsin(np.clip(sin_y, -1, 1)))
+            primary = complete(Y1)
+            alternative = complete(180 - Y1)
+        # Den stumpe løsning er kun en anden trekant, når sin(Y) < 1
+        alternative_valid = alternative[3] & (sin_y < 1)
+        sides1, angles1, area1, valid1 = primary
+        # Hvis kun den stumpe løsning findes, bliver den den primære
+        use_alt = ~valid1 & alternative_valid
+        sides1 = np.where(use_alt[:, None], alternative[0], sides1)
+        angles1 = np.where(use_alt[:, None], alternative[1], angles1)
+        area1 = np.where(use_alt, alternative[2], area1)
+        ambiguous = valid1 & alternative_valid
+        return sides1, angles1, area1, valid1 | use_alt, (alternative[0], alternative[1], alternative[2], ambiguous)
+
+    @staticmethod
+    def _solve_group(case, permutation, values):
+        """Kører kernen for én løsningstype på rækker i values (N,6) med NaN for ukendte størrelser."""
+        order = list(permutation)
+        sides = values[:, :3][:, order]
+        angles = values[:, 3:][:, order]
+        kernel = {
+            "SSS": TriangleCalculations._kernel_sss,
+            "SAS": TriangleCalculations._kernel_sas,
+            "ASA": TriangleCalculations._kernel_angles,
+            "AAS": TriangleCalculations._kernel_angles,
+            "SSA": TriangleCalculations._kernel_ssa,
+        }[case]
+        sides, angles, area, valid, alternative = kernel(sides, angles)
+
+        # Tilbage til rækkefølgen a, b, c
+        inverse = np.argsort(order)
+        sides, angles = sides[:, inverse], angles[:, inverse]
+        if alternative is not None:
+            alternative = (alternative[0][:, inverse], alternative[1][:, inverse], alternative[2], alternative[3])
+
+        # Overskydende kendte størrelser skal stemme med løsningen (vinkler inden for 1 grad, sider 1 %)
+        with np.errstate(invalid="ignore"):
+            known_sides = values[:, :3]
+            known_angles = values[:, 3:]
+            side_ok = np.isnan(known_sides) | (np.abs(sides - known_sides) <= 1e-2 * np.abs(known_sides))
+            angle_ok = np.isnan(known_angles) | (np.abs(angles - known_angles) <= 1)
+        valid = valid & np.all(side_ok, axis=1) & np.all(angle_ok, axis=1)
+        return sides, angles, area, valid, alternative
+
+    @staticmethod
+    def _known_values(a, b, c, A, B, C):
+        """Stakker inputkolonnerne til (N,6); værdier <= 0 eller NaN betyder ukendt."""
+        values = np.column_stack(np.broadcast_arrays(
+            *(np.asarray(x, dtype=np.float64).ravel() for x in (a, b, c, A, B, C))))
+        with np.errstate(invalid="ignore"):
+            values[~(values > 0)] = np.nan
+        bits = (~np.isnan(values)) * (1 << np.arange(6))
+        return values, bits.sum(axis=1)
+
+    @staticmethod
+    def solve_batch(a, b, c, A, B, C):
+        """
+        Løs trekanter med blandede kendte størrelser. Ukendte værdier angives som NaN eller 0.
+        Rækkerne grupperes efter bitmasken over kendte størrelser, og hver gruppe sendes direkte
+        til den rigtige kerne via SOLVER_DISPATCH. Returnerer et array med SOLVE_DTYPE;
+        case er -1 og valid False for rækker uden nok oplysninger.
+        """
+        values, masks = TriangleCalculations._known_values(a, b, c, A, B, C)
+        result = np.empty(len(values), dtype=SOLVE_DTYPE)
+        for name in FIELDS + ("perimeter", "area"):
+            result[name] = np.nan
+        result["valid"] = False
+        result["case"] = -1
+        result["ambiguous"] = False
+
+        for mask in np.unique(masks):
+            entry = SOLVER_DISPATCH[mask]
+            if entry is None:
+                continue
+            case, permutation = entry
+            rows = np.flatnonzero(masks == mask)
+            sides, angles, area, valid, alternative = TriangleCalculations._solve_group(
+                case, permutation, values[rows])
+            group = TriangleCalculations._batch_result(
+                sides[:, 0], sides[:, 1], sides[:, 2], angles[:, 0], angles[:, 1], angles[:, 2],
+                sides.sum(axis=1), area, valid)
+            for name in TRIANGLE_DTYPE.names:
+                result[name][rows] = group[name]
+            result["case"][rows] = CASES.index(case)
+            if alternative is not None:
+                result["ambiguous"][rows] = alternative[3] & valid
+        return result
+
+    @staticmethod
+    def solve(sides, angles):
+        """
+        Løs én trekant ud fra de kendte sider [a, b, c] og vinkler [A, B, C] (0 eller None = ukendt).
+        Returnerer samme dict som calculate_from_sides plus "case" og "alternative",
+        som er den anden løsning i det flertydige SSA-tilfælde (ellers None).
+        """
+        raw = [0.0 if v is None else v for v in list(sides) + list(angles)]
+        values, masks = TriangleCalculations._known_values(*([v] for v in raw))
+        entry = SOLVER_DISPATCH[masks[0]]
+        if entry is None:
+            raise ValueError("Angiv tre sider, to sider og en vinkel, eller en side og to vinkler.")
+        case, permutation = entry
+        sides, angles, area, valid, alternative = TriangleCalculations._solve_group(case, permutation, values)
+        if not valid[0]:
+            raise ValueError(f"Der findes ingen trekant med de angivne værdier ({case}).")
+
+        def as_dict(sides, angles, area):
+            return {
+                "perimeter": float(sides.sum()),
+                "area": float(area),
+                "angles": dict(zip("ABC", (float(v) for v in angles))),
+                "sides": dict(zip("abc", (float(v) for v in sides))),
+            }
+
+        result = as_dict(sides[0], angles[0], area[0])
+        result["case"] = case
+        result["alternative"] = None
+        if alternative is not None and alternative[3][0]:
+            result["alternative"] = as_dict(alternative[0][0], alternative[1][0], alternative[2][0])
+        return result
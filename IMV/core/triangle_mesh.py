@@ -0,0 +1,255 @@
+import os
+import numpy as np
+from IMV.core.triangle_calculations import TriangleCalculations
+
+# Antal flader der beregnes ad gangen; holder hukommelsesforbruget fast uanset nettets størrelse
+MESH_CHUNK_SIZE = 500_000
+# Vinkelhistogrammets intervaller i grader
+ANGLE_BINS = np.arange(0, 181, 5)
+# Antal udartede fladeindeks der huskes og vises; resten tælles kun
+SHOWN_DEGENERATE_FACES = 20
+
+PLY_TYPES = {
+    "char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2", "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4", "double": "f8", "float64": "f8",
+}
+
+
+def load_mesh(path, faces_path=None):
+    """
+    Indlæser et trekantsnet som (vertices (V,3), faces (F,3)).
+    Understøtter OBJ, PLY (ascii og binær), .npz med 'vertices' og 'faces' samt to .npy-filer.
+    Flader fra .npy og binær PLY memory-mappes, så de ikke indlæses på én gang.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".obj":
+        vertices, faces = _load_obj(path)
+    elif extension == ".ply":
+        vertices, faces = _load_ply(path)
+    elif extension == ".npz":
+        with np.load(path) as data:
+            vertices, faces = data["vertices"], data["faces"]
+    elif extension == ".npy":
+        if faces_path is None:
+            raise ValueError("Vælg både en fil med hjørner og en fil med flader")
+        vertices = np.load(path, mmap_mode="r")
+        faces = np.load(faces_path, mmap_mode="r")
+    else:
+        raise ValueError(f"Ukendt filtype: {extension}")
+
+    if vertices.ndim != 2 or vertices.shape[1] < 3:
+        raise ValueError("Hjørnerne skal have formen (V,3)")
+    if faces.ndim != 2 or faces.shape[1] != 3:
+        raise ValueError("Fladerne skal være trekanter med formen (F,3)")
+    return np.asarray(vertices[:, :3], dtype=np.float64), faces
+
+
+def _load_obj(path):
+    """Læser OBJ i bidder af MESH_CHUNK_SIZE linjer, så kun de færdige arrays bliver i hukommelsen."""
+    vertex_parts, face_parts = [], []
+    vertex_lines, face_lines = [], []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("v "):
+                vertex_lines.append(line)
+                if len(vertex_lines) == MESH_CHUNK_SIZE:
+                    vertex_parts.append(_obj_vertices(vertex_lines))
+                    vertex_lines = []
+            elif line.startswith("f "):
+                face_lines.append(line)
+                if len(face_lines) == MESH_CHUNK_SIZE:
+                    face_parts.append(_obj_faces(face_lines))
+                    face_lines = []
+    vertex_parts.append(_obj_vertices(vertex_lines))
+    face_parts.append(_obj_faces(face_lines))
+    vertices = np.concatenate(vertex_parts)
+    faces = np.concatenate(face_parts)
+    # OBJ tæller fra 1, og negative indeks tæller bagfra
+    faces = np.where(faces > 0, faces - 1, faces + len(vertices))
+    return vertices, faces
+
+
+def _obj_vertices(lines):
+    if not lines:
+        return np.empty((0, 3))
+    return np.loadtxt(lines, dtype=np.float64, usecols=(1, 2, 3), ndmin=2)
+
+
+def _obj_faces(lines):
+    """Fladelinjer ("f 1/2/3 4/5/6 ...") som hjørneindeks; polygoner deles i en vifte af trekanter."""
+    faces = []
+    for line in lines:
+        corners = [int(token.split("/")[0]) for token in line[2:].split()]
+        for i in range(1, len(corners) - 1):
+            faces.append((corners[0], corners[i], corners[i + 1]))
+    return np.array(faces, dtype=np.int64).reshape(-1, 3)
+
+
+def _read_ascii_rows(f, count, usecols, dtype):
+    """Læser count linjer med np.loadtxt i bidder af MESH_CHUNK_SIZE linjer."""
+    rows = np.empty((count, len(usecols)), dtype=dtype)
+    for start in range(0, count, MESH_CHUNK_SIZE):
+        lines = [f.readline() for _ in range(min(MESH_CHUNK_SIZE, count - start))]
+        if not lines[-1]:
+            raise ValueError("PLY-filen slutter, før alle elementer er læst")
+        rows[start:start + len(lines)] = np.loadtxt(lines, dtype=dtype, usecols=usecols, ndmin=2)
+    return rows
+
+
+def _load_ply(path):
+    with open(path, "rb") as f:
+        if f.readline().strip() != b"ply":
+            raise ValueError("Ikke en PLY-fil")
+        file_format = None
+        elements = []
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError("PLY-headeren mangler 'end_header'")
+            words = line.decode("ascii", errors="replace").split()
+            if not words:
+                continue
+            if words[0] == "format":
+                file_format = words[1]
+            elif words[0] == "element":
+                elements.append({"name": words[1], "count": int(words[2]), "properties": []})
+            elif words[0] == "property":
+                elements[-1]["properties"].append(words[1:])
+            elif words[0] == "end_header":
+                break
+        header_size = f.tell()
+
+    names = [element["name"] for element in elements]
+    if names[:2] != ["vertex", "face"]:
+        raise ValueError("PLY-filen skal starte med elementerne 'vertex' og 'face'")
+    vertex_element, face_element = elements[0], elements[1]
+    if any(prop[0] == "list" for prop in vertex_element["properties"]):
+        raise ValueError("Hjørner med listeegenskaber understøttes ikke")
+    # Fladerne kan have flere egenskaber (fx farve); hjørneindeksene er den eneste liste blandt dem
+    face_lists = [i for i, prop in enumerate(face_element["properties"]) if prop[0] == "list"]
+    if len(face_lists) != 1:
+        raise ValueError("PLY-fladerne skal have netop én liste (hjørneindeksene)")
+    list_index = face_lists[0]
+
+    if file_format == "ascii":
+        axes = [i for i, prop in enumerate(vertex_element["properties"]) if prop[-1] in ("x", "y", "z")]
+        if len(axes) != 3:
+            raise ValueError("PLY-hjørnerne skal have egenskaberne x, y og z")
+        with open(path, "rb") as f:
+            f.seek(header_size)
+            vertices = _read_ascii_rows(f, vertex_element["count"], axes, np.float64)
+            # Egenskaberne før listen fylder én kolonne hver; listen er antallet efterfulgt af indeksene
+            faces = _read_ascii_rows(f, face_element["count"], range(list_index, list_index + 4), np.int64)
+        if np.any(faces[:, 0] != 3):
+            raise ValueError("Kun trekantsnet understøttes")
+        return vertices, faces[:, 1:]
+
+    if file_format not in ("binary_little_endian", "binary_big_endian"):
+        raise ValueError(f"Ukendt PLY-format: {file_format}")
+    order = "<" if file_format == "binary_little_endian" else ">"
+    vertex_dtype = np.dtype([(prop[1], order + PLY_TYPES[prop[0]]) for prop in vertex_element["properties"]])
+    # Trekantsnet har fast længde pr. flade og kan derfor memory-mappes som et struktureret array
+    fields = []
+    for i, prop in enumerate(face_element["properties"]):
+        if i == list_index:
+            fields += [("count", order + PLY_TYPES[prop[1]]), ("indices", order + PLY_TYPES[prop[2]], (3,))]
+        else:
+            fields.append((f"property{i}", order + PLY_TYPES[prop[0]]))
+    face_dtype = np.dtype(fields)
+
+    vertex_data = np.memmap(path, dtype=vertex_dtype, mode="r", offset=header_size,
+                            shape=(vertex_element["count"],))
+    vertices = np.column_stack([vertex_data[axis] for axis in ("x", "y", "z")]).astype(np.float64)
+    face_data = np.memmap(path, dtype=face_dtype, mode="r",
+                          offset=header_size + vertex_dtype.itemsize * vertex_element["count"],
+                          shape=(face_element["count"],))
+    for start in range(0, len(face_data), MESH_CHUNK_SIZE):
+        if np.any(face_data["count"][start:start + MESH_CHUNK_SIZE] != 3):
+            raise ValueError("Kun trekantsnet understøttes")
+    return vertices, face_data["indices"]
+
+
+def iter_mesh_faces(vertices, faces, chunk_size=MESH_CHUNK_SIZE):
+    """
+    Beregner sider, areal og vinkler for fladerne i bidder med calculate_from_sides_batch.
+    Siden a ligger over for hjørne 0, b over for hjørne 1 og c over for hjørne 2.
+    Giver (første fladeindeks, resultat med TRIANGLE_DTYPE).
+    """
+    for start in range(0, len(faces), chunk_size):
+        indices = np.asarray(faces[start:start + chunk_size], dtype=np.int64)
+        if indices.size and (indices.min() < 0 or indices.max() >= len(vertices)):
+            raise ValueError("Fladerne henviser til hjørner, der ikke findes")
+        v0, v1, v2 = (vertices[indices[:, i]] for i in range(3))
+        a = np.linalg.norm(v1 - v2, axis=1)
+        b = np.linalg.norm(v2 - v0, axis=1)
+        c = np.linalg.norm(v0 - v1, axis=1)
+        yield start, TriangleCalculations.calculate_from_sides_batch(a, b, c)
+
+
+class MeshStatistics:
+    """Samler statistik over et net, mens fladerne beregnes bid for bid."""
+
+    def __init__(self):
+        self.face_count = 0
+        self.total_area = 0.0
+        self.total_perimeter = 0.0
+        self.min_area = np.inf
+        self.max_area = 0.0
+        self.angle_histogram = np.zeros(len(ANGLE_BINS) - 1, dtype=np.int64)
+        self.degenerate_count = 0
+        self.degenerate_faces = []  # De første SHOWN_DEGENERATE_FACES indeks
+
+    def update(self, start, result):
+        self.face_count += len(result)
+        valid = result["valid"]
+        degenerate = np.flatnonzero(~valid)
+        self.degenerate_count += len(degenerate)
+        room = SHOWN_DEGENERATE_FACES - len(self.degenerate_faces)
+        if room > 0:
+            self.degenerate_faces.extend((degenerate[:room] + start).tolist())
+        areas = result["area"][valid]
+        if len(areas):
+            self.total_area += areas.sum()
+            self.total_perimeter += result["perimeter"][valid].sum()
+            self.min_area = min(self.min_area, areas.min())
+            self.max_area = max(self.max_area, areas.max())
+        angles = np.concatenate([result[name][valid] for name in ("A", "B", "C")])
+        self.angle_histogram += np.histogram(angles, bins=ANGLE_BINS)[0]
+
+    def summary(self):
+        """Tekstopsummering til visning i brugergrænsefladen."""
+        valid = self.face_count - self.degenerate_count
+        lines = [
+            f"Flader: {self.face_count}",
+            f"Udartede flader: {self.degenerate_count}",
+            f"Samlet areal: {self.total_area:.4f}",
+            f"Samlet omkreds af flader: {self.total_perimeter:.4f}",
+        ]
+        if valid:
+            lines.append(f"Areal pr. flade: min {self.min_area:.4g}, "
+                         f"gennemsnit {self.total_area / valid:.4g}, maks {self.max_area:.4g}")
+            lines.append("Vinkelfordeling (grader):")
+            peak = max(self.angle_histogram.max(), 1)
+            for lo, hi, count in zip(ANGLE_BINS[:-1], ANGLE_BINS[1:], self.angle_histogram):
+                if count:
+                    lines.append(f"{lo:3d}-{hi:3d}: {'#' * int(40 * count / peak):<40} {count}")
+        if self.degenerate_faces:
+            shown = ", ".join(str(i) for i in self.degenerate_faces)
+            more = " ..." if self.degenerate_count > len(self.degenerate_faces) else ""
+            lines.append(f"Udartede fladeindeks: {shown}{more}")
+        return "\n".join(lines)
+
+
+def analyze_mesh(vertices, faces, chunk_size=MESH_CHUNK_SIZE, report=None):
+    """
+    Analyserer alle flader i et net. report(procent, statistik) kaldes efter hver bid,
+    så delresultater kan vises undervejs.
+    """
+    statistics = MeshStatistics()
+    for start, result in iter_mesh_faces(vertices, faces, chunk_size):
+        statistics.update(start, result)
+        if report is not None:
+            report(100 * (start + len(result)) / max(len(faces), 1), statistics)
+    return statistics
@@ -0,0 +1,469 @@
+import itertools
+import os
+import numpy as np
+
+# Antal rækker der behandles ad gangen, så memory-mappede punktskyer aldrig indlæses helt
+CHUNK_SIZE = 1_000_000
+
+
+def load_points(path):
+    """Åbner en .npy-fil med (N,3) punkter som memory-map, så kun de brugte dele læses fra disken."""
+    points = np.load(path, mmap_mode="r")
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError("Punktfilen skal indeholde et array med formen (N,3)")
+    return points
+
+
+def iter_coordinate_chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Læser en koordinatliste (.npy eller CSV) i bidder af højst chunk_size rækker.
+    Giver (bid, fremskridt) hvor fremskridt er mellem 0 og 1.
+    CSV kan bruge komma, semikolon eller mellemrum som skilletegn, og en overskriftslinje springes over.
+    Bruger filen semikolon, er komma decimaltegn (dansk CSV: 1,5;2,0;3,25).
+    """
+    if path.lower().endswith(".npy"):
+        data = np.load(path, mmap_mode="r")
+        if data.ndim != 2:
+            raise ValueError("Filen skal indeholde et todimensionelt array")
+        for start in range(0, len(data), chunk_size):
+            chunk = np.asarray(data[start:start + chunk_size], dtype=np.float64)
+            yield chunk, min(start + chunk_size, len(data)) / max(len(data), 1)
+        return
+
+    total_size = max(os.path.getsize(path), 1)
+    consumed = 0
+    columns = None
+    semicolons = None  # Afgøres ud fra første bid: semikolon som skilletegn og komma som decimaltegn
+    with open(path, "rb") as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                break
+            consumed += sum(len(line) for line in lines)
+            text = b"".join(lines).decode("utf-8")
+            if semicolons is None:
+                semicolons = ";" in text
+            if semicolons:
+                text = text.replace(",", ".").replace(";", " ")
+            else:
+                text = text.replace(",", " ")
+            rows = text.splitlines()
+            if columns is None and rows:
+                try:
+                    [float(value) for value in rows[0].split()]
+                except ValueError:
+                    rows = rows[1:]  # Overskriftslinje
+            try:
+                chunk = np.loadtxt(rows, dtype=np.float64, ndmin=2)
+            except ValueError:
+                raise ValueError("Filen indeholder ugyldige tal eller et forskelligt antal kolonner")
+            if len(chunk) == 0:
+                continue
+            if columns is None:
+                columns = chunk.shape[1]
+            elif chunk.shape[1] != columns:
+                raise ValueError("Alle rækker skal have samme antal kolonner")
+            yield chunk, consumed / total_size
+
+
+def _workspace_angle(coords1, coords2, points1, points2):
+    degrees, _ = VectorOperations.angle_batch(coords1, coords2, None, points1, points2)
+    return degrees[:, None]
+
+
+# Operationer til arbejdsområdet: navn -> (funktion over to (N,3) sæt, kolonneoverskrifter)
+WORKSPACE_OPERATIONS = {
+    "Addition": (lambda c1, c2, p1, p2: VectorOperations.add_batch(c1, c2, p1, p2), ["x", "y", "z"]),
+    "Subtraktion": (lambda c1, c2, p1, p2: VectorOperations.subtract_batch(c1, c2, p1, p2), ["x", "y", "z"]),
+    "Skalar Produkt": (lambda c1, c2, p1, p2: VectorOperations.dot_product_batch(c1, c2, p1, p2)[:, None],
+                       ["Skalarprodukt"]),
+    "Kryds Produkt": (lambda c1, c2, p1, p2: VectorOperations.cross_product_batch(c1, c2, p1, p2), ["x", "y", "z"]),
+    "Vinkel": (_workspace_angle, ["Vinkel (grader)"]),
+}
+
+
+def run_workspace_operation(operation, chunks, points1=False, points2=False):
+    """
+    Kører en arbejdsområde-operation over bidder med 6 kolonner (x1 y1 z1 x2 y2 z2).
+    Giver (resultat, fremskridt) pr. bid.
+    """
+    function, _ = WORKSPACE_OPERATIONS[operation]
+    for chunk, progress in chunks:
+        if chunk.ndim != 2 or chunk.shape[1] != 6:
+            raise ValueError("Hver række skal have 6 kolonner: x1 y1 z1 x2 y2 z2")
+        yield function(chunk[:, :3], chunk[:, 3:], points1, points2), progress
+
+
+def write_coordinates(path, rows, header):
+    """Skriver rækker til CSV eller .npy. rows kan være et memory-map og skrives i bidder."""
+    if path.lower().endswith(".npy"):
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=rows.shape)
+        for start in range(0, len(rows), CHUNK_SIZE):
+            out[start:start + CHUNK_SIZE] = rows[start:start + CHUNK_SIZE]
+        out.flush()
+        del out
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(header) + "\n")
+        for start in range(0, len(rows), CHUNK_SIZE):
+            np.savetxt(f, rows[start:start + CHUNK_SIZE], delimiter=",", fmt="%.10g")
+
+
+class VectorOperations:
+    @staticmethod
+    def validate_coordinates(coord1, coord2, coord3=None):
+        coords = [coord1, coord2]
+        if coord3 is not None:
+            coords.append(coord3)
+        for coord in coords:
+            if not isinstance(coord, np.ndarray):
+                raise ValueError("Koordinater skal være et nparray")
+            if coord.shape != (3,):
+                raise ValueError("Alle 3 koordinater skal udfyldes")
+
+    @staticmethod
+    def add(coord1, coord2, type1, type2):
+        VectorOperations.validate_coordinates(coord1, coord2)
+        if type1 == "Punkt" and type2 == "Punkt":
+            raise ValueError("Addition kan ikke foretages mellem to punkter")
+        return coord1 + coord2
+
+    @staticmethod
+    def subtract(coord1, coord2, type1, type2):
+        VectorOperations.validate_coordinates(coord1, coord2)
+        if type1 == "Punkt" and type2 == "Vektor":
+            raise ValueError("Kan ikke fratrække punkt fra vektor")
+        return coord1 - coord2
+
+    @staticmethod
+    def dot_product(coord1, coord2, type1, type2):
+        VectorOperations.validate_coordinates(coord1, coord2)
+        if type1 == "Punkt" or type2 == "Punkt":
+            raise ValueError("Skalar produkt kræver to vektorer")
+        return np.dot(coord1, coord2)
+
+    @staticmethod
+    def cross_product(coord1, coord2, type1, type2):
+        VectorOperations.validate_coordinates(coord1, coord2)
+        if type1 == "Punkt" or type2 == "Punkt":
+            raise ValueError("Kryds produkt kræver to vektorer")
+        return np.cross(coord1, coord2)
+
+
+    @staticmethod
+    def angle(coord1, coord2, coord3, type1, type2, type3):
+        # To vektorer
+        if type1 == "Vektor" and type2 == "Vektor" and (coord3 is None or type3 == "Vektor"):
+            vec1 = np.array(coord1)
+            vec2 = np.array(coord2)
+
+        # Tre punkter
+        elif type1 == "Punkt" and type2 == "Punkt" and type3 == "Punkt":
+            vec1 = np.array(coord2) - np.array(coord1)
+            vec2 = np.array(coord3) - np.array(coord1)
+
+        else:
+            raise ValueError("Ugyldige typer eller manglende input. Brug enten to vektorer eller tre punkter.")
+
+        # Beregn vinkel mellem vec1 og vec2
+        dot_product = np.dot(vec1, vec2)
+        norm_vec1 = np.linalg.norm(vec1)
+        norm_vec2 = np.linalg.norm(vec2)
+
+        if norm_vec1 == 0 or norm_vec2 == 0:
+            raise ValueError("En eller begge vektorer har længde 0, så vinkel kan ikke defineres.")
+
+        cos_theta = dot_product / (norm_vec1 * norm_vec2)
+        cos_theta = np.clip(cos_theta, -1.0, 1.0)
+
+        theta_rad = np.arccos(cos_theta)
+        theta_deg = np.degrees(theta_rad)
+
+        return theta_deg, theta_rad
+
+
+            
+
+    @staticmethod
+    def plane_equation(coord1, coord2, coord3, type1, type2, type3):
+        VectorOperations.validate_coordinates(coord1, coord2, coord3)
+        
+        # Initialisering af normalvektor
+        normal = None
+        
+        # Udkast 1: 3 punkter
+        if type1 == "Punkt" and type2 == "Punkt" and type3 == "Punkt":
+            vec1 = coord2 - coord1
+            vec2 = coord3 - coord1
+            normal = np.cross(vec1, vec2)
+            point = coord1
+        # Udkast 2: 1 punkt og 2 vektorer
+        elif type1 == "Punkt" and type2 == "Vektor" and type3 == "Vektor":
+            normal = np.cross(coord2, coord3)
+            point = coord1
+        elif type2 == "Punkt" and type1 == "Vektor" and type3 == "Vektor":
+            normal = np.cross(coord1, coord3)
+            point = coord2
+        elif type3 == "Punkt" and type1 == "Vektor" and type2 == "Vektor":
+            normal = np.cross(coord1, coord2)
+            point = coord3
+        else:
+            raise ValueError("Planens ligning kræver 3 punkter eller 2 vektorer og 1 punkt")
+
+        # Tjekker om normalvektoren er lig 0
+        if np.allclose(normal, 0):
+            raise ValueError("Vektorer er parallele eller rammer hinanden, planens ligning kan ikke fremstilles")
+
+        # Planens ligning
+        a, b, c = normal
+        d = np.dot(normal, point)
+        
+        return a, b, c, d
+
+    # ---- Batch-varianter: (N,3) arrays, én NumPy-operation pr. beregning ----
+    # Typerne angives som booleske masker, hvor True betyder "Punkt" og False "Vektor".
+
+    @staticmethod
+    def validate_batch_coordinates(*coords):
+        """Validerer og broadcaster (N,3) arrays. Et enkelt (3,) koordinat gælder for alle rækker."""
+        arrays = []
+        for coord in coords:
+            if not isinstance(coord, np.ndarray):
+                raise ValueError("Koordinater skal være et nparray")
+            if coord.ndim == 1:
+                coord = coord.reshape(1, -1)
+            if coord.ndim != 2 or coord.shape[1] != 3:
+                raise ValueError("Koordinater skal have formen (N,3)")
+            arrays.append(coord)
+        try:
+            return np.broadcast_arrays(*arrays)
+        except ValueError:
+            raise ValueError("Alle koordinatsæt skal have samme antal rækker")
+
+    @staticmethod
+    def _mask(mask, n):
+        """Omdanner en typemaske (eller None = kun vektorer) til et boolesk array af længde n."""
+        if mask is None:
+            return np.zeros(n, dtype=bool)
+        mask = np.asarray(mask, dtype=bool)
+        if mask.ndim == 0:
+            return np.full(n, bool(mask))
+        if mask.shape != (n,):
+            raise ValueError("Typemasken skal have samme længde som koordinaterne")
+        return mask
+
+    @staticmethod
+    def add_batch(coords1, coords2, points1=None, points2=None):
+        coords1, coords2 = VectorOperations.validate_batch_coordinates(coords1, coords2)
+        n = len(coords1)
+        if np.any(VectorOperations._mask(points1, n) & VectorOperations._mask(points2, n)):
+            raise ValueError("Addition kan ikke foretages mellem to punkter")
+        return coords1 + coords2
+
+    @staticmethod
+    def subtract_batch(coords1, coords2, points1=None, points2=None):
+        coords1, coords2 = VectorOperations.validate_batch_coordinates(coords1, coords2)
+        n = len(coords1)
+        if np.any(VectorOperations._mask(points1, n) & ~VectorOperations._mask(points2, n)):
+            raise ValueError("Kan ikke fratrække punkt fra vektor")
+        return coords1 - coords2
+
+    @staticmethod
+    def dot_product_batch(coords1, coords2, points1=None, points2=None):
+        coords1, coords2 = VectorOperations.validate_batch_coordinates(coords1, coords2)
+        n = len(coords1)
+        if np.any(VectorOperations._mask(points1, n) | VectorOperations._mask(points2, n)):
+            raise ValueError("Skalar produkt kræver to vektorer")
+        # Rækkevis skalarprodukt uden mellemresultat af størrelse (N,3)
+        return np.einsum("ij,ij->i", coords1, coords2)
+
+    @staticmethod
+    def cross_product_batch(coords1, coords2, points1=None, points2=None):
+        coords1, coords2 = VectorOperations.validate_batch_coordinates(coords1, coords2)
+        n = len(coords1)
+        if np.any(VectorOperations._mask(points1, n) | VectorOperations._mask(points2, n)):
+            raise ValueError("Kryds produkt kræver to vektorer")
+        return np.cross(coords1, coords2)
+
+    @staticmethod
+    def angle_batch(coords1, coords2, coords3=None, points1=None, points2=None, points3=None):
+        """
+        Rækkevis vinkel mellem to vektorer eller i det første af tre punkter.
+        Rækker med en vektor af længde 0 giver NaN i stedet for en fejl.
+        """
+        if coords3 is None:
+            coords1, coords2 = VectorOperations.validate_batch_coordinates(coords1, coords2)
+        else:
+            coords1, coords2, coords3 = VectorOperations.validate_batch_coordinates(coords1, coords2, coords3)
+        n = len(coords1)
+        p1 = VectorOperations._mask(points1, n)
+        p2 = VectorOperations._mask(points2, n)
+        p3 = VectorOperations._mask(points3, n) if coords3 is not None else np.zeros(n, dtype=bool)
+
+        # To vektorer (tredje koordinat ignoreres, hvis det også er en vektor) eller tre punkter
+        vectors = ~p1 & ~p2 & ~p3
+        points = p1 & p2 & p3
+        if coords3 is None:
+            points = np.zeros(n, dtype=bool)
+        if not np.all(vectors | points):
+            raise ValueError("Ugyldige typer eller manglende input. Brug enten to vektorer eller tre punkter.")
+
+        if np.any(points):
+            vec1 = np.where(points[:, None], coords2 - coords1, coords1)
+            vec2 = np.where(points[:, None], coords3 - coords1, coords2)
+        else:
+            vec1, vec2 = coords1, coords2
+
+        dot_product = np.einsum("ij,ij->i", vec1, vec2)
+        norms = np.sqrt(np.einsum("ij,ij->i", vec1, vec1) * np.einsum("ij,ij->i", vec2, vec2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cos_theta = np.where(norms > 0, dot_product / norms, np.nan)
+        theta_rad = np.arccos(np.clip(cos_theta, -1.0, 1.0))
+        return np.degrees(theta_rad), theta_rad
+
+    @staticmethod
+    def plane_equation_batch(coords1, coords2, coords3, points1=None, points2=None, points3=None):
+        """
+        Rækkevis planens ligning ud fra 3 punkter eller 1 punkt og 2 vektorer.
+        Returnerer et (N,4) array med a, b, c, d. Parallelle vektorer giver NaN i rækken.
+        """
+        coords1, coords2, coords3 = VectorOperations.validate_batch_coordinates(coords1, coords2, coords3)
+        n = len(coords1)
+        p1 = VectorOperations._mask(points1, n)
+        p2 = VectorOperations._mask(points2, n)
+        p3 = VectorOperations._mask(points3, n)
+
+        three_points = p1 & p2 & p3
+        point_first = p1 & ~p2 & ~p3
+        point_second = ~p1 & p2 & ~p3
+        point_third = ~p1 & ~p2 & p3
+        if not np.all(three_points | point_first | point_second | point_third):
+            raise ValueError("Planens ligning kræver 3 punkter eller 2 vektorer og 1 punkt")
+
+        # Vælg de to retningsvektorer og punktet for hver række
+        vec1 = np.where(three_points[:, None], coords2 - coords1,
+                        np.where(point_first[:, None], coords2, coords1))
+        vec2 = np.where(three_points[:, None], coords3 - coords1,
+                        np.where(point_third[:, None], coords2, coords3))
+        point = np.where(point_second[:, None], coords2,
+                         np.where(point_third[:, None], coords3, coords1))
+
+        normal = np.cross(vec1, vec2)
+        d = np.einsum("ij,ij->i", normal, point)
+        result = np.column_stack((normal, d))
+        # Normalvektoren er 0 for parallelle vektorer
+        result[np.all(np.isclose(normal, 0), axis=1)] = np.nan
+        return result
+
+    # ---- Planfitning og afstande for store punktskyer ----
+
+    @staticmethod
+    def _plane_moments(points, plane=None, threshold=None, chunk_size=CHUNK_SIZE):
+        """
+        Summerer antal, middelpunkt og kovarians i bidder.
+        Hvis plane og threshold er angivet, medtages kun punkter tættere end threshold på planet.
+        """
+        count = 0
+        shift = None
+        total = np.zeros(3)
+        outer = np.zeros((3, 3))
+        for start in range(0, len(points), chunk_size):
+            chunk = np.asarray(points[start:start + chunk_size], dtype=np.float64)
+            if plane is not None:
+                chunk = chunk[VectorOperations.plane_distances(chunk, plane) <= threshold]
+            if len(chunk) == 0:
+                continue
+            if shift is None:
+                # Forskyd til første bids middelpunkt for at undgå numerisk afrunding ved store koordinater
+                shift = chunk.mean(axis=0)
+            chunk = chunk - shift
+            count += len(chunk)
+            total += chunk.sum(axis=0)
+            outer += chunk.T @ chunk
+        return count, shift, total, outer
+
+    @staticmethod
+    def fit_plane(points, chunk_size=CHUNK_SIZE):
+        """
+        Mindste kvadraters plan gennem (N,3) punkter. Returnerer a, b, c, d med enhedsnormal.
+        Kovariansmatricen opbygges i bidder, så punkterne kan være et memory-map.
+        Den mindste egenvektor af kovariansen er den samme som den mindste singulærvektor ved SVD.
+        """
+        count, shift, total, outer = VectorOperations._plane_moments(points, chunk_size=chunk_size)
+        return VectorOperations._plane_from_moments(count, shift, total, outer)
+
+    @staticmethod
+    def _plane_from_moments(count, shift, total, outer):
+        if count < 3:
+            raise ValueError("Der skal mindst bruges 3 punkter for at bestemme et plan")
+        mean = total / count
+        covariance = outer / count - np.outer(mean, mean)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        if eigenvalues[1] <= 1e-12 * max(eigenvalues[2], 1e-300):
+            raise ValueError("Punkterne ligger på en linje, planens ligning kan ikke fremstilles")
+        normal = eigenvectors[:, 0]
+        centroid = mean + shift
+        a, b, c = normal
+        d = np.dot(normal, centroid)
+        return a, b, c, d
+
+    @staticmethod
+    def plane_distances(points, plane, signed=False, out=None, chunk_size=CHUNK_SIZE):
+        """
+        Afstand fra hvert punkt til planet ax + by + cz = d i én vektoriseret gennemgang.
+        out kan være et (memory-mappet) array af længde N, som resultatet skrives i.
+        """
+        a, b, c, d = plane
+        normal = np.array([a, b, c], dtype=np.float64)
+        length = np.linalg.norm(normal)
+        if length == 0:
+            raise ValueError("Planets normalvektor har længde 0")
+        normal /= length
+        d = d / length
+        if out is None:
+            out = np.empty(len(points), dtype=np.float64)
+        for start in range(0, len(points), chunk_size):
+            chunk = np.asarray(points[start:start + chunk_size], dtype=np.float64)
+            distances = out[start:start + len(chunk)]
+            np.subtract(chunk @ normal, d, out=distances)
+            if not signed:
+                np.abs(distances, out=distances)
+        return out
+
+    @staticmethod
+    def fit_plane_ransac(points, threshold, iterations=200, sample_size=100_000, seed=None,
+                         chunk_size=CHUNK_SIZE):
+        """
+        Robust planfitning til støjfyldte data (RANSAC).
+        Alle kandidatplaner bygges på én gang med plane_equation_batch og vurderes på en
+        tilfældig delmængde af punkterne. Det bedste plan forfines til sidst med fit_plane
+        over alle punkter, der ligger inden for threshold.
+        Returnerer (a, b, c, d) og antallet af inliers.
+        """
+        n = len(points)
+        if n < 3:
+            raise ValueError("Der skal mindst bruges 3 punkter for at bestemme et plan")
+        rng = np.random.default_rng(seed)
+
+        # Tre tilfældige punkter pr. kandidat; sorterede indeks giver sekventielle læsninger fra memory-maps
+        triples = rng.integers(0, n, size=(iterations, 3))
+        unique, inverse = np.unique(triples, return_inverse=True)
+        sampled = np.asarray(points[unique], dtype=np.float64)[inverse.reshape(-1)].reshape(iterations, 3, 3)
+        is_point = np.ones(iterations, dtype=bool)
+        candidates = VectorOperations.plane_equation_batch(
+            sampled[:, 0], sampled[:, 1], sampled[:, 2], is_point, is_point, is_point)
+        candidates = candidates[~np.isnan(candidates[:, 0])]
+        if len(candidates) == 0:
+            raise ValueError("Kunne ikke finde et plan, punkterne ligger på en linje")
+        candidates /= np.linalg.norm(candidates[:, :3], axis=1)[:, None]
+
+        # Tæl inliers for alle kandidater på en fælles stikprøve
+        subset = np.sort(rng.choice(n, size=min(sample_size, n), replace=False))
+        subset_points = np.asarray(points[subset], dtype=np.float64)
+        distances = np.abs(subset_points @ candidates[:, :3].T - candidates[:, 3])
+        scores = np.count_nonzero(distances <= threshold, axis=0)
+        best = candidates[np.argmax(scores)]
+
+        count, shift, total, outer = VectorOperations._plane_moments(
+            points, plane=best, threshold=threshold, chunk_size=chunk_size)
+        return VectorOperations._plane_from_moments(count, shift, total, outer), count
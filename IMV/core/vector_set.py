@@ -0,0 +1,213 @@
+import itertools
+import math
+import numpy as np
+from IMV.core.vector_calculations import VectorOperations
+
+
+class VectorSet:
+    """
+    Punktmængde med et ensartet gitterindeks til hurtige naboopslag.
+
+    Rummet deles i terninger med sidelængden cell_size, og hvert punkt gemmes i sin terning.
+    Opslag besøger kun terningerne omkring forespørgslen, så tiden afhænger af punkttætheden
+    og ikke af det samlede antal punkter. Punkter kan tilføjes løbende uden at genopbygge indekset.
+    """
+
+    def __init__(self, cell_size=1.0, points=None):
+        if cell_size <= 0:
+            raise ValueError("Cellestørrelsen skal være positiv")
+        self.cell_size = float(cell_size)
+        self._points = np.empty((16, 3))
+        self._count = 0
+        self._cells = {}  # (i, j, k) -> liste af punktindeks
+        self._low = None  # Mindste og største celleindeks pr. akse blandt de optagne celler
+        self._high = None
+        if points is not None:
+            self.extend(points)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def points(self):
+        """Alle punkter som et (N,3) array (et view, må ikke ændres)."""
+        return self._points[:self._count]
+
+    def _reserve(self, extra):
+        needed = self._count + extra
+        if needed > len(self._points):
+            capacity = max(needed, 2 * len(self._points))
+            grown = np.empty((capacity, 3))
+            grown[:self._count] = self._points[:self._count]
+            self._points = grown
+
+    def _cell(self, point):
+        return tuple(int(v) for v in np.floor(np.asarray(point) / self.cell_size))
+
+    def insert(self, point):
+        """Tilføjer ét punkt og returnerer dets indeks."""
+        point = np.asarray(point, dtype=np.float64)
+        if point.shape != (3,):
+            raise ValueError("Alle 3 koordinater skal udfyldes")
+        self._reserve(1)
+        index = self._count
+        self._points[index] = point
+        self._count += 1
+        cell = self._cell(point)
+        self._cells.setdefault(cell, []).append(index)
+        self._grow_bounds(np.array([cell]))
+        return index
+
+    def extend(self, points):
+        """Tilføjer et (N,3) array af punkter og returnerer deres indeks."""
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError("Koordinater skal have formen (N,3)")
+        start = self._count
+        self._reserve(len(points))
+        self._points[start:start + len(points)] = points
+        self._count += len(points)
+        indices = np.arange(start, self._count)
+
+        # Grupper punkterne efter celle i én NumPy-operation
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        unique, inverse = np.unique(cells, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+        for cell, lo, hi in zip(map(tuple, unique.tolist()), bounds[:-1], bounds[1:]):
+            self._cells.setdefault(cell, []).extend(indices[order[lo:hi]].tolist())
+        self._grow_bounds(unique)
+        return indices
+
+    def _grow_bounds(self, cells):
+        if len(cells) == 0:
+            return
+        low, high = cells.min(axis=0), cells.max(axis=0)
+        self._low = low if self._low is None else np.minimum(self._low, low)
+        self._high = high if self._high is None else np.maximum(self._high, high)
+
+    # ---- Opslag ----
+
+    def _shell(self, center, r):
+        """Cellerne i afstand præcis r (Chebyshev) fra center-cellen: kun terningens seks sider."""
+        ci, cj, ck = center
+        if r == 0:
+            yield center
+            return
+        full = range(-r, r + 1)
+        inner = range(-r + 1, r)
+        for di in (-r, r):
+            for dj, dk in itertools.product(full, full):
+                yield (ci + di, cj + dj, ck + dk)
+        for dj in (-r, r):
+            for di, dk in itertools.product(inner, full):
+                yield (ci + di, cj + dj, ck + dk)
+        for dk in (-r, r):
+            for di, dj in itertools.product(inner, inner):
+                yield (ci + di, cj + dj, ck + dk)
+
+    def _candidates(self, cells):
+        indices = [i for cell in cells for i in self._cells.get(cell, ())]
+        return np.array(indices, dtype=np.int64)
+
+    def _distances(self, point, indices):
+        return np.linalg.norm(self._points[indices] - point, axis=1)
+
+    def k_nearest(self, point, k):
+        """Finder de k nærmeste punkter. Returnerer (indeks, afstande) sorteret efter afstand."""
+        point = np.asarray(point, dtype=np.float64)
+        if self._count == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        k = min(k, self._count)
+        center = np.array(self._cell(point))
+        # Skaller nærmere end de optagne cellers kasse er tomme, og efter den fjerneste er alt besøgt
+        first = int(np.max(np.maximum(np.maximum(self._low - center, center - self._high), 0)))
+        last = int(np.max(np.maximum(center - self._low, self._high - center)))
+        center = tuple(center.tolist())
+        found = []
+        for r in range(first, last + 1):
+            shell_size = (2 * r + 1) ** 3 - max(2 * r - 1, 0) ** 3
+            if shell_size > len(self._cells):
+                # Skallen har flere celler end der er optagne: mål afstanden til alle punkter på én gang
+                found = [np.arange(self._count)]
+                break
+            found.append(self._candidates(self._shell(center, r)))
+            candidates = np.concatenate(found)
+            if len(candidates) >= k:
+                distances = self._distances(point, candidates)
+                # Punkter uden for de besøgte celler ligger mindst r * cell_size væk
+                if np.partition(distances, k - 1)[k - 1] <= r * self.cell_size:
+                    break
+        candidates = np.concatenate(found)
+        distances = self._distances(point, candidates)
+        order = np.argsort(distances)[:k]
+        return candidates[order], distances[order]
+
+    def nearest(self, point):
+        """Finder det nærmeste punkt. Returnerer (indeks, afstand)."""
+        if self._count == 0:
+            raise ValueError("Punktmængden er tom")
+        indices, distances = self.k_nearest(point, 1)
+        return int(indices[0]), float(distances[0])
+
+    def within_radius(self, point, radius):
+        """Alle punkter inden for radius. Returnerer (indeks, afstande) sorteret efter afstand."""
+        point = np.asarray(point, dtype=np.float64)
+        reach = int(math.ceil(radius / self.cell_size))
+        if (2 * reach + 1) ** 3 > len(self._cells):
+            cells = list(self._cells)
+        else:
+            cells = self._box(self._cell(point), reach)
+        candidates = self._candidates(cells)
+        distances = self._distances(point, candidates)
+        keep = distances <= radius
+        order = np.argsort(distances[keep])
+        return candidates[keep][order], distances[keep][order]
+
+    def _box(self, center, reach):
+        ci, cj, ck = center
+        return [(ci + di, cj + dj, ck + dk)
+                for di, dj, dk in itertools.product(range(-reach, reach + 1), repeat=3)]
+
+    def near_plane(self, plane, distance):
+        """
+        Alle punkter med afstand højst distance til planet ax + by + cz = d.
+        Kun celler, hvis midtpunkt ligger tæt nok på planet, undersøges punkt for punkt.
+        """
+        a, b, c, d = plane
+        normal = np.array([a, b, c], dtype=np.float64)
+        length = np.linalg.norm(normal)
+        if length == 0:
+            raise ValueError("Planets normalvektor har længde 0")
+        if not self._cells:
+            return np.empty(0, dtype=np.int64)
+        cells = np.array(list(self._cells), dtype=np.float64)
+        centers = (cells + 0.5) * self.cell_size
+        half_diagonal = math.sqrt(3) * self.cell_size / 2
+        cell_distances = np.abs(centers @ normal - d) / length
+        close = [tuple(cell) for cell in cells[cell_distances <= distance + half_diagonal].astype(np.int64).tolist()]
+        candidates = self._candidates(close)
+        point_distances = np.abs(self._points[candidates] @ normal - d) / length
+        return np.sort(candidates[point_distances <= distance])
+
+    def near_plane_through(self, coord1, coord2, coord3, type1, type2, type3, distance):
+        """Som near_plane, men planet bestemmes med VectorOperations.plane_equation."""
+        plane = VectorOperations.plane_equation(coord1, coord2, coord3, type1, type2, type3)
+        return self.near_plane(plane, distance)
+
+    def angles_to(self, origin, reference, indices):
+        """
+        Vinklen i grader mellem reference-vektoren og vektoren fra origin til hvert af punkterne.
+        Punkter, der falder sammen med origin, giver NaN.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        angles = []
+        for index in indices:
+            try:
+                degrees, _ = VectorOperations.angle(self._points[index] - origin, reference, None,
+                                                    "Vektor", "Vektor", None)
+            except ValueError:
+                degrees = np.nan
+            angles.append(degrees)
+        return np.array(angles)
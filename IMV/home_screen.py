@@ -1,25 +1,24 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QApplication
-from PySide6.QtGui import QIcon, QDrag, QDragEnterEvent, QDropEvent, QPixmap, QPainter, QPainterPath
-from PySide6.QtCore import Qt, QSize, QPoint, QMimeData, QRectF
+from PySide6.QtGui import QIcon, QDrag, QDragEnterEvent, QDropEvent
+from PySide6.QtCore import Qt, QSize, QPoint, QMimeData, Signal
 from .screens.editor_screen import EditorScreen
 from .screens.settings_screen import SettingsScreen
 from .screens.graph_war import GraphWarScreen
 from .screens.pdf_viewer import PDFViewerScreen
 from .screens.enthalpy_screen import EnthalpyScreen
 from .screens.vector_space_screen import VectorCalculator
+from .screens.vector_workspace import VectorWorkspace
 from .screens.triangle_calculator import TriangleCalculator
 from .screens.reccurence_screen import RecurrenceGUI
-import sys
-import os
-
-try:
-    PATH = sys._MEIPASS # PyInstaller
-except AttributeError:
-    PATH = os.path.abspath(".")
+from .screens.icon_cache import icon_loader, ICON_MAX_SIZE
+from .screens.resource_archive import resource_location
 
 
 class DraggableButton(QPushButton):
     """En knap med drag-and-drop funktionalitet og design, der matcher EditorButton."""
+    # Sendes når en knap slippes på en anden: (den trukne knap, knappen der blev sluppet på)
+    swapped = Signal(object, object)
+
     def __init__(self, text, button_id, parent=None, target_screen=None, main_window=None):
         super().__init__("", parent)  # Tom tekst, da billedet fylder knappen
         self.button_id = button_id  # Unik identifikator til knappen
@@ -47,57 +46,38 @@ class DraggableButton(QPushButton):
         self.clicked.connect(self.on_button_pressed)
 
     def set_icon(self, icon_path):
-        """Sætter ikonet, tilpasser knappens størrelse til billedet og afrunder hjørnerne."""
-        pixmap = QPixmap(icon_path)
+        """
+        Sætter ikonet, tilpasser knappens størrelse til billedet og afrunder hjørnerne.
+        Det afrundede ikon hentes fra icon_cache; mangler det, beregnes det i baggrunden,
+        og knappen har indtil da sin maksimale størrelse.
+        """
+        self.icon_path = icon_path
+        loader = icon_loader()
+        pixmap = loader.request(icon_path, self.devicePixelRatioF())
+        if pixmap is not None:
+            self.apply_icon(pixmap)
+            return
+        self.setFixedSize(QSize(*ICON_MAX_SIZE))
+        loader.loaded.connect(self.on_icon_loaded)
+
+    def on_icon_loaded(self, icon_path, pixmap):
+        if icon_path != self.icon_path:
+            return
+        icon_loader().loaded.disconnect(self.on_icon_loaded)
         if pixmap.isNull():
             print(f"Fejl: Kunne ikke indlæse billede {icon_path}. Bruger standardstørrelse.")
             self.setFixedSize(QSize(100, 100))
             self.setIconSize(QSize(120, 60))
             self.setIcon(QIcon(icon_path))  # Forsøg alligevel at sætte ikonet
             return
+        self.apply_icon(pixmap)
 
-        # Hent billedets dimensioner
-        img_width, img_height = pixmap.width(), pixmap.height()
-        
-        # Maksimal størrelse for knappen
-        max_width, max_height = 150, 100
-        
-        # Bevar billedets aspektforhold og begræns til max størrelse
-        aspect_ratio = img_width / img_height
-        if img_width > max_width or img_height > max_height:
-            if aspect_ratio > max_width / max_height:
-                # Begræns efter bredde
-                img_width = max_width
-                img_height = int(img_width / aspect_ratio)
-            else:
-                # Begræns efter højde
-                img_height = max_height
-                img_width = int(img_height * aspect_ratio)
-        
-        # Skaler pixmap til den beregnede størrelse
-        pixmap = pixmap.scaled(img_width, img_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        
-        # Opret en ny pixmap med afrundede hjørner
-        rounded_pixmap = QPixmap(img_width, img_height)
-        rounded_pixmap.fill(Qt.transparent)  # Gennemsigtig baggrund
-        
-        painter = QPainter(rounded_pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Opret en afrundet rektangelsti
-        path = QPainterPath()
-        radius = 30  # Matcher buttonens border-radius
-        path.addRoundedRect(QRectF(0, 0, img_width, img_height), radius, radius)
-        
-        # Klip til den afrundede sti
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, pixmap)
-        painter.end()
-        
+    def apply_icon(self, pixmap):
         # Sæt knappens størrelse og ikon
-        self.setFixedSize(QSize(img_width, img_height))
-        self.setIconSize(QSize(img_width, img_height))
-        self.setIcon(QIcon(rounded_pixmap))
+        size = pixmap.deviceIndependentSize().toSize()
+        self.setFixedSize(size)
+        self.setIconSize(size)
+        self.setIcon(QIcon(pixmap))
 
     def mousePressEvent(self, e):
         if e.button() == Qt.LeftButton and self.drag_enabled:
@@ -123,14 +103,8 @@ class DraggableButton(QPushButton):
             return
         source = e.source()
         if source != self and isinstance(source, DraggableButton):
-            source_pos = source.pos()
-            self_pos = self.pos()
-            source.move(self_pos)
-            self.move(source_pos)
-            # Swap target screens, main_window og button_id
-            source.target_screen, self.target_screen = self.target_screen, source.target_screen
-            source.main_window, self.main_window = self.main_window, source.main_window
-            source.button_id, self.button_id = self.button_id, source.button_id
+            # Hjemmeskærmen bytter knapperne i sine layouts, så de bliver stående og kan gemmes
+            self.swapped.emit(source, self)
             e.acceptProposedAction()
 
     def set_drag_enabled(self, enabled):
@@ -144,6 +118,8 @@ class DraggableButton(QPushButton):
 
 class HomeScreen(QWidget):
     """Hjemmeskærm med draggable knapper til Matematik og Kemi i en mørk-tema brugergrænseflade."""
+    # Knappernes button_id i den rækkefølge de står, sendt hver gang to knapper er byttet
+    order_changed = Signal(list)
 
     def __init__(self, main_window):
         super().__init__()
@@ -227,29 +203,55 @@ class HomeScreen(QWidget):
             DraggableButton("Trekantsberegner", "button6", self, target_screen=main_window.triangle_calculator_screen, main_window=main_window),
         ]
         image_paths = [
-            os.path.join(PATH, "IMV/images/image1.png"),
-            os.path.join(PATH, "IMV/images/image2.png"),
-            os.path.join(PATH, "IMV/images/image3.png"),
-            os.path.join(PATH, "IMV/images/image4.png"),
-            os.path.join(PATH, "IMV/images/image5.png"),
-            os.path.join(PATH, "IMV/images/image6.png"),
+            resource_location("IMV/Images/image1.png"),
+            resource_location("IMV/Images/image2.png"),
+            resource_location("IMV/Images/image3.png"),
+            resource_location("IMV/Images/image4.png"),
+            resource_location("IMV/Images/Image5.png"),
+            resource_location("IMV/Images/Image6.png"),
         ]
 
         for i, button in enumerate(self.buttons):
             button.set_icon(image_paths[i])  # Sæt ikon med ny metode
             button.set_drag_enabled(True)
+            button.swapped.connect(self.swap_buttons)
         
         # Tilføjer knapper til containers
-        for i in range(3):
-            self.row1_button_layout.addWidget(self.buttons[i])
-        for i in range(3, 6):
-            self.row2_button_layout.addWidget(self.buttons[i])
+        self.slots = list(self.buttons)  # Knapperne i den rækkefølge de står
+        self.place_buttons()
         
         self.layout.addWidget(self.row1_container)
         self.layout.addWidget(self.row2_container)
         self.layout.addStretch()
         self.setLayout(self.layout)
         
+    def place_buttons(self):
+        """Sætter knapperne i rækkerne i rækkefølgen fra self.slots (tre i hver række)."""
+        for button in self.slots:
+            self.row1_button_layout.removeWidget(button)
+            self.row2_button_layout.removeWidget(button)
+        for i, button in enumerate(self.slots):
+            layout = self.row1_button_layout if i < 3 else self.row2_button_layout
+            layout.addWidget(button)
+
+    def swap_buttons(self, source, target):
+        """Bytter plads på to knapper. Ikon, skærm og button_id følger knappen."""
+        i, j = self.slots.index(source), self.slots.index(target)
+        self.slots[i], self.slots[j] = target, source
+        self.place_buttons()
+        self.order_changed.emit(self.button_order())
+
+    def button_order(self):
+        return [button.button_id for button in self.slots]
+
+    def set_button_order(self, order):
+        """Stiller knapperne efter en liste af button_id (fra button_order). En ukendt liste ignoreres."""
+        buttons = {button.button_id: button for button in self.buttons}
+        if sorted(order) != sorted(buttons):
+            return
+        self.slots = [buttons[button_id] for button_id in order]
+        self.place_buttons()
+
     def toggle_drag(self, enabled):
         """Tænder eller slukker for drag-and-drop for alle knapper."""
         for button in self.buttons:
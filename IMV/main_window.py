@@ -1,9 +1,12 @@
 import os
 from PySide6.QtWidgets import QMainWindow, QStackedWidget, QMenu
 from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QByteArray
 from IMV.home_screen import (HomeScreen, VectorCalculator, EnthalpyScreen, PDFViewerScreen, 
-                         GraphWarScreen, EditorScreen, SettingsScreen, TriangleCalculator, RecurrenceGUI)
+                         GraphWarScreen, EditorScreen, SettingsScreen, TriangleCalculator, RecurrenceGUI,
+                         VectorWorkspace)
+from IMV import profiling
+from IMV.screens.app_state import app_state, bind_widgets
 
 class MainWindow(QMainWindow):
     """Hovedvindue til at navigere mellem forskellige skærme i en mørk-tema brugergrænseflade."""
@@ -71,6 +74,7 @@ class MainWindow(QMainWindow):
         self.enthalpy_screen = EnthalpyScreen()
         self.pdf_viewer_screen = PDFViewerScreen()
         self.vector_calculator_screen = VectorCalculator()
+        self.vector_workspace_screen = VectorWorkspace()
         self.triangle_calculator_screen = TriangleCalculator()
         self.recurrene_calculator_screen = RecurrenceGUI()
         self.home_screen = HomeScreen(self)  
@@ -83,12 +87,77 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(self.game_screen)
         self.stacked_widget.addWidget(self.pdf_viewer_screen)
         self.stacked_widget.addWidget(self.vector_calculator_screen)
+        self.stacked_widget.addWidget(self.vector_workspace_screen)
         self.stacked_widget.addWidget(self.triangle_calculator_screen)
         self.stacked_widget.addWidget(self.recurrene_calculator_screen)
 
+        # Profileringspanel, kun når programmet er startet med IMV_PROFILE
+        self.profiler_panel = None
+        if profiling.ENABLED:
+            from IMV.screens.profiler_panel import ProfilerPanel
+            self.profiler_panel = ProfilerPanel(self.statusBar(), self)
+            self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.profiler_panel)
+
         # Fremstilling af menubar
         self.create_menu_bar()
 
+        # Arbejdsområdet fra sidste kørsel gendannes, før vinduet vises første gang
+        self.state = None
+        self.restore_state()
+
+    def restore_state(self):
+        """
+        Gendanner vinduet, hjemmeskærmens knapper, træk, sidste skærm og indtastninger fra den fælles
+        tilstand og gemmer dem igen, når de ændres.
+        """
+        state = app_state()
+        geometry = state.get("main.geometry")
+        if isinstance(geometry, str):
+            # restoreGeometry flytter vinduet ind på en skærm, der findes, hvis den gemte er væk
+            self.restoreGeometry(QByteArray.fromBase64(geometry.encode("ascii")))
+
+        order = state.get("home.order")
+        if order:
+            self.home_screen.set_button_order(order)
+        self.home_screen.order_changed.connect(lambda order: state.set("home.order", order))
+
+        drag_enabled = state.get("settings.drag_enabled")
+        if drag_enabled is not None:
+            self.settings_screen.set_drag_enabled(drag_enabled)
+        self.settings_screen.drag_toggled.connect(lambda enabled: state.set("settings.drag_enabled", enabled))
+
+        index = state.get("main.screen", 0)
+        if 0 <= index < self.stacked_widget.count():
+            self.stacked_widget.setCurrentIndex(index)
+        self.stacked_widget.currentChanged.connect(lambda index: state.set("main.screen", index))
+
+        # Indtastninger i beregnerne
+        bind_widgets("vector.inputs", [widget for coordinate in self.vector_calculator_screen.coord_inputs
+                                       for widget in coordinate.inputs + [coordinate.point_radio]])
+        bind_widgets("vector_workspace.options", [self.vector_workspace_screen.operation_box]
+                     + self.vector_workspace_screen.type_boxes)
+        bind_widgets("triangle.inputs", self.triangle_calculator_screen.side_inputs
+                     + self.triangle_calculator_screen.angle_inputs)
+        bind_widgets("recurrence.inputs", [self.recurrene_calculator_screen.input_line,
+                                           self.recurrene_calculator_screen.initial_values])
+        bind_widgets("graph_war.inputs", [self.game_screen.function_input, self.game_screen.scale_input])
+        bind_widgets("enthalpy.inputs", [self.enthalpy_screen.reaction_input, self.enthalpy_screen.compound_input,
+                                         self.enthalpy_screen.delta_h_f_input])
+        self.state = state
+
+    def store_geometry(self):
+        if self.state is None:
+            return
+        self.state.set("main.geometry", bytes(self.saveGeometry().toBase64()).decode("ascii"))
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.store_geometry()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.store_geometry()
+
     def create_menu_bar(self):
         """Opretter menubjælken med navigationsmuligheder til forskellige skærme."""
         menubar = self.menuBar()
@@ -120,6 +189,10 @@ class MainWindow(QMainWindow):
         open_pdf_action.triggered.connect(self.pdf_viewer_screen.open_file_dialog)
         file_menu.addAction(open_pdf_action)
 
+        # Udfyldes hver gang den vises, så den altid følger PDF-viserens metadata
+        self.recent_pdf_menu = file_menu.addMenu("Seneste PDF'er")
+        self.recent_pdf_menu.aboutToShow.connect(self.fill_recent_pdf_menu)
+
         exit_action = QAction("Afslut", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -130,6 +203,10 @@ class MainWindow(QMainWindow):
         vector_action.triggered.connect(lambda: self.stacked_widget.setCurrentWidget(self.vector_calculator_screen))
         math_menu.addAction(vector_action)
 
+        vector_workspace_action = QAction("Vektor Arbejdsområde", self)
+        vector_workspace_action.triggered.connect(lambda: self.stacked_widget.setCurrentWidget(self.vector_workspace_screen))
+        math_menu.addAction(vector_workspace_action)
+
         triangle_action = QAction("Trekant Beregner", self)
         triangle_action.triggered.connect(lambda: self.stacked_widget.setCurrentWidget(self.triangle_calculator_screen))
         math_menu.addAction(triangle_action)
@@ -144,4 +221,21 @@ class MainWindow(QMainWindow):
         enthalpy_screen_action.triggered.connect(lambda: self.stacked_widget.setCurrentWidget(self.enthalpy_screen))
         chemistry_menu.addAction(enthalpy_screen_action)
 
-        
\ No newline at end of file
+        # Udvikler menu
+        if self.profiler_panel is not None:
+            developer_menu = menubar.addMenu("Udvikler")
+            developer_menu.addAction(self.profiler_panel.toggleViewAction())
+
+    def fill_recent_pdf_menu(self):
+        self.recent_pdf_menu.clear()
+        recent = self.pdf_viewer_screen.recent_files()
+        if not recent:
+            self.recent_pdf_menu.addAction("Ingen").setEnabled(False)
+        for path in recent:
+            action = self.recent_pdf_menu.addAction(os.path.basename(path))
+            action.setToolTip(path)
+            action.triggered.connect(lambda checked=False, path=path: self.open_recent_pdf(path))
+
+    def open_recent_pdf(self, path):
+        self.stacked_widget.setCurrentWidget(self.pdf_viewer_screen)
+        self.pdf_viewer_screen.open_pdf(path)
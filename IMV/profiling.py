@@ -0,0 +1,117 @@
+"""
+Valgfri tidsmåling af skærmenes handlinger.
+
+Slås til med miljøvariablen IMV_PROFILE før programmet startes:
+    IMV_PROFILE=1      tid og antal kald
+    IMV_PROFILE=alloc  også hukommelse (tracemalloc, gør programmet langsommere)
+
+Er IMV_PROFILE ikke sat, returnerer @profiled funktionen uændret, så det koster intet.
+Målingerne gemmes i en ringbuffer og kan vises i profileringspanelet eller gemmes med dump().
+"""
+import collections
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+MODE = os.environ.get("IMV_PROFILE", "").strip().lower()
+ENABLED = MODE not in ("", "0", "false")
+TRACE_ALLOCATIONS = MODE == "alloc"
+
+# Antal målinger der gemmes; de ældste overskrives
+BUFFER_SIZE = 10_000
+
+Timing = collections.namedtuple("Timing", "name start duration allocated peak")
+
+RECORDS = collections.deque(maxlen=BUFFER_SIZE)
+_lock = threading.Lock()
+
+if ENABLED and TRACE_ALLOCATIONS:
+    tracemalloc.start()
+
+
+@contextmanager
+def measure(name):
+    """Måler blokken under navnet name. Gør intet, hvis profilering er slået fra."""
+    if not ENABLED:
+        yield
+        return
+    if TRACE_ALLOCATIONS:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        allocated = peak = 0
+        if TRACE_ALLOCATIONS:
+            current, peak = tracemalloc.get_traced_memory()
+            allocated, peak = current - before, peak - before
+        with _lock:
+            RECORDS.append(Timing(name, start, duration, allocated, peak))
+
+
+def profiled(function=None, *, name=None):
+    """
+    Dekoratør der måler hvert kald af funktionen. Kan bruges som @profiled eller @profiled(name="...").
+    Signaturen bevares (functools.wraps), så Qt stadig sender de rigtige argumenter til slots.
+    """
+    def decorate(function):
+        if not ENABLED:
+            return function
+        label = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with measure(label):
+                return function(*args, **kwargs)
+        return wrapper
+
+    return decorate(function) if function is not None else decorate
+
+
+def snapshot():
+    """Kopi af de gemte målinger, ældste først."""
+    with _lock:
+        return list(RECORDS)
+
+
+def clear():
+    with _lock:
+        RECORDS.clear()
+
+
+def summary(records=None):
+    """
+    Samler målingerne pr. navn: {navn: {calls, total, mean, max, last, allocated, peak}}.
+    Tider er i sekunder, hukommelse i bytes (0 uden IMV_PROFILE=alloc).
+    """
+    stats = {}
+    for record in snapshot() if records is None else records:
+        entry = stats.setdefault(record.name, {"calls": 0, "total": 0.0, "max": 0.0,
+                                               "last": 0.0, "allocated": 0, "peak": 0})
+        entry["calls"] += 1
+        entry["total"] += record.duration
+        entry["max"] = max(entry["max"], record.duration)
+        entry["last"] = record.duration
+        entry["allocated"] += record.allocated
+        entry["peak"] = max(entry["peak"], record.peak)
+    for entry in stats.values():
+        entry["mean"] = entry["total"] / entry["calls"]
+    return stats
+
+
+def dump(path):
+    """Gemmer alle målinger og opsummeringen som JSON til senere analyse."""
+    records = snapshot()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "mode": MODE,
+            "buffer_size": BUFFER_SIZE,
+            "records": [record._asdict() for record in records],
+            "summary": summary(records),
+        }, f, indent=2)
@@ -0,0 +1,103 @@
+"""
+Ét sted at finde programmets egne filer (billeder, enthalpidata, PDF'er).
+
+Stierne angives relativt til projektets rod med "/", fx "IMV/screens/enthalpy_data.json", og slås
+først op, når de skal bruges. Under udvikling er roden mappen over IMV; pakket med PyInstaller er den
+bundlens mappe (sys._MEIPASS). Med main.spec's standard onedir-build er det mappen ved siden af
+IMV.exe, så intet pakkes ud ved opstart.
+
+Billeder og data (ARCHIVE_CONTENTS) pakkes af build_archive i én binær Qt-ressourcefil, som
+IMV.screens.resource_archive mapper i hukommelsen. Navnene i arkivet er normaliseret med
+resource_key, og find_file slår op i filsystemet uden hensyn til store og små bogstaver, så
+"IMV/images/image5.png" også findes på Linux, hvor filen hedder IMV/Images/Image5.png.
+Modulet bruger ikke Qt, så også kommandolinjen og main.spec kan bruge det.
+"""
+import functools
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+from xml.sax.saxutils import escape
+
+# Arkivets filnavn i bundlens rod og præfikset, filerne ligger under i Qt's ressourcesystem
+ARCHIVE_NAME = "resources.rcc"
+ARCHIVE_PREFIX = "/imv"
+# Filer der pakkes i arkivet (mønstre relativt til projektets rod). PDF'erne pakkes ikke: de vises
+# som et mappetræ, overvåges for ændringer og åbnes med QtPdf direkte fra disken.
+ARCHIVE_CONTENTS = [
+    "IMV/Images/*.png",
+    "IMV/screens/enthalpy_data.json",
+]
+
+
+def is_bundled():
+    """True når programmet kører fra en PyInstaller-bundle."""
+    return hasattr(sys, "_MEIPASS")
+
+
+@functools.lru_cache(maxsize=None)
+def resource_root():
+    if is_bundled():
+        return sys._MEIPASS
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@functools.lru_cache(maxsize=None)
+def resource_path(relative):
+    """Den fulde sti til en af programmets filer eller mapper. Om den findes, tjekkes ikke."""
+    return os.path.join(resource_root(), *relative.split("/"))
+
+
+def resource_key(relative):
+    """Navnet i arkivet: "/" som skilletegn og små bogstaver."""
+    return "/".join(part for part in relative.replace("\\", "/").split("/") if part not in ("", ".")).casefold()
+
+
+@functools.lru_cache(maxsize=None)
+def find_file(relative):
+    """Stien til filen i filsystemet uden hensyn til store og små bogstaver, eller None."""
+    path = resource_root()
+    for part in resource_key(relative).split("/"):
+        try:
+            names = os.listdir(path)
+        except OSError:
+            return None
+        match = next((name for name in names if name.casefold() == part), None)
+        if match is None:
+            return None
+        path = os.path.join(path, match)
+    return path if os.path.isfile(path) else None
+
+
+def archive_files(root=None):
+    """{navn i arkivet: sti} for filerne i ARCHIVE_CONTENTS."""
+    root = root or resource_root()
+    files = {}
+    for pattern in ARCHIVE_CONTENTS:
+        for path in sorted(glob.glob(os.path.join(root, *pattern.split("/")))):
+            files[resource_key(os.path.relpath(path, root))] = os.path.abspath(path)
+    return files
+
+
+def build_archive(output, root=None, rcc="pyside6-rcc"):
+    """
+    Pakker ARCHIVE_CONTENTS i en binær Qt-ressourcefil. Filerne komprimeres ikke (billederne er
+    allerede komprimerede), så de kan læses direkte fra den mappede fil uden at blive kopieret.
+    """
+    files = archive_files(root)
+    if not files:
+        raise FileNotFoundError("Ingen filer at pakke i ressourcearkivet")
+    lines = ["<!DOCTYPE RCC>", '<RCC version="1.0">', f'<qresource prefix="{ARCHIVE_PREFIX}">']
+    lines += [f'<file alias="{escape(key)}">{escape(path)}</file>' for key, path in sorted(files.items())]
+    lines += ["</qresource>", "</RCC>"]
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, qrc = tempfile.mkstemp(suffix=".qrc", dir=directory)
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        subprocess.run([rcc, "--binary", "--no-compress", qrc, "-o", output], check=True)
+    finally:
+        os.remove(qrc)
+    return output
@@ -0,0 +1,78 @@
+"""
+Programmets fælles tilstand (se IMV.core.state_store) og binding af widgets til den.
+
+bind_widgets gendanner felternes værdier fra tilstanden og gemmer dem igen, hver gang de ændres.
+"""
+import os
+from PySide6.QtWidgets import QLineEdit, QTextEdit, QPlainTextEdit, QAbstractButton, QComboBox
+from PySide6.QtCore import QStandardPaths, QCoreApplication
+from IMV.core.state_store import StateStore
+
+_state = None
+
+
+def state_path():
+    path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return os.path.join(path, "IMV", "state.bin")
+
+
+def app_state():
+    """Den fælles StateStore. Indlæses første gang og skrives færdig, når programmet lukker."""
+    global _state
+    if _state is None:
+        _state = StateStore(state_path()).load()
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.instance().aboutToQuit.connect(_state.close)
+    return _state
+
+
+def widget_value(widget):
+    if isinstance(widget, QLineEdit):
+        return widget.text()
+    if isinstance(widget, (QTextEdit, QPlainTextEdit)):
+        return widget.toPlainText()
+    if isinstance(widget, QAbstractButton):
+        return widget.isChecked()
+    if isinstance(widget, QComboBox):
+        return widget.currentIndex()
+    raise TypeError(f"Kan ikke gemme værdien af {type(widget).__name__}")
+
+
+def set_widget_value(widget, value):
+    if isinstance(widget, QLineEdit):
+        widget.setText(value)
+    elif isinstance(widget, (QTextEdit, QPlainTextEdit)):
+        widget.setPlainText(value)
+    elif isinstance(widget, QAbstractButton):
+        widget.setChecked(value)
+    elif isinstance(widget, QComboBox):
+        if 0 <= value < widget.count():
+            widget.setCurrentIndex(value)
+
+
+def _changed_signal(widget):
+    if isinstance(widget, QLineEdit):
+        return widget.textChanged
+    if isinstance(widget, (QTextEdit, QPlainTextEdit)):
+        return widget.textChanged
+    if isinstance(widget, QAbstractButton):
+        return widget.toggled
+    return widget.currentIndexChanged
+
+
+def bind_widgets(key, widgets, state=None):
+    """Gendanner widgets fra tilstanden under key og gemmer deres værdier der ved hver ændring."""
+    state = state or app_state()
+    values = state.get(key)
+    if isinstance(values, list) and len(values) == len(widgets):
+        for widget, value in zip(widgets, values):
+            try:
+                set_widget_value(widget, value)
+            except TypeError:
+                pass  # En værdi af forkert type (fx fra en ældre version) springes over
+
+    def store(*_):
+        state.set(key, [widget_value(widget) for widget in widgets])
+
+    for widget in widgets:
+        _changed_signal(widget).connect(store)
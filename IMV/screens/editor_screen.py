@@ -1,11 +1,39 @@
 import os
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit, QPushButton, QFileDialog
-from PySide6.QtCore import Qt
+import uuid
+from collections import OrderedDict
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit, QPushButton, QFileDialog, QTabBar, QMessageBox
+from PySide6.QtGui import QTextCursor, QTextDocument
+from PySide6.QtCore import Qt, QStandardPaths, QCoreApplication
+from IMV.core.buffer_cache import BufferCache
+from IMV.core.edit_journal import EditJournal, read_journal, utf16_length
+from IMV.core.text_buffer import LargeTextFile
+from IMV.core.text_io import read_text, write_text
+from IMV.screens.large_file_view import LargeFileView
+from IMV.screens.workers import TaskWorker
+
+# Filer fra denne størrelse åbnes i stor-fil-tilstand (memory-mappet og vist i et vindue)
+LARGE_FILE_THRESHOLD = 20 * 1024 * 1024
+# Hukommelsesloft for faner der ikke vises; derover komprimeres de og flyttes til sidst til disk
+BUFFER_MEMORY_LIMIT = 64 * 1024 * 1024
+# Anslået hukommelse pr. tegn i et QTextDocument (UTF-16 plus layout)
+BYTES_PER_CHARACTER = 4
+
+
+def journal_directory():
+    """Mappe med fanernes journaler. De indeholder ikke-gemt tekst, så de ligger ikke i cachemappen."""
+    path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return os.path.join(path, "IMV", "journal")
+
+
+def buffer_directory():
+    """Mappe til faner, der er flyttet ud af hukommelsen."""
+    path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(path, "IMV", "buffers")
 
 class EditorScreen(QWidget):
     """En teksteditor til at skrive, gemme, indlæse og oprette nye tekstfiler i en mørk-tema brugergrænseflade."""
 
-    def __init__(self):
+    def __init__(self, memory_limit=BUFFER_MEMORY_LIMIT):
         super().__init__()
         # stylesheet for widgets
         self.setStyleSheet("""
@@ -14,7 +42,7 @@ class EditorScreen(QWidget):
                 color: #F9FAFB;
                 font-family: Arial, sans-serif;
             }
-            QTextEdit {
+            QTextEdit, QPlainTextEdit {
                 background-color: #374151;
                 color: #F9FAFB;
                 border: 1px solid #4B5563;
@@ -23,6 +51,18 @@ class EditorScreen(QWidget):
                 font-family: Consolas, monospace;
                 font-size: 14px;
             }
+            QTabBar::tab {
+                background-color: #374151;
+                color: #D1D5DB;
+                padding: 6px 12px;
+                border-top-left-radius: 6px;
+                border-top-right-radius: 6px;
+                margin-right: 2px;
+            }
+            QTabBar::tab:selected {
+                background-color: #2DD4BF;
+                color: #1F2937;
+            }
         """)
 
         # Main layout med spacing
@@ -42,8 +82,23 @@ class EditorScreen(QWidget):
         layout.addWidget(label)
 
         
+        # Faner for de åbne filer over én fælles editor
+        self.tab_bar = QTabBar()
+        self.tab_bar.setTabsClosable(True)
+        self.tab_bar.setMovable(True)
+        self.tab_bar.setExpanding(False)
+        self.tab_bar.currentChanged.connect(self.on_tab_changed)
+        self.tab_bar.tabCloseRequested.connect(self.close_tab)
+        layout.addWidget(self.tab_bar)
+
         self.text_edit = QTextEdit()
+        self.placeholder = QTextDocument(self)  # Står i editoren, når ingen tekstfane har sit dokument dér
         layout.addWidget(self.text_edit)
+        self.editor_layout = layout
+        self.worker = None  # Indlæsning i baggrunden
+        self.save_worker = None
+        self.saving = None  # Fanen der gemmes
+        self.pending_saves = OrderedDict()  # Fane-id -> filnavn for gemninger, der venter på den igangværende
 
         # Ny fil knap
         new_button = QPushButton("Ny Fil")
@@ -125,62 +180,398 @@ class EditorScreen(QWidget):
         layout.addWidget(self.status_label)
 
         self.setLayout(layout)
-        self.current_file = None  # Track the currently loaded file
+
+        # Åbne faner. Kun fanen der vises har sit dokument i editoren; de andre ligger i bufferens cache
+        self.documents = {}  # id -> Document
+        self.current = None
+        self.journal_suspended = False
+        self.buffers = BufferCache(buffer_directory(), memory_limit, self.release_document)
+        self.recover_journals()
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
+
+    @property
+    def current_file(self):
+        return self.current.file_name if self.current is not None else None
+
+    # ---- Faner og dokumenter ----
+
+    def add_document(self, text="", file_name=None, modified=False, path=None, large_view=None):
+        """Opretter en fane med text (eller en stor fil i large_view) og gør den aktiv."""
+        record = Document(file_name, path or os.path.join(journal_directory(), f"{uuid.uuid4().hex}.jsonl"))
+        record.modified = modified
+        self.documents[record.id] = record
+        if large_view is None:
+            self.create_text_document(record, text)
+        else:
+            record.large_view = large_view  # Store filer har deres egen stykketabel og ingen journal
+            large_view.modified.connect(lambda: self.on_large_file_modified(record))
+            self.editor_layout.insertWidget(self.editor_layout.indexOf(self.text_edit), large_view)
+        self.tab_bar.blockSignals(True)
+        index = self.tab_bar.addTab("")
+        self.tab_bar.setTabData(index, record.id)
+        self.tab_bar.blockSignals(False)
+        self.update_tab_title(record)
+        self.activate(record)
+        return record
+
+    def create_text_document(self, record, text):
+        """Laver et QTextDocument til record og starter dens journal med text som udgangspunkt."""
+        document = QTextDocument(self)
+        document.setDefaultFont(self.text_edit.font())
+        document.setPlainText(text)  # Før signalet forbindes, så teksten ikke havner i journalen
+        document.contentsChange.connect(lambda position, removed, added: self.on_contents_change(record, position, removed, added))
+        record.document = document
+        record.length = utf16_length(text)
+        record.journal.start(text, record.file_name, saved=not record.modified)
+
+    def release_document(self, record):
+        """Bruges af bufferens cache: giver dokumentets tekst og frigiver dokumentet og journalens tråd."""
+        text = record.document.toPlainText()
+        if self.text_edit.document() is record.document:
+            self.show_document(self.placeholder)  # Editoren står skjult med dokumentet, mens en stor fil vises
+        record.document.deleteLater()
+        record.document = None
+        record.journal.close()  # Journalfilen bliver liggende, så teksten stadig kan gendannes
+        return text
+
+    def document_size(self, record):
+        return record.document.characterCount() * BYTES_PER_CHARACTER
+
+    def tab_index(self, record):
+        for index in range(self.tab_bar.count()):
+            if self.tab_bar.tabData(index) == record.id:
+                return index
+        return -1
+
+    def update_tab_title(self, record):
+        title = os.path.basename(record.file_name) if record.file_name else "Ny fil"
+        self.tab_bar.setTabText(self.tab_index(record), f"{title}*" if record.modified else title)
+
+    def activate(self, record):
+        """Viser record i editoren. Den hidtidige fane lægges i cachen som senest brugt."""
+        if record is self.current:
+            return
+        previous = self.current
+        if previous is not None:
+            if previous.large_view is not None:
+                previous.large_view.hide()
+            else:
+                previous.cursor = self.text_edit.textCursor().position()
+                self.buffers.put(previous.id, previous, self.document_size(previous))
+        if record.id in self.buffers:
+            live, value = self.buffers.take(record.id)
+            if not live:
+                self.create_text_document(record, value)
+        self.current = record
+        if record.large_view is not None:
+            self.text_edit.hide()
+            record.large_view.show()
+        else:
+            self.show_document(record.document)
+            cursor = self.text_edit.textCursor()
+            cursor.setPosition(min(record.cursor, record.document.characterCount() - 1))
+            self.text_edit.setTextCursor(cursor)
+            self.text_edit.show()
+        self.tab_bar.blockSignals(True)
+        self.tab_bar.setCurrentIndex(self.tab_index(record))
+        self.tab_bar.blockSignals(False)
+
+    def show_document(self, document):
+        """Sætter dokumentet i editoren. Qt melder hele dokumentet som ændret, hvilket ikke er en rettelse."""
+        self.journal_suspended = True
+        try:
+            self.text_edit.setDocument(document)
+        finally:
+            self.journal_suspended = False
+
+    def on_tab_changed(self, index):
+        if index >= 0:
+            self.activate(self.documents[self.tab_bar.tabData(index)])
+
+    def close_tab(self, index):
+        """Lukker fanen. Er den ikke gemt, spørges der først."""
+        record = self.documents[self.tab_bar.tabData(index)]
+        if record.modified:
+            answer = QMessageBox.question(self, "Luk fane", f"'{self.tab_bar.tabText(index).rstrip('*')}' er ikke gemt. Luk alligevel?")
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+        if self.save_worker is not None and self.saving is record:
+            self.save_worker.wait()
+        self.pending_saves.pop(record.id, None)
+        if record is self.current:
+            self.current = None
+        self.buffers.discard(record.id)
+        if record.large_view is not None:
+            record.large_view.buffer.close()
+            record.large_view.deleteLater()
+        if record.document is not None:
+            if self.text_edit.document() is record.document:
+                self.show_document(self.placeholder)
+            record.document.deleteLater()
+        record.journal.close()
+        if os.path.exists(record.journal.path):
+            os.remove(record.journal.path)
+        del self.documents[record.id]
+        self.tab_bar.removeTab(index)  # Skifter til nabofanen gennem currentChanged
+        if self.tab_bar.count() == 0:
+            self.add_document()
+        elif self.current is None:
+            self.on_tab_changed(self.tab_bar.currentIndex())
+
+    def shutdown(self):
+        """Lukker journalerne, når programmet afsluttes. Ikke-gemt tekst ligger tilbage i dem."""
+        for record in self.documents.values():
+            record.journal.close()
+        self.buffers.clear()
+
+    # ---- Journal ----
+
+    def recover_journals(self):
+        """Åbner en fane for hver journal med ikke-gemt tekst, hvis programmet sidst blev lukket uden at gemme."""
+        directory = journal_directory()
+        recovered = 0
+        for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+            if not name.endswith(".jsonl"):
+                continue
+            path = os.path.join(directory, name)
+            state = read_journal(path)
+            if state is None or (state[2] and not state[3]):
+                os.remove(path)  # Intet at gendanne
+                continue
+            text, file_name, _, _ = state
+            self.add_document(text, file_name, modified=True, path=path)
+            recovered += 1
+        if recovered:
+            self.status_label.setText(f"Ikke-gemt tekst gendannet i {recovered} fane(r)")
+        else:
+            self.add_document()
+
+    def on_contents_change(self, record, position, removed, added):
+        """
+        Skriver rettelsen til fanens journal. Kun den indsatte tekst læses, så prisen følger rettelsens
+        størrelse og ikke dokumentets; selve skrivningen sker i journalens baggrundstråd.
+        """
+        if self.journal_suspended:
+            return
+        document = record.document
+        # Qt medregner dokumentets afsluttende afsnitstegn, som ikke er en del af teksten
+        removed = min(removed, record.length - position)
+        end = min(position + added, document.characterCount() - 1)
+        cursor = QTextCursor(document)
+        cursor.setPosition(position)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        text = cursor.selectedText().replace("\u2029", "\n").replace("\u2028", "\n")
+        record.length += end - position - removed
+        record.revision += 1
+        record.journal.record(position, removed, text)
+        if not record.modified:
+            record.modified = True
+            self.update_tab_title(record)
+
+    def on_large_file_modified(self, record):
+        if not record.modified:
+            record.modified = True
+            self.update_tab_title(record)
+
+    # ---- Filer ----
+
+    def reusable_tab(self):
+        """Den aktive fane, hvis den er en tom, urørt ny fil, som en indlæst fil kan overtage."""
+        record = self.current
+        if (record is not None and record.file_name is None and not record.modified
+                and record.large_view is None and record.document.isEmpty()):
+            return record
+        return None
 
     def new_file(self):
         """
-        Opretter en ny tekstfil ved at rydde teksteditoren og nulstille den aktuelle fil.
+        Opretter en ny tekstfil i en ny fane.
         """
-        self.text_edit.clear()
-        self.current_file = None
+        self.add_document()
         self.status_label.setText("Ny fil oprettet")
 
     def save_text(self):
         """
-        Gemmer teksteditorens indhold til den aktuelt indlæste fil eller en ny fil.
+        Gemmer den aktive fanes indhold til dens fil eller en ny fil.
 
-        Hvis en fil er indlæst, overskrives den; ellers åbnes en fildialog for at vælge filnavn.
-        Viser kun filnavnet i statusbeskeden.
+        Hvis fanen har en fil, overskrives den; ellers åbnes en fildialog for at vælge filnavn.
+        Selve skrivningen sker i baggrunden (se start_save). Viser kun filnavnet i statusbeskeden.
         """
-        text = self.text_edit.toPlainText()
-        if self.current_file:
-            try:
-                with open(self.current_file, "w", encoding="utf-8") as f:
-                    f.write(text)
-                file_name = os.path.basename(self.current_file)
-                self.status_label.setText(f"Tekst gemt til '{file_name}'")
-            except Exception as e:
-                self.status_label.setText(f"Fejl ved gemning: {str(e)}")
+        record = self.current
+        if record.file_name:
+            self.start_save(record, record.file_name)
         else:
             file_name, _ = QFileDialog.getSaveFileName(self, "Gem Tekst", "", "Text Files (*.txt);;All Files (*)")
             if file_name:
-                try:
-                    with open(file_name, "w", encoding="utf-8") as f:
-                        f.write(text)
-                    self.current_file = file_name
-                    display_name = os.path.basename(file_name)
-                    self.status_label.setText(f"Tekst gemt til '{display_name}'")
-                except Exception as e:
-                    self.status_label.setText(f"Fejl ved gemning: {str(e)}")
+                self.start_save(record, file_name)
             else:
                 self.status_label.setText("Gemning annulleret")
 
+    def start_save(self, record, file_name):
+        """
+        Gemmer i en baggrundstråd. Gemmes en fane igen, mens en gemning kører, venter kun den nyeste
+        gemning af fanen, og den tager teksten, som den ser ud, når den starter.
+        """
+        if self.save_worker is not None:
+            self.pending_saves[record.id] = file_name
+            return
+        if record.large_view is not None:
+            self.save_large_file(record)
+            return
+        if record.document is not None:
+            text = record.document.toPlainText()
+        else:
+            text = self.buffers.peek(record.id)[1]
+        revision = record.revision
+        display_name = os.path.basename(file_name)
+
+        def on_result(_):
+            record.file_name = file_name
+            # Er der rettet siden, skal journalen stadig kunne gendanne de nye rettelser
+            saved = revision == record.revision
+            record.journal.mark_saved(file_name, saved)
+            if saved:
+                record.modified = False
+            if record.id in self.documents:
+                self.update_tab_title(record)
+            self.status_label.setText(f"Tekst gemt til '{display_name}'")
+
+        self.start_save_worker(record, lambda report: write_text(file_name, text, report), on_result,
+                               lambda message: self.status_label.setText(f"Fejl ved gemning: {message}"),
+                               display_name, "EditorScreen.save_text")
+
+    def start_save_worker(self, record, task, on_result, on_error, display_name, name):
+        self.saving = record
+        self.save_worker = TaskWorker(task, self, name=name)
+        self.save_worker.progress.connect(lambda percent: self.status_label.setText(f"Gemmer '{display_name}'... {percent}%"))
+        self.save_worker.result.connect(on_result)
+        self.save_worker.error.connect(on_error)
+        self.save_worker.finished.connect(self.on_save_finished)
+        self.save_worker.start()
+
+    def on_save_finished(self):
+        self.save_worker.deleteLater()
+        self.save_worker = None
+        self.saving = None
+        if self.pending_saves:
+            record_id, file_name = self.pending_saves.popitem(last=False)
+            self.start_save(self.documents[record_id], file_name)
+
     def load_text(self):
         """
-        Indlæser tekst fra en brugerdefineret fil og viser den i teksteditoren.
+        Indlæser tekst fra en brugerdefineret fil og viser den i en ny fane.
 
-        Åbner en fildialog for at vælge en tekstfil; opdaterer den aktuelle fil og viser kun filnavnet i statusbeskeden.
+        Åbner en fildialog for at vælge en tekstfil; filen læses i baggrunden. Er filen allerede åben,
+        skiftes der blot til dens fane. Viser kun filnavnet i statusbeskeden.
         """
         file_name, _ = QFileDialog.getOpenFileName(self, "Indlæs Tekst", "", "Text Files (*.txt);;All Files (*)")
-        if file_name:
-            try:
-                with open(file_name, "r", encoding="utf-8") as f:
-                    text = f.read()
-                self.text_edit.setPlainText(text)
-                self.current_file = file_name
-                display_name = os.path.basename(file_name)
-                self.status_label.setText(f"Tekst indlæst fra '{display_name}'")
-            except Exception as e:
-                self.status_label.setText(f"Fejl ved indlæsning: {str(e)}")
-        else:
-            self.status_label.setText("Indlæsning annulleret")
\ No newline at end of file
+        if not file_name:
+            self.status_label.setText("Indlæsning annulleret")
+            return
+        for record in self.documents.values():
+            if record.file_name and os.path.abspath(record.file_name) == os.path.abspath(file_name):
+                self.activate(record)
+                self.status_label.setText(f"'{os.path.basename(file_name)}' er allerede åben")
+                return
+        try:
+            if os.path.getsize(file_name) >= LARGE_FILE_THRESHOLD:
+                self.open_large_file(file_name)
+                return
+        except OSError as e:
+            self.status_label.setText(f"Fejl ved indlæsning: {str(e)}")
+            return
+        if self.worker is not None:
+            self.status_label.setText("Vent til den igangværende indlæsning er færdig")
+            return
+        display_name = os.path.basename(file_name)
+
+        def on_result(text):
+            self.open_text(text, file_name)
+            self.status_label.setText(f"Tekst indlæst fra '{display_name}'")
+
+        self.worker = TaskWorker(lambda report: read_text(file_name, report), self, name="EditorScreen.load_text")
+        self.worker.progress.connect(lambda percent: self.status_label.setText(f"Indlæser '{display_name}'... {percent}%"))
+        self.worker.result.connect(on_result)
+        self.worker.error.connect(lambda message: self.status_label.setText(f"Fejl ved indlæsning: {message}"))
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def open_text(self, text, file_name):
+        """Viser en indlæst fil; en tom, urørt ny fane genbruges."""
+        record = self.reusable_tab()
+        if record is None:
+            self.add_document(text, file_name)
+            return
+        record.file_name = file_name
+        record.document.contentsChange.disconnect()
+        record.document.deleteLater()
+        self.create_text_document(record, text)
+        self.show_document(record.document)
+        self.update_tab_title(record)
+
+    def open_large_file(self, file_name):
+        """
+        Åbner en stor fil uden at læse den ind: filen memory-mappes, linjeindekset bygges i baggrunden,
+        og kun de synlige linjer vises i en ny fane.
+        """
+        if self.worker is not None:
+            self.status_label.setText("Vent til den igangværende indlæsning er færdig")
+            return
+        buffer = LargeTextFile(file_name)
+        display_name = os.path.basename(file_name)
+
+        def on_result(_):
+            self.add_document(file_name=file_name, large_view=LargeFileView(buffer))
+            self.status_label.setText(f"Stor fil indlæst fra '{display_name}' ({buffer.line_count()} linjer)")
+
+        def on_error(message):
+            buffer.close()
+            self.status_label.setText(f"Fejl ved indlæsning: {message}")
+
+        self.worker = TaskWorker(buffer.build_index, self, name="EditorScreen.build_index")
+        self.worker.progress.connect(lambda percent: self.status_label.setText(f"Indekserer '{display_name}'... {percent}%"))
+        self.worker.result.connect(on_result)
+        self.worker.error.connect(on_error)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def on_worker_finished(self):
+        self.worker.deleteLater()
+        self.worker = None
+
+    def save_large_file(self, record):
+        """Gemmer den store fil i en baggrundstråd. Den skrives ved siden af og erstatter originalen (se LargeTextFile.save)."""
+        display_name = os.path.basename(record.file_name)
+        view = record.large_view
+        view.commit()
+        view.setEnabled(False)  # Filen er lukket, mens den skrives
+
+        def on_result(written):
+            if record.id not in self.documents:
+                return
+            view.setEnabled(True)
+            view.load_window(view.top)
+            record.modified = False
+            self.update_tab_title(record)
+            self.status_label.setText(f"Tekst gemt til '{display_name}' ({written} bytes skrevet)")
+
+        def on_error(message):
+            view.setEnabled(True)
+            self.status_label.setText(f"Fejl ved gemning: {message}")
+
+        self.start_save_worker(record, view.buffer.save, on_result, on_error, display_name, "EditorScreen.save_large_file")
+
+
+class Document:
+    """En fane i notesblokken: filen, journalen og dokumentet (None, mens det ligger komprimeret i cachen)."""
+    def __init__(self, file_name, journal_path):
+        self.id = uuid.uuid4().hex
+        self.file_name = file_name
+        self.journal = EditJournal(journal_path)
+        self.document = None
+        self.large_view = None  # LargeFileView, når fanen viser en stor fil
+        self.length = 0  # Dokumentets længde i UTF-16-enheder, som journalen kender den
+        self.revision = 0
+        self.modified = False
+        self.cursor = 0
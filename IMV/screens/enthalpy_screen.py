@@ -1,8 +1,6 @@
 # Importerer nødvendige moduler og klasser fra PySide6 og standardbiblioteket
-import json        # Til at læse og skrive JSON-data
 import os          # Til fil- og stioperationer
-import sys         # Til at detektere kørsel fra PyInstaller
-import re          # Til at parse reaktionsstrenge med regulære udtryk
+import json        # Til molekyledata fra ressourcearkivet
 
 # PySide6 GUI-komponenter
 from PySide6.QtWidgets import (
@@ -12,6 +10,17 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QIcon
 from PySide6.QtCore import Qt, QSize
 
+# Beregningerne ligger i IMV.core, så de kan bruges uden Qt
+from IMV.core.enthalpy_calculations import (
+    save_compounds, build_index, parse_reaction, calculate_enthalpy
+)
+from IMV.profiling import profiled
+from IMV.resources import resource_path, is_bundled
+from IMV.screens.resource_archive import resource_bytes
+
+# Molekyledata der følger med programmet (i ressourcearkivet, når appen er pakket)
+ENTHALPY_DATA = "IMV/screens/enthalpy_data.json"
+
 class EditorButton(QPushButton):
     """
     En specialdesignet grøn knap med rundet udseende.
@@ -78,16 +87,11 @@ class EnthalpyScreen(QWidget):
             padding: 5px;
         """)
 
-        # Find sti til JSON-filen, afhængigt af om appen er pakket eller ej
-        try:
-            PATH = sys._MEIPASS  # Bruges når appen er pakket med PyInstaller
-            self.json_file = os.path.join(PATH, "IMV", "screens", "enthalpy_data.json")
-        except AttributeError:
-            # Standard sti når man kører appen som Python-script
-            PATH = os.path.dirname(os.path.abspath(__file__))
-            self.json_file = os.path.join(PATH, "enthalpy_data.json")
+        # JSON-filen som data gemmes i (se get_writable_json_path)
+        self.json_file = resource_path(ENTHALPY_DATA)
 
         self.data = self.load_data()  # Indlæser eksisterende molekyledata fra JSON
+        self.index = build_index(self.data)  # Opslagstabel til beregning af ΔH°
 
         # Overordnet layout til hele vinduet
         layout = QVBoxLayout()
@@ -219,32 +223,30 @@ class EnthalpyScreen(QWidget):
 
     def get_writable_json_path(self):
         """Returnerer en sti til, hvor JSON-filen kan skrives sikkert (f.eks. i brugerens hjemmemappe)."""
-        if hasattr(sys, '_MEIPASS'):
+        if is_bundled():
             return os.path.join(os.path.expanduser("~"), "enthalpy_data.json")
-        return os.path.join(os.path.dirname(os.path.abspath(__file__)), "enthalpy_data.json")
+        return resource_path(ENTHALPY_DATA)
 
     def load_data(self):
-        """Læser JSON-filen med molekyledata, hvis den findes. Returnerer en liste."""
-        if os.path.exists(self.json_file):
-            try:
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.status_label.setText(f"Fejl ved indlæsning: {str(e)}")
-        else:
-            self.status_label.setText(f"Fil ikke fundet: {self.json_file}")
+        """Læser molekyledata fra ressourcearkivet eller kildetræet, hvis de findes. Returnerer en liste."""
+        try:
+            return json.loads(bytes(resource_bytes(ENTHALPY_DATA)))
+        except FileNotFoundError:
+            self.status_label.setText(f"Fil ikke fundet: {ENTHALPY_DATA}")
+        except Exception as e:
+            self.status_label.setText(f"Fejl ved indlæsning: {str(e)}")
         return []
 
     def save_data(self):
         """Gemmer molekyledata til JSON-filen."""
         self.json_file = self.get_writable_json_path()
         try:
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=4)
+            save_compounds(self.json_file, self.data)
             self.status_label.setText("Data gemt.")
         except Exception as e:
             self.status_label.setText(f"Fejl ved gemning: {str(e)}")
 
+    @profiled
     def populate_table(self):
         """Opdaterer tabellen med alle molekyler fra data."""
         self.table.setRowCount(len(self.data))
@@ -262,11 +264,11 @@ class EnthalpyScreen(QWidget):
             if not compound:
                 raise ValueError("Molekyle mangler")
 
-            for item in self.data:
-                if item["compound"].lower() == compound.lower():
-                    raise ValueError("Molekyle findes allerede")
+            if compound.lower() in self.index:
+                raise ValueError("Molekyle findes allerede")
 
             self.data.append({"compound": compound, "delta_h_f": delta_h_f})
+            self.index = build_index(self.data)
             self.save_data()
             self.populate_table()
             self.compound_input.clear()
@@ -276,63 +278,16 @@ class EnthalpyScreen(QWidget):
 
     def parse_reaction(self, reaction):
         """Parser en reaktionsstreng til lister med reaktanter og produkter."""
-        try:
-            sides = reaction.replace(' ', '').split('->')
-            if len(sides) != 2:
-                raise ValueError("Brug '->' i reaktionen")
-
-            def parse_side(side):
-                result = []
-                for term in side.split('+'):
-                    if not term:
-                        continue
-                    match = re.match(r'^(\d*)([A-Za-z][A-Za-z0-9]*)', term)
-                    if not match:
-                        raise ValueError(f"Ugyldigt input: {term}")
-                    coeff_str, compound = match.groups()
-                    coeff = int(coeff_str) if coeff_str else 1
-                    result.append({"compound": compound, "coefficient": coeff})
-                return result
-
-            reactants = parse_side(sides[0])
-            products = parse_side(sides[1])
-            return reactants, products
-        except Exception as e:
-            raise ValueError(f"Fejl i parsing: {str(e)}")
+        return parse_reaction(reaction)
 
+    @profiled
     def calculate_enthalpy(self):
         """Beregner ΔH° for en given kemisk reaktion ved at bruge databasen."""
         try:
-            reaction = self.reaction_input.text().strip()
-            if not reaction:
-                raise ValueError("Indtast en reaktion")
-
-            reactants, products = self.parse_reaction(reaction)
-
-            # Summér ΔHf° for produkter
-            sum_products = 0.0
-            for item in products:
-                for data_item in self.data:
-                    if data_item["compound"].lower() == item["compound"].lower():
-                        sum_products += item["coefficient"] * data_item["delta_h_f"]
-                        break
-                else:
-                    raise ValueError(f"'{item['compound']}' ikke fundet i databasen")
-
-            # Summér ΔHf° for reaktanter
-            sum_reactants = 0.0
-            for item in reactants:
-                for data_item in self.data:
-                    if data_item["compound"].lower() == item["compound"].lower():
-                        sum_reactants += item["coefficient"] * data_item["delta_h_f"]
-                        break
-                else:
-                    raise ValueError(f"'{item['compound']}' ikke fundet i databasen")
-
             # ΔH° = produkter - reaktanter
-            delta_h = sum_products - sum_reactants
+            delta_h = calculate_enthalpy(self.reaction_input.text(), self.index)
             self.result_label.setText(f"ΔH° = {delta_h:.2f} kJ/mol")
         except ValueError as e:
             self.result_label.setText(f"Fejl: {str(e)}")
         except Exception as e:
-            self.result_label.setText(f"Fejl ved beregning af ΔH°: {str(e)}")
\ No newline at end of file
+            self.result_label.setText(f"Fejl ved beregning af ΔH°: {str(e)}")
@@ -1,53 +1,8 @@
-import math
-import random
-import numpy as np
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton
 from PySide6.QtGui import QPainter, QPen
 from PySide6.QtCore import Qt, QPoint
-
-
-class Enemy:
-    def __init__(self, width, height):
-        
-        self._state = True  # Levende
-        self._size = 10  # Diameter
-        self._x = random.randint(width - 85, width - 55) #Start x-pos
-        self._y = random.randint(50, height - 150) #Start y-pos
-
-        # Gem relativ position mellem skærm (Anvendes til ændring af størrelse af vinduet)
-        self._x_ratio = self._x / width
-        self._y_ratio = self._y / height
-
-    # ---- Properties ----
-    #Getter for state
-    @property 
-    def state(self):
-        return self._state 
-    #setter for state
-    @state.setter
-    def state(self, value):
-        if not isinstance(value, bool):
-            raise ValueError("state skal være True eller False")
-        self._state = value
-    #Getter for size
-    @property
-    def size(self):
-        return self._size
-    #Getter for x-pos
-    @property
-    def x(self):
-        return self._x
-    #Getter for y-pos
-    @property
-    def y(self):
-        return self._y
-    #Opdatering af position, når vinduets størrelse ændres
-    def update_position(self, new_width, new_height):
-        self._x = int(self._x_ratio * new_width)
-        self._y = int(self._y_ratio * new_height)
-
-    
-
+from IMV.core.graph_war_calculations import Enemy, graph_points, hit_enemies
+from IMV.profiling import profiled
 
 
 class GraphWarScreen(QWidget):
@@ -120,6 +75,7 @@ class GraphWarScreen(QWidget):
             if enemy.state:
                 painter.drawEllipse(QPoint(enemy.x, enemy.y), enemy.size, enemy.size)
 
+    @profiled
     def update_graph(self):
         try:
             function_str = self.function_input.text().strip() #Henter funktionen fra input
@@ -128,39 +84,16 @@ class GraphWarScreen(QWidget):
             self.scale = float(self.scale_input.text().strip()) #Henter skalering fra input
             if not self.scale:
                 raise ValueError("Funktionens skalering kan ikke være tom")
-            safe_dict = {"math": math, "x": 0}
-            self.graph_points = []
-
             w = self.width() #Nuværende bredde af skærmen
             h = self.height() #Nuværende højde af skærmen
 
-            x_start = 50
-            x_end = w - 50
-
-            x_values = np.arange(x_start, x_end, 0.5)
-            for x in x_values:
-                adjusted_x = x - w // 6 #Den justerede x-akse er til venstre på skærmen (Giver større skydeplade)
-                safe_dict["x"] = adjusted_x
-                y = eval(function_str, {"__builtins__": {}}, safe_dict) #Omdanner tekst til matematisk udtryk (safe_dict anvendes så kode ikke kan angives og ødelægge programmet)
-
-                screen_y = h // 2 - (y*self.scale) 
-                screen_y = max(-10, min(h, screen_y))  # Hold grafen inde i området
-                self.graph_points.append(QPoint(int(x), screen_y))
-
-            """Opretter en minimum, idet enemy er opsat i et givende 
-            startinterval for x-værdier, så vi ikke behøver at gennemgå hele listen af points """
-            enemy_min_x = self.width() - 90
-            start_index = int((enemy_min_x - 100) / 0.5)
-            #Tjekker om vi rammer en fjende  
-            hit_any = False
-            for enemy in self.enemies:
-                if enemy.state:
-                    for point in self.graph_points[start_index:]:#Tjekker fra start_index og frem, sparer computerplads
-                        distance = math.hypot(point.x() - enemy.x, point.y() - enemy.y) #Beregner hypotynusen hermed afstanden
-                        if distance < enemy.size + 5:
-                            enemy.state = False
-                            hit_any = True
-                            break                      
+            # Funktionen evalueres for alle x-værdier på én gang (se IMV.core.graph_war_calculations)
+            xs, ys = graph_points(function_str, self.scale, w, h)
+            self.graph_points = [QPoint(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+            #Tjekker om vi rammer en fjende
+            hit_any = hit_enemies(xs, ys, self.enemies, w)
+
             # Opdater besked
             if all(not enemy.state for enemy in self.enemies):
                 self.result_label.setText("Alle modstandere ramt, tryk enter for ny runde")
@@ -0,0 +1,174 @@
+"""
+Cache til hjemmeskærmens afrundede knapikoner.
+
+Kildebillederne er op til et par MB, men knapperne er højst 150x100. Det skalerede og afrundede
+ikon gemmes derfor som en lille PNG på disken, med nøgle ud fra kildefilens sti, ændringstid,
+størrelse og skærmens DPI, og holdes i QPixmapCache mens programmet kører.
+Mangler ikonet i cachen, afkodes kildebilledet i QThreadPool, så første visning ikke venter på det.
+"""
+import hashlib
+import os
+from PySide6.QtGui import QImage, QImageReader, QPainter, QPainterPath, QPixmap, QPixmapCache
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QStandardPaths, QRectF, QFileInfo, Qt, Signal
+
+# Maksimal størrelse for knappen og radius på hjørnerne (matcher knappens border-radius)
+ICON_MAX_SIZE = (150, 100)
+ICON_RADIUS = 30
+
+# Ændres, hvis tegningen af ikonerne ændres, så gamle filer i cachen ikke bruges
+CACHE_VERSION = 1
+
+
+def cache_directory():
+    path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(path, "IMV", "icons")
+
+
+def cache_key(icon_path, device_pixel_ratio):
+    """Nøgle for ikonet, eller None hvis kildefilen ikke findes. Virker også for ":/..." i ressourcearkivet."""
+    info = QFileInfo(icon_path)
+    if not info.exists():
+        return None
+    text = f"{CACHE_VERSION}|{info.absoluteFilePath()}|{info.lastModified().toMSecsSinceEpoch()}|{info.size()}|" \
+           f"{ICON_MAX_SIZE}|{ICON_RADIUS}|{device_pixel_ratio:g}"
+    return "imv-icon-" + hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def fitted_size(width, height, max_width=ICON_MAX_SIZE[0], max_height=ICON_MAX_SIZE[1]):
+    """Bevar billedets aspektforhold og begræns til max størrelse."""
+    aspect_ratio = width / height
+    if width > max_width or height > max_height:
+        if aspect_ratio > max_width / max_height:
+            # Begræns efter bredde
+            width = max_width
+            height = int(width / aspect_ratio)
+        else:
+            # Begræns efter højde
+            height = max_height
+            width = int(height * aspect_ratio)
+    return width, height
+
+
+def render_icon(icon_path, device_pixel_ratio):
+    """
+    Afkoder, skalerer og afrunder kildebilledet. Bruger kun QImage, så det kan køre uden for GUI-tråden.
+    Returnerer en tom QImage, hvis billedet ikke kan læses.
+    """
+    reader = QImageReader(icon_path)
+    source_size = reader.size()
+    if not source_size.isValid() or source_size.isEmpty():
+        return QImage()
+    width, height = fitted_size(source_size.width(), source_size.height())
+    pixel_width = round(width * device_pixel_ratio)
+    pixel_height = round(height * device_pixel_ratio)
+
+    image = reader.read()
+    if image.isNull():
+        return QImage()
+    image = image.scaled(pixel_width, pixel_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    # Nyt billede med afrundede hjørner og gennemsigtig baggrund
+    rounded = QImage(pixel_width, pixel_height, QImage.Format.Format_ARGB32_Premultiplied)
+    rounded.fill(Qt.transparent)
+    painter = QPainter(rounded)
+    painter.setRenderHint(QPainter.Antialiasing)
+    path = QPainterPath()
+    radius = ICON_RADIUS * device_pixel_ratio
+    path.addRoundedRect(QRectF(0, 0, pixel_width, pixel_height), radius, radius)
+    painter.setClipPath(path)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    rounded.setDevicePixelRatio(device_pixel_ratio)
+    return rounded
+
+
+def _cache_file(key):
+    return os.path.join(cache_directory(), key + ".png")
+
+
+def _save(key, image):
+    """Gemmer atomisk, så en afbrudt skrivning aldrig efterlader et halvt ikon i cachen."""
+    try:
+        os.makedirs(cache_directory(), exist_ok=True)
+        target = _cache_file(key)
+        temporary = f"{target}.{os.getpid()}.tmp"
+        if image.save(temporary, "PNG"):
+            os.replace(temporary, target)
+    except OSError:
+        pass  # Cachen er kun en optimering
+
+
+def cached_icon(icon_path, device_pixel_ratio):
+    """Det færdige ikon fra QPixmapCache eller diskcachen, eller None hvis det skal beregnes."""
+    key = cache_key(icon_path, device_pixel_ratio)
+    if key is None:
+        return None
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None and not pixmap.isNull():
+        return pixmap
+    image = QImage(_cache_file(key))
+    if image.isNull():
+        return None
+    image.setDevicePixelRatio(device_pixel_ratio)
+    pixmap = QPixmap.fromImage(image)
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+class _RenderTask(QRunnable):
+    def __init__(self, loader, icon_path, device_pixel_ratio):
+        super().__init__()
+        self.loader = loader
+        self.icon_path = icon_path
+        self.device_pixel_ratio = device_pixel_ratio
+
+    def run(self):
+        image = render_icon(self.icon_path, self.device_pixel_ratio)
+        key = cache_key(self.icon_path, self.device_pixel_ratio)
+        if key is not None and not image.isNull():
+            _save(key, image)
+        # Signalet leveres i GUI-tråden, hvor loaderen bor
+        self.loader.rendered.emit(self.icon_path, self.device_pixel_ratio, image)
+
+
+class IconLoader(QObject):
+    """
+    Beregner manglende ikoner i baggrunden. loaded(sti, pixmap) sendes i GUI-tråden;
+    pixmap er tom, hvis billedet ikke kunne indlæses.
+    """
+    rendered = Signal(str, float, QImage)
+    loaded = Signal(str, QPixmap)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending = set()
+        self.rendered.connect(self.on_rendered)
+
+    def request(self, icon_path, device_pixel_ratio):
+        """Returnerer ikonet med det samme, hvis det er i cachen; ellers None, og loaded sendes senere."""
+        pixmap = cached_icon(icon_path, device_pixel_ratio)
+        if pixmap is not None:
+            return pixmap
+        if (icon_path, device_pixel_ratio) not in self.pending:
+            self.pending.add((icon_path, device_pixel_ratio))
+            QThreadPool.globalInstance().start(_RenderTask(self, icon_path, device_pixel_ratio))
+        return None
+
+    def on_rendered(self, icon_path, device_pixel_ratio, image):
+        self.pending.discard((icon_path, device_pixel_ratio))
+        pixmap = QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+        key = cache_key(icon_path, device_pixel_ratio)
+        if key is not None and not pixmap.isNull():
+            QPixmapCache.insert(key, pixmap)
+        self.loaded.emit(icon_path, pixmap)
+
+
+_loader = None
+
+
+def icon_loader():
+    """Fælles loader for hele programmet (oprettes efter QApplication)."""
+    global _loader
+    if _loader is None:
+        _loader = IconLoader()
+    return _loader
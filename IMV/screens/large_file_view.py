@@ -0,0 +1,118 @@
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QPlainTextEdit, QScrollBar
+from PySide6.QtCore import Qt, QEvent, Signal
+
+
+class LargeFileView(QWidget):
+    """
+    Viser et LargeTextFile gennem et vindue: kun de linjer, der er plads til, ligger i editoren.
+    Rulleskakten styrer hvilken linje der står øverst. Rettelser i vinduet skrives tilbage til
+    filens stykketabel, før vinduet flyttes. modified udsendes, når der rettes i vinduet.
+    """
+    modified = Signal()
+    # Linjer der flyttes pr. hak på musehjulet
+    WHEEL_LINES = 3
+
+    def __init__(self, buffer, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.top = 0
+        self.shown = 0
+        self.loading = False  # True mens vinduet fyldes, så det ikke tæller som en rettelse
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        self.editor = QPlainTextEdit()
+        self.editor.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.editor.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.editor.document().modificationChanged.connect(self.on_modification_changed)
+        self.editor.installEventFilter(self)
+        self.editor.viewport().installEventFilter(self)  # Musehjulet sendes til viewporten
+        layout.addWidget(self.editor)
+        self.scrollbar = QScrollBar(Qt.Orientation.Vertical)
+        self.scrollbar.valueChanged.connect(self.load_window)
+        layout.addWidget(self.scrollbar)
+        self.update_range()
+        self.load_window(0)
+
+    def window_size(self):
+        """Antal linjer der er plads til i editoren."""
+        line_height = max(self.editor.fontMetrics().lineSpacing(), 1)
+        return max(self.editor.viewport().height() // line_height, 1)
+
+    def update_range(self):
+        self.scrollbar.blockSignals(True)
+        self.scrollbar.setRange(0, max(self.buffer.line_count() - 1, 0))
+        self.scrollbar.setPageStep(self.window_size())
+        self.scrollbar.blockSignals(False)
+
+    def commit(self):
+        """Skriver vinduets rettelser tilbage til filen (i hukommelsen)."""
+        document = self.editor.document()
+        if not document.isModified():
+            return
+        self.buffer.replace_lines(self.top, self.shown, self.editor.toPlainText().split("\n"))
+        document.setModified(False)
+        self.update_range()
+
+    def on_modification_changed(self, changed):
+        if changed and not self.loading:
+            self.modified.emit()
+
+    def load_window(self, top):
+        self.commit()
+        self.top = max(0, min(top, self.buffer.line_count() - 1))
+        lines = self.buffer.lines(self.top, self.window_size())
+        self.shown = len(lines)
+        cursor = self.editor.textCursor()
+        row, column = cursor.blockNumber(), cursor.positionInBlock()
+        self.loading = True
+        try:
+            self.editor.setPlainText("\n".join(lines))
+            self.editor.document().setModified(False)
+        finally:
+            self.loading = False
+        self.restore_cursor(row, column)
+        if self.scrollbar.value() != self.top:
+            self.scrollbar.blockSignals(True)
+            self.scrollbar.setValue(self.top)
+            self.scrollbar.blockSignals(False)
+
+    def restore_cursor(self, row, column):
+        block = self.editor.document().findBlockByNumber(min(row, self.editor.blockCount() - 1))
+        cursor = self.editor.textCursor()
+        cursor.setPosition(block.position() + min(column, block.length() - 1))
+        self.editor.setTextCursor(cursor)
+
+    def scroll_by(self, lines):
+        self.load_window(self.top + lines)
+
+    def eventFilter(self, watched, event):
+        if watched is self.editor or watched is self.editor.viewport():
+            if event.type() == QEvent.Type.Wheel:
+                steps = event.angleDelta().y() / 120
+                self.scroll_by(-round(steps * self.WHEEL_LINES))
+                return True
+            if event.type() == QEvent.Type.KeyPress:
+                row = self.editor.textCursor().blockNumber()
+                key = event.key()
+                # Piletaster og Page Up/Down ved vinduets kant flytter vinduet i stedet for markøren
+                if key == Qt.Key_PageDown:
+                    self.scroll_by(self.window_size())
+                    return True
+                if key == Qt.Key_PageUp:
+                    self.scroll_by(-self.window_size())
+                    return True
+                if key == Qt.Key_Down and row == self.editor.blockCount() - 1 and self.top + self.shown < self.buffer.line_count():
+                    self.scroll_by(1)
+                    return True
+                if key == Qt.Key_Up and row == 0 and self.top > 0:
+                    self.scroll_by(-1)
+                    return True
+        return super().eventFilter(watched, event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Vinduet skal have plads til det nye antal linjer
+        self.update_range()
+        self.load_window(self.top)
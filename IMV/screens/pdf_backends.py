@@ -0,0 +1,171 @@
+"""
+Visning af PDF-filer i PDF-viseren.
+
+En visning er en QWidget med open(sti, side=None, zoom=None) og find(tekst); view_changed(sti, side, zoom)
+sendes, når brugeren blar eller zoomer, så visningen kan huskes. Standard er QtPdfBackend, der
+tegner siderne selv med QtPdf: kun de synlige sider renderes, og QPdfView holder selv en begrænset
+cache af renderede sider. WebEngineBackend bruger Chromiums PDF-viser som før; den koster et
+Chromium-renderprocess og flere hundrede MB, og QtWebEngine importeres derfor først, når den vælges.
+
+Visningen vælges med miljøvariablen IMV_PDF_BACKEND (qtpdf eller webengine) eller med "pdf.backend"
+i programmets tilstand.
+"""
+import os
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+from PySide6.QtCore import Qt, QUrl, QPointF, QModelIndex, Signal
+from PySide6.QtPdf import QPdfDocument, QPdfSearchModel
+from PySide6.QtPdfWidgets import QPdfView
+from IMV.screens.app_state import app_state
+
+DEFAULT_BACKEND = "qtpdf"
+# Zoomfaktor pr. hak på musehjulet med Ctrl nede, og grænserne for zoom
+ZOOM_STEP = 1.15
+MIN_ZOOM = 0.25
+MAX_ZOOM = 8.0
+
+
+class ZoomablePdfView(QPdfView):
+    """QPdfView der zoomer med Ctrl + musehjul."""
+    def wheelEvent(self, event):
+        if not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            super().wheelEvent(event)
+            return
+        steps = event.angleDelta().y() / 120
+        self.setZoomMode(QPdfView.ZoomMode.Custom)
+        self.setZoomFactor(min(max(self.zoomFactor() * ZOOM_STEP ** steps, MIN_ZOOM), MAX_ZOOM))
+        event.accept()
+
+
+class QtPdfBackend(QWidget):
+    """PDF-visning med QPdfView. Søgning sker med QPdfSearchModel; Enter igen går til næste fund."""
+    view_changed = Signal(str, int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.path = None
+        self.document = QPdfDocument(self)
+        self.view = ZoomablePdfView()
+        self.view.setDocument(self.document)
+        self.view.setPageMode(QPdfView.PageMode.MultiPage)
+        self.view.setZoomMode(QPdfView.ZoomMode.FitToWidth)
+        self.view.pageNavigator().currentPageChanged.connect(self.on_view_changed)
+        self.view.zoomFactorChanged.connect(self.on_view_changed)
+        layout.addWidget(self.view)
+
+        self.search_model = QPdfSearchModel(self)
+        self.search_model.setDocument(self.document)
+        self.view.setSearchModel(self.search_model)
+        # Modellen finder resultaterne lidt ad gangen; det første vises, så snart det er fundet
+        self.jump_to_first_result = False
+        self.search_model.rowsInserted.connect(self.on_results_found)
+
+    def open(self, path, page=None, zoom=None):
+        """
+        Viser filen; page (fra 0) åbner direkte på den side. zoom (None for sidebredde) bruges kun,
+        når en ny fil indlæses.
+        """
+        if path != self.path:
+            self.path = None  # Ingen view_changed for den gamle fil, mens den nye indlæses
+            self.document.close()
+            self.document.load(path)
+            if zoom is None:
+                self.view.setZoomMode(QPdfView.ZoomMode.FitToWidth)
+            else:
+                self.view.setZoomMode(QPdfView.ZoomMode.Custom)
+                self.view.setZoomFactor(zoom)
+            self.path = path
+        if page is not None and 0 <= page < self.document.pageCount():
+            self.view.pageNavigator().jump(page, QPointF(), 0)
+
+    def view_state(self):
+        """(side, zoom) for det viste; zoom er None ved sidebredde."""
+        zoom = self.view.zoomFactor() if self.view.zoomMode() == QPdfView.ZoomMode.Custom else None
+        return self.view.pageNavigator().currentPage(), zoom
+
+    def on_view_changed(self):
+        if self.path is not None:
+            self.view_changed.emit(self.path, *self.view_state())
+
+    def find(self, text):
+        """Søger efter text. Samme tekst igen går videre til næste fund."""
+        if text != self.search_model.searchString():
+            self.jump_to_first_result = bool(text)
+            self.search_model.setSearchString(text)
+            if self.search_model.rowCount(QModelIndex()) > 0:
+                self.on_results_found()
+            return
+        count = self.search_model.rowCount(QModelIndex())
+        if count:
+            self.show_result((self.view.currentSearchResultIndex() + 1) % count)
+
+    def on_results_found(self):
+        if self.jump_to_first_result and self.search_model.rowCount(QModelIndex()) > 0:
+            self.jump_to_first_result = False
+            self.show_result(0)
+
+    def show_result(self, index):
+        link = self.search_model.resultAtIndex(index)
+        self.view.setCurrentSearchResultIndex(index)
+        self.view.pageNavigator().jump(link)
+
+
+class WebEngineBackend(QWidget):
+    """
+    PDF-visning med Chromiums indbyggede PDF-viser i en QWebEngineView. Chromium fortæller ikke,
+    hvilken side der vises, så view_changed sendes aldrig.
+    """
+    view_changed = Signal(str, int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Først her, så Chromium kun indlæses, når denne visning vælges
+        from PySide6.QtWebEngineWidgets import QWebEngineView
+        from PySide6.QtWebEngineCore import QWebEnginePage
+        self.find_flag = QWebEnginePage.FindFlag.FindCaseSensitively
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.path = None
+        self.webView = QWebEngineView()
+        self.webView.settings().setAttribute(self.webView.settings().WebAttribute.PluginsEnabled, True)
+        self.webView.settings().setAttribute(self.webView.settings().WebAttribute.PdfViewerEnabled, True)
+        layout.addWidget(self.webView)
+
+    def open(self, path, page=None, zoom=None):
+        """Viser filen; page (fra 0) åbner direkte på den side. zoom er en faktor eller None for sidebredde."""
+        self.path = path
+        pdf_url = QUrl.fromLocalFile(path)
+        fragment = "zoom=page-width" if zoom is None else f"zoom={zoom * 100:g}"
+        if page is not None:
+            fragment = f"page={page + 1}&{fragment}"
+        pdf_url.setFragment(fragment)
+        self.webView.setUrl(pdf_url)
+
+    def find(self, text):
+        if text:
+            self.webView.page().findText(text, self.find_flag)
+        else:
+            self.webView.page().stopFinding()
+
+
+BACKENDS = {
+    "qtpdf": QtPdfBackend,
+    "webengine": WebEngineBackend,
+}
+
+
+def backend_name():
+    name = os.environ.get("IMV_PDF_BACKEND") or app_state().get("pdf.backend", DEFAULT_BACKEND)
+    name = name.strip().lower()
+    return name if name in BACKENDS else DEFAULT_BACKEND
+
+
+def create_backend(parent=None):
+    """Opretter den valgte visning. Kan QtWebEngine ikke indlæses, bruges QtPdf i stedet."""
+    name = backend_name()
+    try:
+        return BACKENDS[name](parent)
+    except ImportError as e:
+        print(f"PDF-visningen '{name}' er ikke tilgængelig ({e}); bruger {DEFAULT_BACKEND}")
+        return BACKENDS[DEFAULT_BACKEND](parent)
@@ -0,0 +1,230 @@
+"""
+Miniaturer af PDF-sider til PDF-viserens sidestribe.
+
+Siderne renderes med QtPdf i en lille trådpulje og gemmes som PNG på disken med nøgle ud fra filens
+indhold (SHA-1) og sidenummer, så en omdøbt eller flyttet fil stadig rammer cachen. Antallet af sider
+gemmes ved siden af, så en fil, hvis miniaturer allerede ligger i cachen, slet ikke skal åbnes.
+Mens programmet kører, holdes de viste miniaturer i QPixmapCache.
+"""
+import hashlib
+import os
+import threading
+from PySide6.QtGui import QImage, QPixmap, QPixmapCache
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QStandardPaths, QSize, Signal
+from PySide6.QtPdf import QPdfDocument
+
+# Miniaturernes højde i punkter (bredden følger siden)
+THUMBNAIL_HEIGHT = 140
+# Sider der renderes med det samme, når en fil vises, og når nabofiler forudindlæses
+INITIAL_PAGES = 8
+PREFETCH_PAGES = 3
+# Prioritet i trådpuljen: synlige sider før forudindlæsning
+VISIBLE_PRIORITY = 1
+PREFETCH_PRIORITY = 0
+
+# Ændres, hvis tegningen af miniaturerne ændres, så gamle filer i cachen ikke bruges
+CACHE_VERSION = 1
+
+_hashes = {}  # (sti, mtime, størrelse) -> indholdets SHA-1
+_hashes_lock = threading.Lock()
+
+
+def cache_directory():
+    path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(path, "IMV", "pdf_thumbnails")
+
+
+def file_hash(path):
+    """SHA-1 af filens indhold. Huskes så længe filen ikke ændres, så den kun læses én gang pr. kørsel."""
+    info = os.stat(path)
+    memo_key = (os.path.abspath(path), info.st_mtime_ns, info.st_size)
+    with _hashes_lock:
+        if memo_key in _hashes:
+            return _hashes[memo_key]
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    value = digest.hexdigest()
+    with _hashes_lock:
+        _hashes[memo_key] = value
+    return value
+
+
+def _cache_file(key, page, device_pixel_ratio):
+    return os.path.join(cache_directory(), f"{key}-{CACHE_VERSION}-{THUMBNAIL_HEIGHT}-{device_pixel_ratio:g}-{page}.png")
+
+
+def _count_file(key):
+    return os.path.join(cache_directory(), f"{key}.pages")
+
+
+def _write_atomic(target, write):
+    """Skriver via en midlertidig fil, så en afbrudt skrivning aldrig efterlader en halv fil i cachen."""
+    try:
+        os.makedirs(cache_directory(), exist_ok=True)
+        temporary = f"{target}.{threading.get_ident()}.tmp"
+        if write(temporary) is not False:
+            os.replace(temporary, target)
+    except OSError:
+        pass  # Cachen er kun en optimering
+
+
+def _write_count(temporary, count):
+    with open(temporary, "w") as f:
+        f.write(str(count))
+
+
+def cached_page_count(key):
+    try:
+        with open(_count_file(key)) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def render_page(document, page, device_pixel_ratio):
+    """Renderer en side i miniaturens højde. Bruger kun QImage, så det kan køre uden for GUI-tråden."""
+    point_size = document.pagePointSize(page)
+    if point_size.height() <= 0:
+        return QImage()
+    height = round(THUMBNAIL_HEIGHT * device_pixel_ratio)
+    width = max(round(height * point_size.width() / point_size.height()), 1)
+    image = document.render(page, QSize(width, height))
+    image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, loader, path, pages, device_pixel_ratio):
+        super().__init__()
+        self.loader = loader
+        self.path = path
+        self.pages = pages
+        self.device_pixel_ratio = device_pixel_ratio
+
+    def run(self):
+        try:
+            key = file_hash(self.path)
+        except OSError:
+            self.fail(self.pages)
+            return
+        document = None
+        count = cached_page_count(key)
+        if count is None:
+            document = self.open_document()
+            if document is None:
+                self.fail(self.pages)
+                return
+            count = document.pageCount()
+            _write_atomic(_count_file(key), lambda temporary: _write_count(temporary, count))
+        self.loader.counted.emit(self.path, count)
+        for index, page in enumerate(self.pages):
+            if page >= count:
+                self.loader.rendered.emit(self.path, page, self.device_pixel_ratio, QImage())
+                continue
+            cache_file = _cache_file(key, page, self.device_pixel_ratio)
+            image = QImage(cache_file)
+            if image.isNull():
+                if document is None:
+                    document = self.open_document()
+                    if document is None:
+                        self.fail(self.pages[index:])
+                        return
+                image = render_page(document, page, self.device_pixel_ratio)
+                if not image.isNull():
+                    _write_atomic(cache_file, lambda temporary: image.save(temporary, "PNG"))
+            else:
+                image.setDevicePixelRatio(self.device_pixel_ratio)
+            # Signalet leveres i GUI-tråden, hvor loaderen bor
+            self.loader.rendered.emit(self.path, page, self.device_pixel_ratio, image)
+        if document is not None:
+            document.close()
+
+    def open_document(self):
+        document = QPdfDocument()
+        document.load(self.path)
+        return document if document.status() == QPdfDocument.Status.Ready else None
+
+    def fail(self, pages):
+        """Siderne sendes tomme, så loaderen ikke længere venter på dem og kan bede om dem igen."""
+        for page in pages:
+            self.loader.rendered.emit(self.path, page, self.device_pixel_ratio, QImage())
+        self.loader.failed.emit(self.path)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Henter miniaturer i baggrunden. counted(sti, antal sider) og loaded(sti, side, pixmap) sendes i
+    GUI-tråden; failed(sti) sendes, hvis filen ikke kan læses.
+    """
+    rendered = Signal(str, int, float, QImage)
+    counted = Signal(str, int)
+    loaded = Signal(str, int, QPixmap)
+    failed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)  # Rendering må ikke tage alle kerner fra resten af programmet
+        self.pending = set()
+        self.page_counts = {}  # sti -> antal sider
+        self.rendered.connect(self.on_rendered)
+        self.counted.connect(self.page_counts.__setitem__)
+
+    @staticmethod
+    def pixmap_key(path, page, device_pixel_ratio):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return f"imv-pdf-{os.path.abspath(path)}|{mtime}|{page}|{device_pixel_ratio:g}"
+
+    def cached(self, path, page, device_pixel_ratio):
+        """Miniaturen fra QPixmapCache eller None."""
+        key = self.pixmap_key(path, page, device_pixel_ratio)
+        pixmap = QPixmapCache.find(key) if key is not None else None
+        return pixmap if pixmap is not None and not pixmap.isNull() else None
+
+    def request(self, path, pages, device_pixel_ratio, priority=VISIBLE_PRIORITY):
+        """
+        Beder om siderne; dem der allerede er i hukommelsen, sendes med det samme gennem loaded.
+        counted sendes altid, så en tom liste kan bruges til kun at få antallet af sider.
+        """
+        if path in self.page_counts:
+            self.counted.emit(path, self.page_counts[path])
+        missing = []
+        for page in pages:
+            pixmap = self.cached(path, page, device_pixel_ratio)
+            if pixmap is not None:
+                self.loaded.emit(path, page, pixmap)
+            elif (path, page, device_pixel_ratio) not in self.pending:
+                self.pending.add((path, page, device_pixel_ratio))
+                missing.append(page)
+        if missing or path not in self.page_counts:
+            self.pool.start(_ThumbnailTask(self, path, missing, device_pixel_ratio), priority)
+
+    def prefetch(self, path, device_pixel_ratio):
+        """Lægger de første sider af en fil i cachen, før brugeren åbner den."""
+        self.request(path, range(PREFETCH_PAGES), device_pixel_ratio, PREFETCH_PRIORITY)
+
+    def on_rendered(self, path, page, device_pixel_ratio, image):
+        self.pending.discard((path, page, device_pixel_ratio))
+        if image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        key = self.pixmap_key(path, page, device_pixel_ratio)
+        if key is not None:
+            QPixmapCache.insert(key, pixmap)
+        self.loaded.emit(path, page, pixmap)
+
+
+_loader = None
+
+
+def thumbnail_loader():
+    """Fælles loader for hele programmet (oprettes efter QApplication)."""
+    global _loader
+    if _loader is None:
+        _loader = ThumbnailLoader()
+    return _loader
@@ -1,56 +1,327 @@
 import os
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, 
-                               QLineEdit, QTreeView, QSplitter,
-                               QFileDialog, QSizePolicy)
-from PySide6.QtGui import QIcon, QStandardItemModel, QStandardItem
-from PySide6.QtCore import Qt, QUrl, QSettings, QDir
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEnginePage
-import sys
+import functools
+from collections import OrderedDict
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                               QLineEdit, QTreeView, QSplitter, QListWidget, QListWidgetItem,
+                               QPushButton, QFileDialog, QSizePolicy, QListView, QComboBox)
+from PySide6.QtGui import QIcon, QStandardItemModel, QStandardItem, QPixmap
+from PySide6.QtCore import (Qt, QSettings, QFileSystemWatcher, QPersistentModelIndex, QModelIndex,
+                            QStandardPaths, QTimer, QSize, QPoint, QCoreApplication)
+from PySide6.QtPdf import QPdfDocument, QPdfBookmarkModel
+from IMV.profiling import profiled
+from IMV.resources import resource_path
+from IMV.screens.workers import TaskWorker
+from IMV.core.pdf_index import PDFIndex
+from IMV.core.pdf_metadata import PDFMetadataCache, file_info
+from IMV.screens.pdf_backends import create_backend
+from IMV.screens.pdf_thumbnails import thumbnail_loader, THUMBNAIL_HEIGHT, INITIAL_PAGES
 
 # PDF læser er hentet udefra, og ændret således, det kan anvendes i programmet
 # Author: BBC-Esq
 # Link til Originale program: https://github.com/BBC-Esq/PySide6_PDF_Viewer/blob/main/pyside6_pdfviewer.py
 
+LOADING_TEXT = "Indlæser..."
+# Rolle med True for mapper, så klik ikke skal spørge filsystemet
+IS_DIR_ROLE = Qt.UserRole + 1
+# Rolle med fil- eller mappenavnet uden antal sider; træet sorteres efter den
+NAME_ROLE = Qt.UserRole + 2
+# Antal poster der indsættes i træet ad gangen, mens en mappe læses
+LIST_BATCH_SIZE = 200
+# Antal mappeindhold der huskes
+DIRECTORY_CACHE_SIZE = 64
+# Antal filer over og under den valgte i træet, hvis første sider lægges i miniaturecachen
+PREFETCH_NEIGHBOURS = 2
+
+
+def list_directory(directory_path, report):
+    """
+    Læser undermapper og PDF-filer i directory_path uden for GUI-tråden.
+    Posterne (navn, sti, er_mappe, info) sendes løbende i bidder via report og returneres samlet til sidst.
+    info er [mtime_ns, størrelse] for filer og None for mapper.
+    """
+    entries = []
+    batch = []
+    with os.scandir(directory_path) as iterator:
+        for entry in iterator:
+            if entry.name.startswith("."):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if not is_dir and not entry.name.lower().endswith(".pdf"):
+                continue
+            info = None
+            if not is_dir:
+                try:
+                    stat = entry.stat()
+                    info = [stat.st_mtime_ns, stat.st_size]
+                except OSError:
+                    pass
+            batch.append((entry.name, entry.path, is_dir, info))
+            if len(batch) >= LIST_BATCH_SIZE:
+                entries += batch
+                report(0, batch)
+                batch = []
+    if batch:
+        entries += batch
+        report(0, batch)
+    return entries
+
+
+def index_path():
+    """Placering af fuldtekstindekset (kan altid bygges igen, så det ligger i cachemappen)."""
+    path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(path, "IMV", "pdf_index.sqlite")
+
+
+def extract_pdf_pages(path):
+    """Teksten på hver side i PDF-filen. Bruger QtPdf, så det kan køre i en baggrundstråd."""
+    document = QPdfDocument()
+    document.load(path)
+    if document.status() != QPdfDocument.Status.Ready:
+        raise ValueError(f"Kunne ikke læse {path}")
+    pages = [document.getAllText(page).text() for page in range(document.pageCount())]
+    document.close()
+    return pages
+
+
+def metadata_path():
+    """Metadata om åbnede PDF'er (med sidst viste side), se IMV.core.pdf_metadata."""
+    path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return os.path.join(path, "IMV", "pdf_metadata.bin")
+
+
+def read_outline(document):
+    """Indholdsfortegnelsen som en liste af [niveau, titel, side fra 0] i dokumentets rækkefølge."""
+    model = QPdfBookmarkModel()
+    model.setDocument(document)
+    outline = []
+
+    def walk(parent):
+        for row in range(model.rowCount(parent)):
+            index = model.index(row, 0, parent)
+            outline.append([index.data(QPdfBookmarkModel.Role.Level), index.data(QPdfBookmarkModel.Role.Title),
+                            index.data(QPdfBookmarkModel.Role.Page)])
+            walk(index)
+
+    walk(QModelIndex())
+    return outline
+
+
+def extract_pdf_metadata(path):
+    """
+    (info, antal sider, titel, indhold) for PDF-filen. info ([mtime_ns, størrelse]) læses før filen,
+    så en ændring undervejs blot gør resultatet forældet. Bruger QtPdf, så det kan køre i en baggrundstråd.
+    """
+    info = file_info(path)
+    document = QPdfDocument()
+    document.load(path)
+    if info is None or document.status() != QPdfDocument.Status.Ready:
+        raise ValueError(f"Kunne ikke læse {path}")
+    title = document.metaData(QPdfDocument.MetaDataField.Title) or ""
+    result = (info, document.pageCount(), str(title).strip(), read_outline(document))
+    document.close()
+    return result
+
+
+def item_label(name, pages):
+    return name if pages is None else f"{name} ({pages} s.)"
+
+
+def sort_key(name, is_dir):
+    # Mapper først, derefter PDF-filer, begge efter navn
+    return (not is_dir, name.lower())
+
+
 class PDFFileSystemModel(QStandardItemModel):
-    def __init__(self, parent=None):
+    """
+    Træ med mapper og PDF-filer. Mapperne læses i baggrunden (list_directory), og rækkerne indsættes
+    efterhånden som de kommer. Undermapper har et "Indlæser..."-barn og læses først, når de foldes ud.
+    Indholdet huskes pr. mappe og glemmes, når QFileSystemWatcher melder en ændring.
+    page_count(sti, info) giver antal sider for filer, der er kendt i forvejen; de vises ved navnet.
+    """
+    def __init__(self, parent=None, page_count=None):
         super().__init__(parent)
+        self.page_count = page_count
         self.setHorizontalHeaderLabels(["PDF Files and Folders"])
-        try:
-            PATH = sys._MEIPASS  # PyInstaller
-            self.root_path = os.path.join(PATH, "IMV", "screens", "PDF-Filer")
-        except AttributeError:
-            PATH = os.path.dirname(os.path.abspath(__file__))
-            self.root_path = os.path.join(PATH, "PDF-Filer")  # Fixed to point to PDF-Filer
+        self.root_path = resource_path("IMV/screens/PDF-Filer")
         print(f"PDF root path: {self.root_path}")  # Debug
         print(f"PDF directory exists: {os.path.exists(self.root_path)}")  # Debug
         self.current_path = self.root_path
+        self.cache = OrderedDict()  # mappe -> [(navn, sti, er_mappe, info)]
+        self.loads = {}  # mappe -> TaskWorker der læser den
+        self.shown = {}  # mappe -> QPersistentModelIndex for rækken (None for roden)
+        self.icons = {
+            "up": QIcon.fromTheme("go-up"),
+            "folder": QIcon.fromTheme("folder"),
+            "pdf": QIcon.fromTheme("application-pdf"),
+        }
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
         self.populate_model(self.invisibleRootItem(), self.current_path)
-        
+
+    @profiled
     def populate_model(self, parent_item, directory_path):
         parent_item.removeRows(0, parent_item.rowCount())
-        directory = QDir(directory_path)
-        up_item = QStandardItem("")
-        up_item.setData(os.path.dirname(directory_path), Qt.UserRole)
-        up_item.setIcon(QIcon.fromTheme("go-up"))
-        parent_item.appendRow(up_item)
-        directories = directory.entryInfoList(QDir.Filter.Dirs | QDir.Filter.NoDotAndDotDot, QDir.SortFlag.Name)
-        for dir_info in directories:
-            dir_item = QStandardItem(dir_info.fileName())
-            dir_item.setData(dir_info.filePath(), Qt.UserRole)
-            dir_item.setIcon(QIcon.fromTheme("folder"))
-            parent_item.appendRow(dir_item)
-        pdf_files = directory.entryInfoList(["*.pdf"], QDir.Filter.Files, QDir.SortFlag.Name)
-        for file_info in pdf_files:
-            file_item = QStandardItem(file_info.fileName())
-            file_item.setData(file_info.filePath(), Qt.UserRole)
-            file_item.setIcon(QIcon.fromTheme("application-pdf"))
-            parent_item.appendRow(file_item)
-    
+        self.cancel_load(directory_path)
+        is_root = not parent_item.index().isValid()
+        if is_root:
+            up_item = QStandardItem("")
+            up_item.setData(os.path.dirname(directory_path), Qt.UserRole)
+            up_item.setData(True, IS_DIR_ROLE)
+            up_item.setIcon(self.icons["up"])
+            parent_item.appendRow(up_item)
+        self.shown[directory_path] = None if is_root else QPersistentModelIndex(parent_item.index())
+        if directory_path not in self.watcher.directories() and os.path.isdir(directory_path):
+            self.watcher.addPath(directory_path)
+
+        entries = self.cache.get(directory_path)
+        if entries is not None:
+            self.cache.move_to_end(directory_path)
+            self.insert_entries(parent_item, entries)
+            return
+
+        parent_item.appendRow(QStandardItem(LOADING_TEXT))
+        worker = TaskWorker(functools.partial(list_directory, directory_path), self,
+                            name="PDFFileSystemModel.list_directory")
+        worker.partial.connect(lambda batch, w=worker: self.on_entries(directory_path, w, batch))
+        worker.result.connect(lambda entries, w=worker: self.on_listed(directory_path, w, entries))
+        worker.error.connect(lambda message, w=worker: self.on_list_error(directory_path, w, message))
+        worker.finished.connect(worker.deleteLater)
+        self.loads[directory_path] = worker
+        worker.start()
+
     def navigate_to(self, path):
+        for directory_path in list(self.loads):
+            self.cancel_load(directory_path)
+        self.shown.clear()
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
         self.current_path = path
         self.populate_model(self.invisibleRootItem(), path)
 
+    def item_for(self, directory_path):
+        """Rækken der viser directory_path, eller None hvis den ikke længere er i træet."""
+        if directory_path not in self.shown:
+            return None
+        index = self.shown[directory_path]
+        if index is None:
+            return self.invisibleRootItem()
+        return self.itemFromIndex(index) if index.isValid() else None
+
+    def make_item(self, name, path, is_dir, info):
+        pages = None
+        if not is_dir and info is not None and self.page_count is not None:
+            pages = self.page_count(path, info)
+        item = QStandardItem(item_label(name, pages))
+        item.setData(path, Qt.UserRole)
+        item.setData(is_dir, IS_DIR_ROLE)
+        item.setData(name, NAME_ROLE)
+        if is_dir:
+            item.setIcon(self.icons["folder"])
+            item.appendRow(QStandardItem(LOADING_TEXT))  # Gør mappen mulig at folde ud
+        else:
+            item.setIcon(self.icons["pdf"])
+        return item
+
+    def set_page_count(self, path, pages):
+        """Viser antallet af sider ved filen, hvis dens mappe er i træet."""
+        parent_item = self.item_for(os.path.dirname(path))
+        if parent_item is None:
+            return
+        for row in range(parent_item.rowCount()):
+            item = parent_item.child(row)
+            if item.data(Qt.UserRole) == path and not item.data(IS_DIR_ROLE):
+                item.setText(item_label(item.data(NAME_ROLE), pages))
+                return
+
+    def insert_entries(self, parent_item, entries):
+        """Indsætter poster sorteret blandt de rækker, der allerede er der (op-rækken og pladsholderen røres ikke)."""
+        first = 1 if not parent_item.index().isValid() else 0
+        last = parent_item.rowCount()
+        if last > first and parent_item.child(last - 1).data(Qt.UserRole) is None:
+            last -= 1  # "Indlæser..." står altid sidst
+
+        def key_at(row):
+            child = parent_item.child(row)
+            return sort_key(child.data(NAME_ROLE), child.data(IS_DIR_ROLE))
+
+        position = first
+        pending = []
+        for name, path, is_dir, info in sorted(entries, key=lambda entry: sort_key(entry[0], entry[2])):
+            key = sort_key(name, is_dir)
+            # Posterne er sorterede, så søgningen kan starte hvor den forrige sluttede
+            low, high = position, last
+            while low < high:
+                middle = (low + high) // 2
+                if key_at(middle) < key:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low != position and pending:
+                parent_item.insertRows(position, pending)
+                low += len(pending)
+                last += len(pending)
+                pending = []
+            position = low
+            pending.append(self.make_item(name, path, is_dir, info))
+        if pending:
+            parent_item.insertRows(position, pending)
+
+    def remove_loading_item(self, parent_item):
+        last = parent_item.rowCount() - 1
+        if last >= 0 and parent_item.child(last).data(Qt.UserRole) is None:
+            parent_item.removeRow(last)
+
+    def cancel_load(self, directory_path):
+        worker = self.loads.pop(directory_path, None)
+        if worker is not None:
+            worker.cancel()
+
+    def current_load(self, directory_path, worker):
+        """Rækken der skal opdateres, hvis worker stadig er den aktuelle indlæsning af directory_path."""
+        if self.loads.get(directory_path) is not worker:
+            return None
+        item = self.item_for(directory_path)
+        if item is None:
+            self.cancel_load(directory_path)
+        return item
+
+    def on_entries(self, directory_path, worker, batch):
+        item = self.current_load(directory_path, worker)
+        if item is not None:
+            self.insert_entries(item, batch)
+
+    def on_listed(self, directory_path, worker, entries):
+        item = self.current_load(directory_path, worker)
+        if item is None:
+            return
+        del self.loads[directory_path]
+        self.remove_loading_item(item)
+        self.cache[directory_path] = entries
+        while len(self.cache) > DIRECTORY_CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def on_list_error(self, directory_path, worker, message):
+        item = self.current_load(directory_path, worker)
+        if item is None:
+            return
+        del self.loads[directory_path]
+        last = item.rowCount() - 1
+        if last >= 0 and item.child(last).data(Qt.UserRole) is None:
+            item.child(last).setText(f"Fejl: {message}")
+
+    def on_directory_changed(self, directory_path):
+        self.cache.pop(directory_path, None)
+        item = self.item_for(directory_path)
+        if item is None:
+            self.shown.pop(directory_path, None)
+            if directory_path in self.watcher.directories():
+                self.watcher.removePath(directory_path)
+            return
+        self.populate_model(item, directory_path)
+
 class SearchLineEdit(QLineEdit):
     def __init__(self, pdf_screen):
         super().__init__()
@@ -64,7 +335,13 @@ class PDFViewerScreen(QWidget):
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout(self)
-        self.tree_model = PDFFileSystemModel()
+        # Side, zoom, antal sider, titel og indhold for hver åbnet fil, så den kan genåbnes med det samme
+        self.metadata = PDFMetadataCache(metadata_path())
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.instance().aboutToQuit.connect(self.metadata.close)
+        self.metadata_loads = {}  # sti -> TaskWorker der udtrækker metadata
+        self.current_pdf = None
+        self.tree_model = PDFFileSystemModel(page_count=self.metadata.page_count)
         
         self.path_label = QLabel(self.tree_model.current_path)
         self.path_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
@@ -81,14 +358,57 @@ class PDFViewerScreen(QWidget):
         self.tree_view.clicked.connect(self.on_tree_clicked)
         self.tree_view.expanded.connect(self.on_tree_expanded)
         self.nav_layout.addWidget(self.tree_view)
+
+        # Søgning i alle indekserede PDF'er
+        self.library_search = QLineEdit()
+        self.library_search.setPlaceholderText("Søg i alle PDF'er...")
+        self.library_search.textChanged.connect(lambda: self.search_timer.start())
+        self.nav_layout.addWidget(self.library_search)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)  # Søg først når brugeren holder en kort pause
+        self.search_timer.timeout.connect(self.search_library)
+        self.search_results = QListWidget()
+        self.search_results.itemClicked.connect(self.on_search_result_clicked)
+        self.nav_layout.addWidget(self.search_results)
+        index_row = QHBoxLayout()
+        self.index_status = QLabel("")
+        index_row.addWidget(self.index_status)
+        self.index_folder_button = QPushButton("Indeksér mappe")
+        self.index_folder_button.setToolTip("Tilføj den viste mappe til søgningen")
+        self.index_folder_button.clicked.connect(self.index_current_folder)
+        index_row.addWidget(self.index_folder_button)
+        self.nav_layout.addLayout(index_row)
         self.splitter.addWidget(self.nav_widget)
         
         self.pdf_widget = QWidget()
         self.pdf_layout = QVBoxLayout(self.pdf_widget)
-        self.webView = QWebEngineView()
-        self.webView.settings().setAttribute(self.webView.settings().WebAttribute.PluginsEnabled, True)
-        self.webView.settings().setAttribute(self.webView.settings().WebAttribute.PdfViewerEnabled, True)
-        self.pdf_layout.addWidget(self.webView)
+
+        # Stribe med miniaturer af siderne; de renderes i baggrunden, efterhånden som de bliver synlige
+        self.thumbnail_path = None
+        self.thumbnail_strip = QListWidget()
+        self.thumbnail_strip.setViewMode(QListView.ViewMode.IconMode)
+        self.thumbnail_strip.setFlow(QListView.Flow.LeftToRight)
+        self.thumbnail_strip.setWrapping(False)
+        self.thumbnail_strip.setMovement(QListView.Movement.Static)
+        self.thumbnail_strip.setUniformItemSizes(True)
+        self.thumbnail_strip.setIconSize(QSize(THUMBNAIL_HEIGHT, THUMBNAIL_HEIGHT))
+        self.thumbnail_strip.setFixedHeight(THUMBNAIL_HEIGHT + 50)
+        self.thumbnail_strip.itemClicked.connect(self.on_thumbnail_clicked)
+        self.thumbnail_strip.horizontalScrollBar().valueChanged.connect(self.request_visible_thumbnails)
+        self.thumbnail_strip.hide()
+        self.pdf_layout.addWidget(self.thumbnail_strip)
+        loader = thumbnail_loader()
+        loader.counted.connect(self.on_page_count)
+        loader.loaded.connect(self.on_thumbnail_loaded)
+        # Filens indholdsfortegnelse; skjult for filer uden
+        self.outline_box = QComboBox()
+        self.outline_box.activated.connect(self.on_outline_activated)
+        self.outline_box.hide()
+        self.pdf_layout.addWidget(self.outline_box)
+        self.viewer = create_backend()  # QtPdf eller WebEngine, se pdf_backends
+        self.viewer.view_changed.connect(self.metadata.set_view)
+        self.pdf_layout.addWidget(self.viewer)
         
         self.search_input = SearchLineEdit(self)
         self.search_input.setPlaceholderText("Enter text to search...")
@@ -97,31 +417,161 @@ class PDFViewerScreen(QWidget):
         self.splitter.setSizes([250, 550])
         
         self.settings = QSettings("MyCompany", "PDFViewer")
-        self.recent_files = self.settings.value("recentFiles", [])
+        # Seneste filer lå tidligere i QSettings; de flyttes over i metadata én gang
+        legacy_recent = self.settings.value("recentFiles")
+        if legacy_recent:
+            if isinstance(legacy_recent, str):
+                legacy_recent = [legacy_recent]  # QSettings giver en streng, når listen har ét element
+            for path in reversed(legacy_recent):
+                self.metadata.mark_opened(path)
+        self.settings.remove("recentFiles")
+
+        # Fuldtekstindekset opdateres i baggrunden; GUI-tråden har sin egen forbindelse til søgning
+        self.index_worker = None
+        self.reindex_requested = False
+        try:
+            self.library_index = PDFIndex(index_path())
+        except Exception as e:
+            self.library_index = None
+            self.index_status.setText(f"Søgning utilgængelig: {e}")
+        self.update_library_index()
 
     def on_tree_clicked(self, index):
         item = self.tree_model.itemFromIndex(index)
         file_path = item.data(Qt.UserRole)
+        if not file_path:
+            return  # "Indlæser..." eller en fejlbesked
         if item.text() == "":
             self.tree_model.navigate_to(file_path)
             self.path_label.setText(file_path)
             return
-        if os.path.isdir(file_path):
+        if item.data(IS_DIR_ROLE):
             self.tree_model.navigate_to(file_path)
             self.path_label.setText(file_path)
             return
         if file_path and file_path.lower().endswith('.pdf'):
-            self.path_label.setText(file_path)
-            pdf_url = QUrl.fromLocalFile(file_path)
-            pdf_url.setFragment("zoom=page-width")
-            self.webView.setUrl(pdf_url)
-            self.add_to_recent_files(file_path)
+            self.open_pdf(file_path)
+            self.prefetch_neighbours(item)
+
+    def open_pdf(self, file_path, page=None):
+        """
+        Viser PDF-filen; page (fra 0) åbner direkte på den side, ellers på den side og med den zoom,
+        filen sidst blev vist med. Antal sider, titel og indhold tages fra metadata, hvis filen ikke
+        er ændret siden sidst, og udtrækkes ellers i baggrunden.
+        """
+        entry = self.metadata.entry(file_path)
+        if page is None:
+            page = entry.get("page")
+        self.viewer.open(file_path, page, entry.get("zoom"))
+        self.add_to_recent_files(file_path)
+        if file_path == self.current_pdf:
+            return
+        self.current_pdf = file_path
+        self.path_label.setText(file_path)
+        self.outline_box.hide()
+        if not file_path.lower().endswith(".pdf"):
+            return
+        metadata = self.metadata.metadata(file_path)
+        if metadata is not None:
+            self.show_metadata(file_path, metadata)
+        else:
+            self.load_metadata(file_path)
+        if file_path != self.thumbnail_path:
+            self.show_thumbnails(file_path)
+
+    def show_metadata(self, file_path, metadata):
+        if metadata["title"]:
+            self.path_label.setText(f"{metadata['title']} – {file_path}")
+        self.outline_box.clear()
+        for level, title, page in metadata["outline"]:
+            self.outline_box.addItem("    " * level + title, page)
+        self.outline_box.setVisible(self.outline_box.count() > 0)
+        self.tree_model.set_page_count(file_path, metadata["pages"])
+
+    def load_metadata(self, file_path):
+        """Udtrækker antal sider, titel og indhold i baggrunden og gemmer dem i metadata."""
+        if file_path in self.metadata_loads:
+            return
+
+        def task(report):
+            return extract_pdf_metadata(file_path)
+
+        worker = TaskWorker(task, self, name="PDFViewerScreen.load_metadata")
+        worker.result.connect(lambda result: self.on_metadata_loaded(file_path, result))
+        worker.finished.connect(lambda: self.metadata_loads.pop(file_path, None))
+        worker.finished.connect(worker.deleteLater)
+        self.metadata_loads[file_path] = worker
+        worker.start()
+
+    def on_metadata_loaded(self, file_path, result):
+        info, pages, title, outline = result
+        self.metadata.set_metadata(file_path, info, pages, title, outline)
+        if file_path == self.current_pdf:
+            self.show_metadata(file_path, self.metadata.entry(file_path))
+        else:
+            self.tree_model.set_page_count(file_path, pages)
+
+    def on_outline_activated(self, index):
+        page = self.outline_box.itemData(index)
+        if self.current_pdf is not None and page is not None:
+            self.viewer.open(self.current_pdf, page)
+
+    def show_thumbnails(self, file_path):
+        """Tømmer stribe og beder om antal sider og de første miniaturer for file_path."""
+        self.thumbnail_path = file_path
+        self.thumbnail_strip.clear()
+        self.thumbnail_strip.show()
+        thumbnail_loader().request(file_path, range(INITIAL_PAGES), self.devicePixelRatioF())
+
+    def on_page_count(self, file_path, count):
+        if file_path != self.thumbnail_path or self.thumbnail_strip.count() == count:
+            return
+        self.thumbnail_strip.clear()
+        placeholder = QPixmap(round(THUMBNAIL_HEIGHT * 0.7), THUMBNAIL_HEIGHT)
+        placeholder.fill(Qt.GlobalColor.lightGray)
+        icon = QIcon(placeholder)
+        for page in range(count):
+            item = QListWidgetItem(icon, str(page + 1))
+            item.setData(Qt.UserRole, page)
+            self.thumbnail_strip.addItem(item)
+        self.request_visible_thumbnails()
+
+    def on_thumbnail_loaded(self, file_path, page, pixmap):
+        if file_path == self.thumbnail_path and page < self.thumbnail_strip.count():
+            self.thumbnail_strip.item(page).setIcon(QIcon(pixmap))
+
+    def request_visible_thumbnails(self):
+        """Beder om miniaturerne for de sider, der kan ses i striben, og et par stykker mere."""
+        if self.thumbnail_path is None or self.thumbnail_strip.count() == 0:
+            return
+        viewport = self.thumbnail_strip.viewport()
+        first = self.thumbnail_strip.indexAt(QPoint(1, viewport.height() // 2)).row()
+        last = self.thumbnail_strip.indexAt(QPoint(viewport.width() - 1, viewport.height() // 2)).row()
+        first = max(first, 0)
+        last = self.thumbnail_strip.count() - 1 if last < 0 else last
+        pages = range(first, min(last + 3, self.thumbnail_strip.count()))
+        thumbnail_loader().request(self.thumbnail_path, pages, self.devicePixelRatioF())
+
+    def on_thumbnail_clicked(self, item):
+        self.open_pdf(self.thumbnail_path, item.data(Qt.UserRole))
+
+    def prefetch_neighbours(self, item):
+        """Lægger de første sider af nabofilerne i træet i cachen, så de vises med det samme."""
+        parent = item.parent() or self.tree_model.invisibleRootItem()
+        row = item.row()
+        loader = thumbnail_loader()
+        for neighbour_row in range(max(row - PREFETCH_NEIGHBOURS, 0), min(row + PREFETCH_NEIGHBOURS + 1, parent.rowCount())):
+            neighbour = parent.child(neighbour_row)
+            path = neighbour.data(Qt.UserRole)
+            if neighbour_row != row and path and not neighbour.data(IS_DIR_ROLE) and path.lower().endswith(".pdf"):
+                loader.prefetch(path, self.devicePixelRatioF())
     
     def on_tree_expanded(self, index):
         item = self.tree_model.itemFromIndex(index)
         file_path = item.data(Qt.UserRole)
-        if item.rowCount() == 1 and item.child(0).text() == "Indlæser...":
-            item.removeRow(0)
+        # Mappen er ikke læst endnu, hvis dens eneste barn er pladsholderen
+        if (item.rowCount() == 1 and item.child(0).text() == LOADING_TEXT
+                and file_path not in self.tree_model.loads):
             self.tree_model.populate_model(item, file_path)
     
     def open_file_dialog(self):
@@ -131,19 +581,82 @@ class PDFViewerScreen(QWidget):
             self.load_file(filename)
     
     def load_file(self, filename):
-        self.webView.setUrl(QUrl("file:///" + filename.replace('\\', '/')))
-        self.add_to_recent_files(filename)
+        self.open_pdf(filename)
     
     def add_to_recent_files(self, filename):
-        if filename in self.recent_files:
-            self.recent_files.remove(filename)
-        self.recent_files.insert(0, filename)
-        self.recent_files = self.recent_files[:5]
-        self.settings.setValue("recentFiles", self.recent_files)
+        self.metadata.mark_opened(filename)
+
+    def recent_files(self):
+        """De senest åbnede filer, den seneste først."""
+        return self.metadata.recent()
     
     def search_text(self, text):
-        flag = QWebEnginePage.FindFlag.FindCaseSensitively
-        if text:
-            self.webView.page().findText(text, flag)
-        else:
-            self.webView.page().stopFinding()
\ No newline at end of file
+        self.viewer.find(text)
+
+    def indexed_folders(self):
+        folders = self.settings.value("indexedFolders", []) or []
+        if isinstance(folders, str):
+            folders = [folders]  # QSettings giver en streng, når listen har ét element
+        return [self.tree_model.root_path] + [folder for folder in folders if os.path.isdir(folder)]
+
+    def index_current_folder(self):
+        folder = os.path.abspath(self.tree_model.current_path)
+        folders = self.indexed_folders()
+        if any(os.path.commonpath([folder, os.path.abspath(root)]) == os.path.abspath(root) for root in folders):
+            self.index_status.setText("Mappen er allerede med i søgningen")
+            return
+        self.settings.setValue("indexedFolders", folders[1:] + [folder])
+        self.update_library_index()
+
+    def update_library_index(self):
+        """Læser nye og ændrede PDF'er ind i indekset i baggrunden."""
+        if self.library_index is None:
+            return
+        if self.index_worker is not None:
+            self.reindex_requested = True  # Køres igen, når den igangværende er færdig
+            return
+        roots = self.indexed_folders()
+        path = self.library_index.path
+
+        def task(report):
+            index = PDFIndex(path)
+            try:
+                return index.update(roots, extract_pdf_pages, report)
+            finally:
+                index.close()
+
+        self.index_worker = TaskWorker(task, self, name="PDFViewerScreen.update_library_index")
+        self.index_worker.progress.connect(lambda percent: self.index_status.setText(f"Indekserer... {percent}%"))
+        self.index_worker.result.connect(self.on_index_updated)
+        self.index_worker.error.connect(lambda message: self.index_status.setText(f"Fejl ved indeksering: {message}"))
+        self.index_worker.finished.connect(self.on_index_finished)
+        self.index_worker.start()
+
+    def on_index_updated(self, result):
+        updated, removed = result
+        self.index_status.setText(f"Indeks opdateret ({updated} nye/ændrede, {removed} fjernet)" if updated or removed
+                                  else "Indeks er opdateret")
+        if self.library_search.text():
+            self.search_library()
+
+    def on_index_finished(self):
+        self.index_worker.deleteLater()
+        self.index_worker = None
+        if self.reindex_requested:
+            self.reindex_requested = False
+            self.update_library_index()
+
+    @profiled
+    def search_library(self):
+        self.search_results.clear()
+        if self.library_index is None:
+            return
+        for path, page, snippet in self.library_index.search(self.library_search.text()):
+            item = QListWidgetItem(f"{os.path.basename(path)}, s. {page + 1}\n{snippet}")
+            item.setData(Qt.UserRole, (path, page))
+            item.setToolTip(path)
+            self.search_results.addItem(item)
+
+    def on_search_result_clicked(self, item):
+        path, page = item.data(Qt.UserRole)
+        self.open_pdf(path, page)
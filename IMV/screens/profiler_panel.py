@@ -0,0 +1,81 @@
+from PySide6.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QPushButton, QFileDialog, QHeaderView
+)
+from PySide6.QtCore import Qt, QTimer
+from IMV import profiling
+
+COLUMNS = ["Handling", "Kald", "Sidste (ms)", "Gns. (ms)", "Maks (ms)", "Total (ms)", "Allokeret (KB)", "Top (KB)"]
+
+
+class ProfilerPanel(QDockWidget):
+    """
+    Udviklerpanel der viser målingerne fra IMV.profiling live.
+    Vises kun, når programmet er startet med IMV_PROFILE.
+    """
+    REFRESH_MS = 500
+
+    def __init__(self, status_bar=None, parent=None):
+        super().__init__("Profilering", parent)
+        self.status_bar = status_bar
+        self.last_seen = None
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setStyleSheet("background-color: #2D2D2D; color: #FFFFFF;")
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        clear_button = QPushButton("Nulstil")
+        clear_button.clicked.connect(self.clear)
+        dump_button = QPushButton("Gem målinger...")
+        dump_button.clicked.connect(self.dump)
+        buttons.addStretch()
+        buttons.addWidget(clear_button)
+        buttons.addWidget(dump_button)
+        layout.addLayout(buttons)
+        self.setWidget(widget)
+
+        # Ringbufferen aflæses periodisk, så målte funktioner ikke selv skal kende til GUI'en
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(self.REFRESH_MS)
+
+    def refresh(self):
+        records = profiling.snapshot()
+        # Bufferen er fuld efter BUFFER_SIZE målinger, så antal og sidste starttid afgør om der er nye
+        seen = (len(records), records[-1].start) if records else ()
+        if seen == self.last_seen:
+            return
+        self.last_seen = seen
+
+        stats = profiling.summary(records)
+        self.table.setRowCount(len(stats))
+        for row, (name, entry) in enumerate(sorted(stats.items(), key=lambda item: -item[1]["total"])):
+            values = [name, str(entry["calls"])]
+            values += [f"{entry[key] * 1e3:.2f}" for key in ("last", "mean", "max", "total")]
+            values += [f"{entry[key] / 1024:.1f}" for key in ("allocated", "peak")]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        if self.status_bar is not None and records:
+            last = records[-1]
+            self.status_bar.showMessage(f"{last.name}: {last.duration * 1e3:.2f} ms")
+
+    def clear(self):
+        profiling.clear()
+        self.refresh()
+
+    def dump(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Gem målinger", "imv_profile.json", "JSON (*.json)")
+        if path:
+            profiling.dump(path)
+            if self.status_bar is not None:
+                self.status_bar.showMessage(f"Målinger gemt i {path}")
@@ -6,7 +6,8 @@ from PySide6.QtWidgets import (
     QPushButton, QTextEdit, QMessageBox
 )
 from PySide6.QtGui import QFont
-from IMV.screens.reccurence_calculations import RecurrenceSolver, format_polynomial
+from IMV.core.reccurence_calculations import RecurrenceSolver, format_polynomial
+from IMV.profiling import profiled
 
 class RecurrenceGUI(QWidget):
     def __init__(self):
@@ -34,6 +35,7 @@ class RecurrenceGUI(QWidget):
         layout.addWidget(QLabel("Resultat:"))
         layout.addWidget(self.result_area)
 
+    @profiled
     def solve(self):
         # Hent brugerens indtastede rekursive ligning og startværdier
         equation = self.input_line.text()
@@ -0,0 +1,55 @@
+"""
+Programmets billeder og data fra ressourcearkivet (se IMV.resources).
+
+Arkivet er en binær Qt-ressourcefil, som Qt mapper i hukommelsen, når den registreres; indekset ligger
+forrest, så et opslag hverken læser eller kopierer andre filer. Ressourcerne er ukomprimerede, så
+resource_bytes giver en QByteArray direkte over den mappede fil, og billeder afkodes først, når de
+bruges. Opslag er uafhængige af store og små bogstaver. Findes arkivet ikke (under udvikling),
+bruges filerne i kildetræet.
+"""
+import os
+from PySide6.QtCore import QResource, QFile, QIODevice
+from PySide6.QtGui import QImage
+from IMV.resources import ARCHIVE_NAME, ARCHIVE_PREFIX, resource_path, resource_key, find_file
+
+_archive = None  # True/False når det er forsøgt at registrere arkivet
+
+
+def archive_loaded():
+    """Registrerer arkivet første gang; False hvis det ikke findes eller ikke kan læses."""
+    global _archive
+    if _archive is None:
+        path = resource_path(ARCHIVE_NAME)
+        _archive = os.path.isfile(path) and QResource.registerResource(path)
+    return _archive
+
+
+def resource_location(relative):
+    """
+    En sti, som Qt's klasser (QImageReader, QIcon, QFile) kan åbne: ":/..." i arkivet eller
+    filen i kildetræet. Findes ressourcen ikke, gives stien, den skulle have haft.
+    """
+    if archive_loaded():
+        location = f":{ARCHIVE_PREFIX}/{resource_key(relative)}"
+        if QResource(location).isValid():
+            return location
+    return find_file(relative) or resource_path(relative)
+
+
+def resource_bytes(relative):
+    """Ressourcens indhold. Fra arkivet uden kopi; giver FileNotFoundError, hvis den ikke findes."""
+    location = resource_location(relative)
+    if location.startswith(":"):
+        return QResource(location).uncompressedData()
+    file = QFile(location)
+    if not file.open(QIODevice.OpenModeFlag.ReadOnly):
+        raise FileNotFoundError(f"Ressourcen {relative} findes ikke")
+    try:
+        return file.readAll()
+    finally:
+        file.close()
+
+
+def resource_image(relative):
+    """Billedet afkodet; en tom QImage, hvis det ikke findes eller ikke kan læses."""
+    return QImage(resource_location(relative))
@@ -1,8 +1,9 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 
 class SettingsScreen(QWidget):
     """En skærm til indstillinger, der tillader brugeren at aktivere/deaktivere trækfunktion i mørk tilstand."""
+    drag_toggled = Signal(bool)
 
     def __init__(self):
         super().__init__()
@@ -77,8 +78,13 @@ class SettingsScreen(QWidget):
 
         Opdaterer hovedvinduet og statuslabel for at afspejle træktilstanden.
         """
-        self.drag_enabled = not self.drag_enabled
+        self.set_drag_enabled(not self.drag_enabled)
+
+    def set_drag_enabled(self, enabled):
+        """Sætter trækfunktionen til enabled, fx når tilstanden gendannes ved opstart."""
+        self.drag_enabled = enabled
         main_window = self.window()
         home_screen = main_window.home_screen
         home_screen.toggle_drag(self.drag_enabled)
-        self.drag_label.setText(f"Træk: {'Aktiveret' if self.drag_enabled else 'Deaktiveret'}")
\ No newline at end of file
+        self.drag_label.setText(f"Træk: {'Aktiveret' if self.drag_enabled else 'Deaktiveret'}")
+        self.drag_toggled.emit(self.drag_enabled)
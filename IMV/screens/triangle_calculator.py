@@ -1,6 +1,11 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QPushButton, QTextEdit, QGroupBox
+import os
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QPushButton, QTextEdit, QGroupBox,
+                               QFileDialog)
 from PySide6.QtCore import Qt
-from IMV.screens.triangle_calculations import TriangleCalculations
+from IMV.core.triangle_calculations import TriangleCalculations, CASE_DESCRIPTIONS
+from IMV.core.triangle_mesh import load_mesh, analyze_mesh
+from IMV.screens.workers import TaskWorker
+from IMV.profiling import profiled
 
 class TriangleCalculator(QWidget):
     """Skærm til beregning af trekants egenskaber baseret på sider og/eller vinkler."""
@@ -107,7 +112,7 @@ class TriangleCalculator(QWidget):
 
         # Calculation buttons
         button_layout = QHBoxLayout()
-        operations = ["Beregn", "Ryd"]
+        operations = ["Beregn", "Ryd", "Analysér net"]
         self.buttons = {}
         for op in operations:
             btn = QPushButton(op)
@@ -147,6 +152,8 @@ class TriangleCalculator(QWidget):
         """)
         main_layout.addWidget(self.result_display)
 
+        self.mesh_worker = None
+
     def get_inputs(self, inputs):
         """Hent værdier fra inputfelter og konverter til float."""
         try:
@@ -154,8 +161,12 @@ class TriangleCalculator(QWidget):
         except ValueError:
             return None
 
+    @profiled
     def handle_button(self, operation):
-        """Håndter knaptryk (Beregn eller Ryd)."""
+        """Håndter knaptryk (Beregn, Ryd eller Analysér net)."""
+        if operation == "Analysér net":
+            self.analyze_mesh()
+            return
         if operation == "Ryd":
             for inp in self.side_inputs + self.angle_inputs:
                 inp.clear()
@@ -165,34 +176,30 @@ class TriangleCalculator(QWidget):
         # Hent input
         sides = self.get_inputs(self.side_inputs)
         angles = self.get_inputs(self.angle_inputs)
+        if sides is None or angles is None:
+            self.result_display.setText("Fejl: Indtast gyldige tal.")
+            return
 
         try:
-            # Prioriter sider, hvis de er angivet og gyldige
-            if sides is not None and all(s > 0 for s in sides):
-                result = TriangleCalculations.calculate_from_sides(*sides, angles=angles if angles is not None and any(a > 0 for a in angles) else None)
-                self.display_results(result, "Beregning ud fra sider")
-            # Fallback til vinkler og én side, hvis sider mangler eller er ugyldige
-            elif angles is not None and all(a > 0 for a in angles) and sides is not None:
-                # Find første gyldige side og dens navn
-                side_labels = ['a', 'b', 'c']
-                for i, s in enumerate(sides):
-                    if s > 0:
-                        known_side = s
-                        known_side_label = side_labels[i]
-                        break
-                else:
-                    self.result_display.setText("Fejl: Indtast mindst én gyldig side.")
-                    return
-
-                result = TriangleCalculations.calculate_from_side_angles(known_side, known_side_label, *angles)
-                self.display_results(result, f"Beregning ud fra vinkler og side {known_side_label}")
+            # Løseren vælger selv SSS, SAS, ASA, AAS eller SSA ud fra de udfyldte felter
+            result = TriangleCalculations.solve(sides, angles)
+            case = result["case"]
+            calculation_type = f"Beregning ud fra {CASE_DESCRIPTIONS[case]} ({case})"
+            if result["alternative"] is None:
+                self.display_results(result, calculation_type)
             else:
-                self.result_display.setText("Fejl: Indtast gyldige positive tal for alle sider eller én side og alle vinkler.")
+                self.result_display.setText(
+                    self.format_results(result, f"{calculation_type}\nLøsning 1") + "\n\n" +
+                    self.format_results(result["alternative"], "Løsning 2 (tilfældet er flertydigt)"))
         except Exception as e:
             self.result_display.setText(f"Fejl: {str(e)}")
 
     def display_results(self, result, calculation_type):
         """Vis beregningsresultater i result_display."""
+        self.result_display.setText(self.format_results(result, calculation_type))
+
+    def format_results(self, result, calculation_type):
+        """Formaterer et beregningsresultat som tekst."""
         result_text = f"{calculation_type}\n"
         result_text += f"Sider:\n"
         result_text += f"a: {result['sides']['a']:.2f}\n"
@@ -204,4 +211,36 @@ class TriangleCalculator(QWidget):
         result_text += f"C: {result['angles']['C']:.2f}°\n"
         result_text += f"Omkreds: {result['perimeter']:.2f}\n"
         result_text += f"Areal: {result['area']:.2f}"
-        self.result_display.setText(result_text)
\ No newline at end of file
+        return result_text
+
+    def analyze_mesh(self):
+        """Vælg et trekantsnet og beregn areal, omkreds og vinkelstatistik i en baggrundstråd."""
+        if self.mesh_worker is not None and self.mesh_worker.isRunning():
+            return
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "Vælg trekantsnet", "", "Trekantsnet (*.obj *.ply *.npz *.npy);;All Files (*)")
+        if not file_name:
+            return
+        faces_name = None
+        if file_name.lower().endswith(".npy"):
+            faces_name, _ = QFileDialog.getOpenFileName(
+                self, "Vælg fladeindeks (.npy)", os.path.dirname(file_name), "NumPy (*.npy)")
+            if not faces_name:
+                return
+
+        def task(report):
+            vertices, faces = load_mesh(file_name, faces_name)
+            statistics = analyze_mesh(vertices, faces,
+                                      report=lambda percent, stats: report(percent, stats.summary()))
+            return statistics.summary()
+
+        title = f"Net: {os.path.basename(file_name)}"
+        self.result_display.setText(f"{title}\nIndlæser...")
+        self.buttons["Analysér net"].setEnabled(False)
+        self.mesh_worker = TaskWorker(task, self)
+        self.mesh_worker.partial.connect(lambda summary: self.result_display.setText(
+            f"{title} (beregner...)\n{summary}"))
+        self.mesh_worker.result.connect(lambda summary: self.result_display.setText(f"{title}\n{summary}"))
+        self.mesh_worker.error.connect(lambda message: self.result_display.setText(f"Fejl: {message}"))
+        self.mesh_worker.finished.connect(lambda: self.buttons["Analysér net"].setEnabled(True))
+        self.mesh_worker.start()
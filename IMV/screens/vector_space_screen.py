@@ -4,7 +4,8 @@ from PySide6.QtWidgets import (
     QRadioButton, QTextEdit, QGroupBox
 )
 from PySide6.QtCore import Qt
-from IMV.screens.vector_calculations import VectorOperations
+from IMV.core.vector_calculations import VectorOperations
+from IMV.profiling import profiled
 
 class CoordinateInput(QWidget):
     def __init__(self, title):
@@ -38,12 +39,12 @@ class CoordinateInput(QWidget):
         return self.group
 
     def get_coordinates(self):
-        """Returnerer koordinater eller (0,0,0) hvis fejl"""
+        """Returnerer koordinater; tomme felter tæller som 0. Ugyldige tal giver en ValueError."""
         try:
             coords = [float(inp.text()) if inp.text().strip() else 0.0 for inp in self.inputs]
             return np.array(coords)
         except ValueError:
-            return np.array([0.0, 0.0, 0.0])
+            raise ValueError(f"{self.group.title()} indeholder et ugyldigt tal")
 
     def get_type(self):
         return "Vektor" if self.vector_radio.isChecked() else "Punkt"
@@ -83,12 +84,17 @@ class VectorCalculator(QWidget):
         self.result_display.setPlaceholderText("Beregninger vises her")
         main_layout.addWidget(self.result_display)
 
+    @profiled
     def calculate(self, operation):
-        coord1 = self.coord_inputs[0].get_coordinates()
-        coord2 = self.coord_inputs[1].get_coordinates()
-        coord3 = None
-        if operation in ("Planens Ligning", "Alt"):
-            coord3 = self.coord_inputs[2].get_coordinates()
+        try:
+            coord1 = self.coord_inputs[0].get_coordinates()
+            coord2 = self.coord_inputs[1].get_coordinates()
+            coord3 = None
+            if operation in ("Planens Ligning", "Alt"):
+                coord3 = self.coord_inputs[2].get_coordinates()
+        except ValueError as e:
+            self.result_display.setText(f"Handling: {operation}\nFejl: {str(e)}")
+            return
 
         type1 = self.coord_inputs[0].get_type()
         type2 = self.coord_inputs[1].get_type()
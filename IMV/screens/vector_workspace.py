@@ -0,0 +1,240 @@
+import os
+import tempfile
+import numpy as np
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+    QTableView, QProgressBar, QFileDialog
+)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QCoreApplication
+from IMV.core.vector_calculations import (
+    WORKSPACE_OPERATIONS, iter_coordinate_chunks, run_workspace_operation, write_coordinates
+)
+from IMV.screens.workers import TaskWorker
+from IMV.profiling import profiled
+
+
+class ResultTableModel(QAbstractTableModel):
+    """
+    Tabelmodel over et (N,k) array, typisk et memory-map på disken.
+    QTableView spørger kun efter de synlige rækker, så selv millioner af rækker vises uden at blive kopieret.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = np.empty((0, 0))
+        self.header = []
+
+    def set_rows(self, rows, header):
+        self.beginResetModel()
+        self.rows = rows
+        self.header = header
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.header)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return f"{self.rows[index.row(), index.column()]:.6g}"
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.header[section] if section < len(self.header) else None
+        return str(section + 1)
+
+
+class VectorWorkspace(QWidget):
+    """
+    Arbejdsområde til store koordinatlister fra CSV- eller .npy-filer.
+
+    Hver række indeholder to koordinater (x1 y1 z1 x2 y2 z2). Filen læses i bidder og beregnes med
+    de vektoriserede VectorOperations i en baggrundstråd, og resultatet gemmes i en midlertidig fil,
+    som tabellen læser direkte fra. Filen slettes, når resultatet erstattes, og når programmet lukker.
+    """
+
+    def __init__(self):
+        super().__init__()
+        main_layout = QVBoxLayout()
+        self.setLayout(main_layout)
+
+        self.input_file = None
+        self.result_file = None
+        self.pending_file = None  # Resultatfilen for beregningen, der kører
+        self.worker = None
+
+        # Filvalg
+        file_layout = QHBoxLayout()
+        load_button = QPushButton("Indlæs fil")
+        load_button.clicked.connect(self.choose_file)
+        file_layout.addWidget(load_button)
+        self.file_label = QLabel("Ingen fil valgt (CSV eller .npy med kolonnerne x1 y1 z1 x2 y2 z2)")
+        file_layout.addWidget(self.file_label, 1)
+        main_layout.addLayout(file_layout)
+
+        # Operation og typer
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel("Handling:"))
+        self.operation_box = QComboBox()
+        self.operation_box.addItems(list(WORKSPACE_OPERATIONS))
+        options_layout.addWidget(self.operation_box)
+        self.type_boxes = []
+        for title in ("1. Koordinat:", "2. Koordinat:"):
+            options_layout.addWidget(QLabel(title))
+            box = QComboBox()
+            box.addItems(["Vektor", "Punkt"])
+            options_layout.addWidget(box)
+            self.type_boxes.append(box)
+        options_layout.addStretch()
+        main_layout.addLayout(options_layout)
+
+        # Knapper
+        button_layout = QHBoxLayout()
+        self.calculate_button = QPushButton("Beregn")
+        self.calculate_button.clicked.connect(self.calculate)
+        self.export_button = QPushButton("Eksportér")
+        self.export_button.clicked.connect(self.export)
+        self.cancel_button = QPushButton("Annullér")
+        self.cancel_button.clicked.connect(self.cancel)
+        self.cancel_button.setEnabled(False)
+        for btn in (self.calculate_button, self.export_button, self.cancel_button):
+            button_layout.addWidget(btn)
+        main_layout.addLayout(button_layout)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        main_layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("")
+        main_layout.addWidget(self.status_label)
+
+        # Resultattabel
+        self.model = ResultTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        main_layout.addWidget(self.table)
+
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
+
+    def choose_file(self):
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "Indlæs koordinater", "", "Koordinater (*.csv *.txt *.npy);;All Files (*)")
+        if file_name:
+            self.input_file = file_name
+            self.file_label.setText(os.path.basename(file_name))
+
+    def set_busy(self, busy):
+        self.calculate_button.setEnabled(not busy)
+        self.export_button.setEnabled(not busy)
+        self.cancel_button.setEnabled(busy)
+
+    def start_worker(self, task, on_result):
+        self.worker = TaskWorker(task, self)
+        self.worker.progress.connect(self.progress_bar.setValue)
+        self.worker.result.connect(on_result)
+        self.worker.error.connect(self.on_error)
+        self.worker.finished.connect(lambda: self.set_busy(False))
+        self.set_busy(True)
+        self.worker.start()
+
+    @profiled
+    def calculate(self):
+        if not self.input_file:
+            self.status_label.setText("Fejl: Vælg en fil først")
+            return
+        operation = self.operation_box.currentText()
+        points1 = self.type_boxes[0].currentText() == "Punkt"
+        points2 = self.type_boxes[1].currentText() == "Punkt"
+        input_file = self.input_file
+
+        # Filen oprettes her, så dens navn kendes, selv hvis resultatet aldrig når frem til show_result
+        descriptor, file_name = tempfile.mkstemp(suffix=".bin")
+        self.pending_file = file_name
+
+        def task(report):
+            # Resultaterne skrives bid for bid til en rå float64-fil, så hukommelsesforbruget er begrænset
+            count = 0
+            with os.fdopen(descriptor, "wb") as out:
+                try:
+                    chunks = iter_coordinate_chunks(input_file)
+                    for result, progress in run_workspace_operation(operation, chunks, points1, points2):
+                        out.write(np.ascontiguousarray(result, dtype=np.float64).tobytes())
+                        count += len(result)
+                        report(progress * 100)
+                except BaseException:
+                    out.close()
+                    os.remove(file_name)
+                    raise
+            return file_name, count
+
+        self.progress_bar.setValue(0)
+        self.status_label.setText(f"Beregner {operation}...")
+        self.start_worker(task, lambda result: self.show_result(operation, *result))
+
+    def show_result(self, operation, file_name, count):
+        _, header = WORKSPACE_OPERATIONS[operation]
+        # Frigiv det tidligere memory-map før filen slettes
+        self.model.set_rows(np.empty((0, len(header))), header)
+        self.remove_result_file()
+        self.result_file = file_name
+        self.pending_file = None
+        if count:
+            rows = np.memmap(file_name, dtype=np.float64, mode="r", shape=(count, len(header)))
+        else:
+            rows = np.empty((0, len(header)))
+        self.model.set_rows(rows, header)
+        self.status_label.setText(f"{operation}: {count} rækker beregnet")
+
+    def export(self):
+        if self.model.rowCount() == 0:
+            self.status_label.setText("Fejl: Der er ingen resultater at eksportere")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Eksportér resultater", "", "CSV (*.csv);;NumPy (*.npy)")
+        if not file_name:
+            return
+        rows, header = self.model.rows, self.model.header
+
+        def task(report):
+            write_coordinates(file_name, rows, header)
+            report(100)
+            return file_name
+
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Eksporterer...")
+        self.start_worker(task, lambda name: self.status_label.setText(
+            f"Resultater gemt til '{os.path.basename(name)}'"))
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def on_error(self, message):
+        self.status_label.setText(f"Fejl: {message}")
+
+    def remove_result_file(self):
+        if self.result_file:
+            try:
+                os.remove(self.result_file)
+            except OSError:
+                pass
+            self.result_file = None
+
+    def shutdown(self):
+        """Stopper en igangværende beregning og sletter resultatfilerne, når programmet lukker."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        # Memory-mappet skal slippes, før filen kan slettes
+        self.model.set_rows(np.empty((0, 0)), [])
+        self.remove_result_file()
+        if self.pending_file is not None and os.path.exists(self.pending_file):
+            os.remove(self.pending_file)
+        self.pending_file = None
@@ -0,0 +1,43 @@
+from PySide6.QtCore import QThread, Signal
+from IMV import profiling
+
+
+class TaskWorker(QThread):
+    """
+    Kører en langvarig opgave uden for GUI-tråden.
+
+    Opgaven er en funktion, der modtager en report(procent, delresultat=None) callback og returnerer et resultat.
+    Resultat, fremskridt, delresultater og fejl sendes tilbage til GUI-tråden som signaler.
+    Med IMV_PROFILE måles opgaven under navnet name (standard: opgavens funktionsnavn).
+    """
+    progress = Signal(int)
+    partial = Signal(object)
+    result = Signal(object)
+    error = Signal(str)
+
+    def __init__(self, task, parent=None, name=None):
+        super().__init__(parent)
+        self.task = task
+        self.name = name or getattr(task, "__qualname__", "TaskWorker")
+        self._cancelled = False
+
+    def cancel(self):
+        """Beder opgaven om at stoppe ved næste report-kald."""
+        self._cancelled = True
+
+    def report(self, percent, partial=None):
+        if self._cancelled:
+            raise InterruptedError("Annulleret")
+        self.progress.emit(int(percent))
+        if partial is not None:
+            self.partial.emit(partial)
+
+    def run(self):
+        try:
+            with profiling.measure(self.name):
+                value = self.task(self.report)
+            self.result.emit(value)
+        except InterruptedError:
+            self.error.emit("Annulleret")
+        except Exception as e:
+            self.error.emit(str(e))
@@ -0,0 +1,136 @@
+"""Benchmarks for beregningerne i IMV.core (ingen Qt)."""
+import functools
+import numpy as np
+from benchmarks.registry import benchmark
+from IMV.core.vector_calculations import VectorOperations
+from IMV.core.triangle_calculations import TriangleCalculations
+from IMV.core.reccurence_calculations import RecurrenceSolver
+from IMV.core.enthalpy_calculations import build_index, calculate_enthalpy
+from IMV.core.graph_war_calculations import Enemy, graph_points, hit_enemies
+
+BATCH_SIZES = (1_000, 100_000)
+
+
+# ---- Vektorer ----
+
+@benchmark("vector.single.all_operations")
+def vector_single():
+    a, b, c = np.array([1.0, 2.0, 3.0]), np.array([4.0, 5.0, 6.0]), np.array([7.0, 8.0, 10.0])
+
+    def run():
+        VectorOperations.add(a, b, "Vektor", "Vektor")
+        VectorOperations.subtract(a, b, "Vektor", "Vektor")
+        VectorOperations.dot_product(a, b, "Vektor", "Vektor")
+        VectorOperations.cross_product(a, b, "Vektor", "Vektor")
+        VectorOperations.angle(a, b, None, "Vektor", "Vektor", None)
+        VectorOperations.plane_equation(a, b, c, "Punkt", "Punkt", "Punkt")
+    return run
+
+
+def vector_batch(n):
+    rng = np.random.default_rng(0)
+    a, b, c = rng.random((3, n, 3))
+    points = np.ones(n, dtype=bool)
+
+    def run():
+        VectorOperations.add_batch(a, b)
+        VectorOperations.subtract_batch(a, b)
+        VectorOperations.dot_product_batch(a, b)
+        VectorOperations.cross_product_batch(a, b)
+        VectorOperations.angle_batch(a, b)
+        VectorOperations.plane_equation_batch(a, b, c, points, points, points)
+    return run
+
+
+for _n in BATCH_SIZES:
+    benchmark(f"vector.batch.all_operations[{_n}]")(functools.partial(vector_batch, _n))
+
+
+# ---- Trekanter ----
+
+@benchmark("triangle.single.from_sides")
+def triangle_single_sides():
+    return lambda: TriangleCalculations.calculate_from_sides(3.0, 4.0, 5.0)
+
+
+@benchmark("triangle.single.solve_ssa")
+def triangle_single_ssa():
+    return lambda: TriangleCalculations.solve([3.0, 4.0, 0.0], [36.87, 0.0, 0.0])
+
+
+def triangle_batch_sides(n):
+    rng = np.random.default_rng(0)
+    a, b, c = rng.random((3, n)) + 1
+    return lambda: TriangleCalculations.calculate_from_sides_batch(a, b, c)
+
+
+def triangle_batch_mixed(n):
+    # Blandede mønstre: SSS, SAS, ASA og SSA i samme array
+    rng = np.random.default_rng(0)
+    values = rng.random((n, 6)) + 1
+    values[:, 3:] = rng.random((n, 3)) * 40 + 20
+    pattern = np.arange(n) % 4
+    unknown = {0: [3, 4, 5], 1: [2, 3, 4], 2: [0, 1, 5], 3: [2, 4, 5]}
+    for case, columns in unknown.items():
+        values[np.ix_(pattern == case, columns)] = 0
+    return lambda: TriangleCalculations.solve_batch(*values.T)
+
+
+for _n in BATCH_SIZES:
+    benchmark(f"triangle.batch.from_sides[{_n}]")(functools.partial(triangle_batch_sides, _n))
+    benchmark(f"triangle.batch.solve_mixed[{_n}]")(functools.partial(triangle_batch_mixed, _n))
+
+
+# ---- Rekursion ----
+
+def recurrence_solve(order):
+    # Karakteristisk polynomium (r-1)(r-2)...(r-order), så alle rødder er reelle og forskellige
+    coeffs = np.poly(np.arange(1, order + 1)).round().astype(int)
+    equation = "a(n)=" + "".join(f"{-c:+d}*a(n-{k})" for k, c in enumerate(coeffs[1:], start=1))
+    initial = "\n".join(f"a({k})=1" for k in range(order))
+    return lambda: RecurrenceSolver(equation, initial).solve()
+
+
+for _order in (2, 5, 10):
+    benchmark(f"recurrence.solve[order={_order}]")(functools.partial(recurrence_solve, _order))
+
+
+# ---- Entalpi ----
+
+def synthetic_compounds(size):
+    """Molekyledatabase med size opdigtede molekyler plus dem, reaktionen bruger."""
+    data = [{"compound": f"X{i}", "delta_h_f": -float(i)} for i in range(size)]
+    data += [{"compound": "CH4", "delta_h_f": -74.8}, {"compound": "O2", "delta_h_f": 0.0},
+             {"compound": "CO2", "delta_h_f": -393.5}, {"compound": "H2O", "delta_h_f": -241.8}]
+    return data
+
+
+def enthalpy_calculate(size):
+    index = build_index(synthetic_compounds(size))
+    return lambda: calculate_enthalpy("CH4 + 2O2 -> CO2 + 2H2O", index)
+
+
+for _size in (10, 1_000, 100_000):
+    benchmark(f"enthalpy.calculate[db={_size}]")(functools.partial(enthalpy_calculate, _size))
+
+
+# ---- Grafkrig ----
+
+@benchmark("graphwar.graph_points")
+def graphwar_points():
+    return lambda: graph_points("x**2 / 100", 0.01, 1200, 600)
+
+
+@benchmark("graphwar.graph_points.scalar_fallback")
+def graphwar_points_scalar():
+    return lambda: graph_points("math.sin(x / 10) * 100", 1.0, 1200, 600)
+
+
+@benchmark("graphwar.hit_test")
+def graphwar_hit_test():
+    xs, ys = graph_points("x**2 / 100", 0.01, 1200, 600)
+
+    def run():
+        enemies = [Enemy(1200, 600) for _ in range(5)]
+        hit_enemies(xs, ys, enemies, 1200)
+    return run
@@ -0,0 +1,60 @@
+"""Benchmarks for skærmene. Kører headless med Qt's offscreen-platform (sat i benchmarks.run)."""
+from benchmarks.registry import benchmark, Skip
+from benchmarks.bench_core import synthetic_compounds
+
+
+def application():
+    try:
+        from PySide6.QtWidgets import QApplication
+    except ImportError as e:
+        raise Skip(f"PySide6 mangler: {e}")
+    return QApplication.instance() or QApplication([])
+
+
+@benchmark("screen.graphwar.update_graph")
+def graphwar_update_graph():
+    application()
+    from IMV.screens.graph_war import GraphWarScreen
+    screen = GraphWarScreen()
+    screen.resize(1200, 600)
+
+    def run():
+        screen.reset_game()
+        screen.update_graph()
+    return run
+
+
+def enthalpy_screen(size):
+    application()
+    from IMV.core.enthalpy_calculations import build_index
+    from IMV.screens.enthalpy_screen import EnthalpyScreen
+    screen = EnthalpyScreen()
+    screen.data = synthetic_compounds(size)
+    screen.index = build_index(screen.data)
+    screen.reaction_input.setText("CH4 + 2O2 -> CO2 + 2H2O")
+    return screen
+
+
+for _size in (10, 1_000, 100_000):
+    benchmark(f"screen.enthalpy.calculate_enthalpy[db={_size}]")(
+        lambda size=_size: enthalpy_screen(size).calculate_enthalpy)
+
+
+@benchmark("screen.enthalpy.populate_table[db=1000]")
+def enthalpy_populate_table():
+    return enthalpy_screen(1_000).populate_table
+
+
+@benchmark("startup.main_window")
+def main_window_startup():
+    application()
+    try:
+        from IMV.main_window import MainWindow
+    except ImportError as e:
+        # Kun manglende valgfrie moduler (fx QtWebEngine); fejl i selve koden skal fejle kørslen
+        raise Skip(f"MainWindow kan ikke importeres: {e}")
+
+    def run():
+        window = MainWindow()
+        window.deleteLater()
+    return run
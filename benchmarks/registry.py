@@ -0,0 +1,14 @@
+"""Registrering af benchmarks. Hver benchmark er en funktion, der opsætter data og returnerer den funktion, der skal tidtages."""
+
+BENCHMARKS = {}
+
+
+class Skip(Exception):
+    """Kastes under opsætning, hvis en benchmark ikke kan køre i dette miljø (fx manglende Qt-moduler)."""
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
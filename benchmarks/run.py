@@ -0,0 +1,108 @@
+"""
+Kører alle benchmarks og gemmer resultatet som JSON.
+
+    python -m benchmarks.run                          # kør og udskriv
+    python -m benchmarks.run -o baseline.json         # gem en baseline
+    python -m benchmarks.run --compare baseline.json  # sammenlign, exit 1 ved regression
+    python -m benchmarks.run -k triangle              # kun benchmarks, hvis navn indeholder 'triangle'
+
+En benchmark, der fejler, registreres med fejlen, og resten køres alligevel; kørslen slutter med exit 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+# Qt skal køre uden skærm; sættes før PySide6 importeres
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.registry import BENCHMARKS, Skip
+import benchmarks.bench_core  # noqa: F401  (registrerer benchmarks)
+import benchmarks.bench_screens  # noqa: F401
+
+
+def measure(function, repeat, min_time):
+    """Median og minimum tid pr. kald i sekunder. Antallet af kald pr. måling vælges automatisk."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"median": statistics.median(times), "min": min(times), "number": number, "repeat": repeat}
+
+
+def run(selected, repeat, min_time):
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if selected and not any(key in name for key in selected):
+            continue
+        try:
+            function = setup()
+            results[name] = measure(function, repeat, min_time)
+            print(f"{name:55s} {results[name]['median'] * 1e3:12.4f} ms")
+        except Skip as e:
+            results[name] = {"skipped": str(e)}
+            print(f"{name:55s} {'sprunget over':>15s}  ({e})")
+        except Exception as e:
+            results[name] = {"error": repr(e)}
+            print(f"{name:55s} {'fejlede':>15s}  ({e!r})")
+        sys.stdout.flush()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Udskriver forholdet til baselinen og returnerer navnene på benchmarks, der er blevet langsommere."""
+    regressions = []
+    print(f"\n{'benchmark':55s} {'baseline':>12s} {'nu':>12s} {'forhold':>8s}")
+    for name, result in results.items():
+        old = baseline.get(name)
+        if "median" not in result or not old or "median" not in old:
+            continue
+        ratio = result["median"] / old["median"]
+        flag = "  <-- langsommere" if ratio > threshold else ""
+        print(f"{name:55s} {old['median'] * 1e3:12.4f} {result['median'] * 1e3:12.4f} {ratio:8.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IMV benchmarks")
+    parser.add_argument("-o", "--output", help="gem resultatet som JSON (baseline)")
+    parser.add_argument("--compare", help="sammenlign med en tidligere JSON-baseline")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="forhold over hvilket en benchmark regnes som en regression (standard 1.25)")
+    parser.add_argument("-k", action="append", default=[], help="kør kun benchmarks, hvis navn indeholder teksten")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="sekunder pr. måling")
+    args = parser.parse_args(argv)
+
+    results = run(args.k, args.repeat, args.min_time)
+    document = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+
+    status = 0
+    failed = [name for name, result in results.items() if "error" in result]
+    if failed:
+        print(f"\n{len(failed)} benchmark(s) fejlede: {', '.join(failed)}")
+        status = 1
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+        if compare(results, baseline, args.threshold):
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
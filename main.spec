@@ -1,42 +1,96 @@
 # -*- mode: python ; coding: utf-8 -*-
+# Bygges med: pyinstaller main.spec
+#
+# Standard er en onedir-build (dist/IMV/ med IMV.exe og en _internal-mappe). Den pakkes ikke ud ved
+# opstart, så hver opstart sparer udpakningen af Qt, PDF'er og billeder til en midlertidig mappe.
+# Programmet finder sine filer gennem IMV.resources, der virker med begge slags builds.
+#   IMV_ONEFILE=1      bygger i stedet én samlet IMV.exe (pakkes ud ved hver opstart)
+#   IMV_WEBENGINE=1    tager QtWebEngine med, så IMV_PDF_BACKEND=webengine kan bruges (flere hundrede MB)
+import os
+import sys
+
+sys.path.insert(0, SPECPATH)
+from IMV.resources import ARCHIVE_NAME, build_archive
+
+ONEFILE = os.environ.get("IMV_ONEFILE") == "1"
+WEBENGINE = os.environ.get("IMV_WEBENGINE") == "1"
+
+hiddenimports = ['PySide6.QtGui', 'PySide6.QtWidgets', 'PySide6.QtCore', 'PySide6.QtPdf', 'PySide6.QtPdfWidgets']
+excludes = []
+if WEBENGINE:
+    hiddenimports += ['PySide6.QtWebEngineWidgets', 'PySide6.QtWebEngineCore']
+else:
+    # PDF-viseren bruger QtPdf og falder tilbage til den, hvis QtWebEngine mangler
+    excludes += ['PySide6.QtWebEngineWidgets', 'PySide6.QtWebEngineCore', 'PySide6.QtWebEngineQuick']
+
+# Billeder og data pakkes i ét ressourcearkiv, som programmet mapper i hukommelsen (se IMV.resources)
+archive = build_archive(os.path.join(workpath, ARCHIVE_NAME), SPECPATH)
 
 a = Analysis(
     ['main.py'],
     pathex=['.venv/Lib/site-packages/PySide6'],
     binaries=[],
+    # Qt's plugins samles af PyInstallers PySide6-hook; kun programmets egne filer angives her
     datas=[
-        ('IMV/screens/enthalpy_data.json', 'IMV/screens'),           # JSON file for EnthalpyScreen
-        ('IMV/images/*.png', 'IMV/images'),                         # Image files for HomeScreen
+        (archive, '.'),                                             # Billeder og enthalpidata
         ('IMV/screens/PDF-Filer/*', 'IMV/screens/PDF-Filer'),       # PDF files and directory for PDFViewerScreen
-        ('.venv/Lib/site-packages/PySide6/plugins', 'PySide6/plugins'),  # PySide6 plugins
     ],
-    hiddenimports=['PySide6.QtGui', 'PySide6.QtWidgets', 'PySide6.QtCore', 'PySide6.QtWebEngineWidgets', 'PySide6.QtWebEngineCore'],
+    hiddenimports=hiddenimports,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=excludes,
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='IMV',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
\ No newline at end of file
+# UPX er slået fra: komprimerede Qt-DLL'er skal pakkes ud i hukommelsen ved hver opstart
+if ONEFILE:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='IMV',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='IMV',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='IMV',
+    )